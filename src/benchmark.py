@@ -0,0 +1,134 @@
+# benchmark.py - scaling benchmark of the preprocessing and solve phases
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from calculations import compute_intermediates
+from generator import LAYOUTS, generate_scenario
+from interference import MODELS
+from solver import solve_network
+from sweep import assignment_objective
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def benchmark_case(n_users, layout, backend=None, seed=0, repeat=1, lambda_energy=1, interference="pairwise",
+                   ap_spacing=1.0):
+    """
+    Time one generated scenario. Each phase keeps its best time over
+    `repeat` runs. Failures (e.g. a size-limited solver licence) are recorded
+    in "error" instead of aborting the suite. interference is the
+    interference model to solve with; ap_spacing < 1 packs the APs closer
+    (dense same-channel deployments, see generate_scenario).
+    """
+    scenario = generate_scenario(n_users, layout=layout, seed=seed, ap_spacing=ap_spacing)
+    users, aps, settings = scenario["users"], scenario["aps"], scenario["settings"]
+    entry = {
+        "users": n_users,
+        "aps": len(aps),
+        "layout": layout,
+        "seed": seed,
+        "requested_backend": backend or "auto",
+        "interference_model": interference,
+        "ap_spacing": ap_spacing,
+        "error": None,
+    }
+
+    best = {}
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            intermediates = compute_intermediates(users, aps, settings)
+            timings = {"preprocess_time": time.perf_counter() - start}
+
+            stats = {}
+            assignments, status = solve_network(
+                intermediates, aps, lambda_energy, backend=backend, stats=stats, interference=interference
+            )
+            timings.update({k: stats[k] for k in ("build_time", "optimize_time", "extract_time")})
+            for phase, value in timings.items():
+                best[phase] = min(value, best.get(phase, value))
+
+        entry.update({
+            "backend": stats.get("backend"),
+            "status": status,
+            "edges": len(intermediates["E"]),
+            "interference_pairs": len(intermediates["I"]),
+            "interference_rows": stats.get("interference_rows"),
+            "constraints": stats.get("constraints"),
+            "nonzeros": stats.get("nonzeros"),
+            "connected": sum(len(u_list) for u_list in assignments.values()),
+            "objective": assignment_objective(assignments, intermediates, lambda_energy),
+            **best,
+            "total_time": sum(best.values()),
+        })
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return entry
+
+
+def run_suite(sizes=None, layouts=LAYOUTS, backends=(None,), seed=0, repeat=1, verbose=True,
+              interference=("pairwise",), ap_spacing=1.0):
+    """
+    Benchmark every (size, layout, backend, interference model) combination;
+    returns the report dict.
+    """
+    results = []
+    for backend in backends:
+        for layout in layouts:
+            for n_users in sizes or DEFAULT_SIZES:
+                for model in interference:
+                    entry = benchmark_case(n_users, layout, backend, seed, repeat, interference=model,
+                                           ap_spacing=ap_spacing)
+                    results.append(entry)
+                    if verbose:
+                        summary = entry["error"] or (
+                            f"{entry['status']} via {entry['backend']} in {entry['total_time']:.3f}s, "
+                            f"{entry['interference_rows']} interference rows"
+                        )
+                        print(f"{layout:>9} {n_users:>7} users {model:>9}: {summary}", file=sys.stderr)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "ap_spacing": ap_spacing,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmark on generated scenarios.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="user counts")
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument("--backends", nargs="+", default=[None],
+                        help="solver backends to compare (default: auto)")
+    parser.add_argument("--interference", nargs="+", choices=MODELS, default=["pairwise"],
+                        help="interference models to compare (default: pairwise)")
+    parser.add_argument("--ap-spacing", type=float, default=1.0,
+                        help="AP grid spacing in coverage radii; below 1 for dense deployments")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case, best time kept")
+    parser.add_argument("-o", "--output", default="-", help="JSON report path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.layouts, args.backends, args.seed, args.repeat,
+                       interference=args.interference, ap_spacing=args.ap_spacing)
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
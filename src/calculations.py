@@ -1,9 +1,26 @@
-import math
+import numpy as np
 
-def compute_intermediates(users, aps, settings):
+from compact import CompactIntermediates
+
+# Normalized energy costs with 0.7 scaling factor
+BASE_POWER = {
+    "IoT Sensor": 1,
+    "Wearable": 1,
+    "Smartphone": 3,
+    "Tablet": 4,
+    "Laptop": 6
+}
+
+PRIORITY_WEIGHTS = {"High": 3, "Medium": 2}
+
+# The scenario settings compute_intermediates reads (the rest are solver options)
+SETTINGS_KEYS = ("WifiBand", "EnvironmentType", "IncludePowerConsumption")
+
+
+def radio_parameters(settings):
+    """Return (alpha, D_max, D_intf) for the band and environment in settings."""
     env = settings["EnvironmentType"]
     wifi_band = settings["WifiBand"]
-    include_power = settings["IncludePowerConsumption"]
 
     # Alpha by environment
     alpha = 3 if env == "Indoor" else 3.5 if env == "Urban" else 2.7
@@ -15,76 +32,168 @@ def compute_intermediates(users, aps, settings):
         D_max = 3 if env == "Indoor" else 5 if env == "Urban" else 10
 
     D_intf = 1.5 * D_max
+    return alpha, D_max, D_intf
+
+
+def _coordinates(items):
+    """Names and (n, 2) float coordinates of the items with both X and Y set."""
+    if hasattr(items, "coordinates"):  # columnar tables (scenario_binary) read their arrays directly
+        return items.coordinates()
+    placed = [item for item in items if item["X"] is not None and item["Y"] is not None]
+    xy = np.array([(item["X"], item["Y"]) for item in placed], dtype=float).reshape(-1, 2)
+    return [item["Name"] for item in placed], xy
+
+
+def _names(items):
+    """The Name of every item, in order."""
+    if hasattr(items, "names"):  # columnar tables decode only their name column
+        return items.names()
+    return [item["Name"] for item in items]
+
+
+def _values(items, key, table=None, default=None):
+    """
+    Per-item numpy array of `key`, mapped through table when given (default
+    for values it lacks). Columnar tables (scenario_binary) serve it from
+    their arrays without building records.
+    """
+    if hasattr(items, "column_values"):
+        values = items.column_values(key, table, default)
+        if values is not None:
+            return values
+    if table is None:
+        return np.array([item[key] for item in items], dtype=object)
+    return np.array([table.get(item[key], default) for item in items])
+
+
+def _by_name(names):
+    """
+    (distinct names in first-seen order, {name: position}, index of each
+    name's first item, index of its last item).
+    """
+    table = list(dict.fromkeys(names))
+    position = {name: i for i, name in enumerate(table)}
+    ids = np.array([position[name] for name in names], dtype=np.int64)
+    # ids count up in first-seen order, so np.unique lines its indices up with table
+    first = np.unique(ids, return_index=True)[1]
+    last = len(ids) - 1 - np.unique(ids[::-1], return_index=True)[1]
+    return table, position, first, last
+
+
+def _grid_pairs(src_xy, dst_xy, radius, src_groups=None, dst_groups=None):
+    """
+    All (src, dst) index pairs within `radius`, found through a uniform grid.
 
-    # Distances and feasible edges
-    distances, E = {}, []
-    for u in users:
-        for a in aps:
-            if None in (u["X"], u["Y"], a["X"], a["Y"]):
+    Destinations are bucketed into square cells of side `radius`, so every
+    point within range of a source lies in the source's cell or one of its
+    eight neighbours. With integer `src_groups`/`dst_groups` (e.g. channel
+    codes) the buckets are also split per group and only same-group points
+    are paired. Returns (src, dst, distance) arrays sorted by src, then dst,
+    i.e. in the order of a full row-major scan.
+    """
+    empty = np.empty(0, dtype=np.intp)
+    if len(src_xy) == 0 or len(dst_xy) == 0:
+        return empty, empty, np.empty(0)
+
+    if src_groups is None:
+        src_groups = np.zeros(len(src_xy), dtype=np.int64)
+        dst_groups = np.zeros(len(dst_xy), dtype=np.int64)
+
+    dst_cells = np.floor(dst_xy / radius).astype(np.int64)
+    src_cells = np.floor(src_xy / radius).astype(np.int64)
+    lo = dst_cells.min(axis=0)
+    span = dst_cells.max(axis=0) - lo + 1
+
+    def cell_key(groups, cells):
+        return (groups * span[0] + cells[:, 0]) * span[1] + cells[:, 1]
+
+    dst_keys = cell_key(dst_groups, dst_cells - lo)
+    order = np.argsort(dst_keys, kind="stable")
+    sorted_keys = dst_keys[order]
+
+    src_parts, dst_parts = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            cells = src_cells + (dx, dy) - lo
+            inside = np.all((cells >= 0) & (cells < span), axis=1)
+            src = np.nonzero(inside)[0]
+            keys = cell_key(src_groups[src], cells[src])
+            start = np.searchsorted(sorted_keys, keys, side="left")
+            counts = np.searchsorted(sorted_keys, keys, side="right") - start
+            total = counts.sum()
+            if total == 0:
                 continue
-            d = math.sqrt((u["X"] - a["X"])**2 + (u["Y"] - a["Y"])**2)
-            distances[(u["Name"], a["Name"])] = d
-            if d <= D_max:
-                E.append((u["Name"], a["Name"]))
-
-    # Normalized energy costs with 0.7 scaling factor
-    base_power = {
-        "IoT Sensor": 1,
-        "Wearable": 1,
-        "Smartphone": 3,
-        "Tablet": 4,
-        "Laptop": 6
-    }
-
-    c = {}
-    for (u_name, a_name) in E:
-        device_type = next(u for u in users if u["Name"] == u_name)["Device"]
-        factor = base_power.get(device_type, 1) if include_power else 0
-        c[(u_name, a_name)] = 0.1 * factor * (distances[(u_name, a_name)] ** alpha) / (D_max ** alpha)
-
-    # AP-AP distances
-    ap_distances = {}
-    for i, a1 in enumerate(aps):
-        for j, a2 in enumerate(aps):
-            if i < j and None not in (a1["X"], a1["Y"], a2["X"], a2["Y"]):
-                d_ab = math.sqrt((a1["X"] - a2["X"])**2 + (a1["Y"] - a2["Y"])**2)
-                ap_distances[(a1["Name"], a2["Name"])] = d_ab
-
-    # Interference pairs
-    I = []
-    for (a1_name, a2_name), d_ab in ap_distances.items():
-        a1 = next(a for a in aps if a["Name"] == a1_name)
-        a2 = next(a for a in aps if a["Name"] == a2_name)
-        if d_ab <= D_intf and a1["Channel"] == a2["Channel"]:
-            I.append((a1_name, a2_name))
+            # Expand each [start, start + count) run into individual positions
+            run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            src_parts.append(np.repeat(src, counts))
+            dst_parts.append(order[np.repeat(start, counts) + run_offsets])
+
+    if not src_parts:
+        return empty, empty, np.empty(0)
+
+    src = np.concatenate(src_parts)
+    dst = np.concatenate(dst_parts)
+    diff = src_xy[src] - dst_xy[dst]
+    dist = np.sqrt(diff[:, 0] ** 2 + diff[:, 1] ** 2)
+    keep = np.nonzero(dist <= radius)[0]
+    keep = keep[np.lexsort((dst[keep], src[keep]))]
+    return src[keep], dst[keep], dist[keep]
+
+
+def compute_intermediates(users, aps, settings):
+    """
+    The model data of a scenario as a CompactIntermediates: feasible edges
+    with their distances and energy costs, interference pairs with their M
+    limits, and user weights. It also reads like the former dict (keys
+    D_max, D_intf, distances, E, c, I, M, w).
+    """
+    include_power = settings["IncludePowerConsumption"]
+    alpha, D_max, D_intf = radio_parameters(settings)
+
+    user_names, user_xy = _coordinates(users)
+    ap_names, ap_xy = _coordinates(aps)
+
+    # User weights (priority) from each name's last record: the user table lists every user
+    user_table, user_id, first_user, last_user = _by_name(_names(users))
+    weights = _values(users, "Priority", PRIORITY_WEIGHTS, 1)[last_user]
+    ap_table = list(dict.fromkeys(ap_names))
+    ap_id = {name: j for j, name in enumerate(ap_table)}
+    placed_users = np.array([user_id[name] for name in user_names], dtype=np.int32)
+    placed_aps = np.array([ap_id[name] for name in ap_names], dtype=np.int32)
+
+    # Feasible edges (with their distances) via the AP grid index
+    edge_u, edge_a, edge_d = _grid_pairs(user_xy, ap_xy, D_max)
+
+    # Energy costs. numpy's SIMD pow can differ from libm in the last ulp,
+    # so the power itself goes through Python floats to keep c reproducible.
+    if include_power:
+        factor = _values(users, "Device", BASE_POWER, 1)[first_user][placed_users].astype(float)[edge_u]
+    else:
+        factor = np.zeros(len(edge_u))
+    powered = np.array([d ** alpha for d in edge_d.tolist()], dtype=float)
+    costs = 0.1 * factor * powered / (D_max ** alpha)
+
+    # Interference pairs: same-channel APs within D_intf, via a per-channel grid.
+    # Channels and capacities come from each AP name's first record.
+    _, ap_position, first_ap, _ = _by_name(_names(aps))
+    placed = first_ap[[ap_position[a] for a in ap_names]] if ap_names else np.empty(0, dtype=np.int64)
+    channel_codes = {}
+    ap_channels = np.array(
+        [channel_codes.setdefault(c, len(channel_codes)) for c in _values(aps, "Channel")[placed].tolist()],
+        dtype=np.int64
+    )
+    pair_i, pair_j, d_ab = _grid_pairs(ap_xy, ap_xy, D_intf, ap_channels, ap_channels)
+    upper = np.nonzero(pair_i < pair_j)[0]
+    pair_i, pair_j, d_ab = pair_i[upper], pair_j[upper], d_ab[upper]
 
     # M values
-    M = {}
-    for (a1_name, a2_name) in I:
-        a1 = next(a for a in aps if a["Name"] == a1_name)
-        a2 = next(a for a in aps if a["Name"] == a2_name)
-        k_a, k_b = a1["Capacity"], a2["Capacity"]
-        d_ab = ap_distances[(a1_name, a2_name)]
-        M_ab = math.floor(k_a + k_b - min(k_a,k_b) * max(0, 1 - d_ab/D_intf))
-        M[(a1_name, a2_name)] = M_ab
-
-    # User weights (priority)
-    w = {}
-    for u in users:
-        if u["Priority"] == "High":
-            w[u["Name"]] = 3
-        elif u["Priority"] == "Medium":
-            w[u["Name"]] = 2
-        else:
-            w[u["Name"]] = 1
-
-    return {
-        "D_max": D_max,
-        "D_intf": D_intf,
-        "distances": distances,
-        "E": E,
-        "c": c,
-        "I": I,
-        "M": M,
-        "w": w
-    }
+    ap_capacity = _values(aps, "Capacity")[placed].astype(float).reshape(-1)
+    k_a, k_b = ap_capacity[pair_i], ap_capacity[pair_j]
+    shared = np.minimum(k_a, k_b) * np.maximum(0, 1 - d_ab / D_intf)
+    M = np.floor(k_a + k_b - shared).astype(np.int64)
+
+    return CompactIntermediates(
+        D_max, D_intf, user_table, weights, ap_table,
+        placed_users[edge_u], placed_aps[edge_a], costs, edge_d,
+        placed_aps[pair_i], placed_aps[pair_j], M,
+    )
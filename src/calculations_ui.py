@@ -1,8 +1,158 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
-    QLabel, QGroupBox, QHeaderView
+    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QTableView,
+    QLabel, QGroupBox, QHeaderView, QLineEdit
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from collections.abc import Mapping, Sequence
+import numpy as np
+
+from compact import compact
+
+# Rows handed to the view at a time (Qt's fetchMore); views set up per-row
+# header state, so a whole multi-million-row table up front would block
+FETCH_CHUNK = 10000
+
+
+class _KeyAt(Sequence):
+    """Indexable view of a mapping's keys through its key_at() (e.g. the views of CompactIntermediates)."""
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+
+    def __getitem__(self, index):
+        return self.mapping.key_at(index)
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def key_ranks(self, column=0):
+        return self.mapping.key_ranks(column)
+
+    def rows_matching(self, text):
+        return self.mapping.rows_matching(text)
+
+
+class IntermediatesTableModel(QAbstractTableModel):
+    """
+    Two-column table over one of the intermediates, read on demand.
+
+    keys is an indexable sequence of rows (E, I, or the keys of a mapping in
+    a stable order); with values, column 0 shows the key and column 1
+    values[key], otherwise the two columns are the two halves of each key.
+    Sorting and filtering only keep an array of source row numbers, never a
+    copy of the data. Large sources can speed them up with vectorized hooks:
+    keys.key_ranks(column), keys.rows_matching(text) and
+    values.values_array() (see compact.NamePairs and compact.PairValues).
+    Rows reach the view FETCH_CHUNK at a time as it scrolls, so opening
+    costs the same whatever the table size.
+    """
+
+    def __init__(self, keys, headers, values=None):
+        super().__init__()
+        self.keys = keys
+        self.headers = headers
+        self.values = values
+        self.order = None   # source rows in sort order, None for the natural order
+        self.rows = None    # order restricted to the filter, None for every row
+        self.filter_text = ""
+        self.loaded = min(FETCH_CHUNK, len(keys))
+
+    def total_rows(self):
+        return len(self.keys) if self.rows is None else len(self.rows)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else min(self.loaded, self.total_rows())
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < self.total_rows()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(FETCH_CHUNK, self.total_rows() - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def source_row(self, row):
+        return row if self.rows is None else int(self.rows[row])
+
+    def raw(self, source_row, column):
+        key = self.keys[source_row]
+        if self.values is None:
+            return key[column] if isinstance(key, tuple) and len(key) == 2 else (key if column == 0 else "")
+        return key if column == 0 else self.values[key]
+
+    def text(self, source_row, column):
+        value = self.raw(source_row, column)
+        return str(round(value, 2) if isinstance(value, float) else value)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self.text(self.source_row(index.row()), index.column())
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.beginResetModel()
+        if column < 0:
+            self.order = None
+        else:
+            self.order = np.argsort(self._sort_keys(column), kind="stable")
+            if order == Qt.DescendingOrder:
+                self.order = self.order[::-1]
+        self._apply_filter()
+        self.loaded = FETCH_CHUNK
+        self.endResetModel()
+
+    def _sort_keys(self, column):
+        n = len(self.keys)
+        if self.values is not None and column == 1:
+            if hasattr(self.values, "values_array"):
+                return self.values.values_array()
+            return np.fromiter((self.raw(i, 1) for i in range(n)), dtype=float, count=n)
+        if hasattr(self.keys, "key_ranks"):
+            return self.keys.key_ranks(column)
+        # Rank by the raw values (names, tuples of names) rather than their text
+        ranks = np.empty(n, dtype=np.int64)
+        ranks[sorted(range(n), key=lambda i: self.raw(i, column))] = np.arange(n)
+        return ranks
+
+    def set_filter(self, text):
+        """Keep the rows whose user or AP names contain text (case-insensitive)."""
+        self.beginResetModel()
+        self.filter_text = text.strip().lower()
+        self._apply_filter()
+        self.loaded = FETCH_CHUNK
+        self.endResetModel()
+
+    def _apply_filter(self):
+        if not self.filter_text:
+            self.rows = self.order
+            return
+        needle = self.filter_text
+        if hasattr(self.keys, "rows_matching"):
+            matches = self.keys.rows_matching(needle)
+        else:
+            matches = np.array([
+                i for i in range(len(self.keys))
+                if any(needle in str(part).lower() for part in self._key_parts(i))
+            ], dtype=np.int64)
+        self.rows = matches if self.order is None else self.order[np.isin(self.order, matches)]
+
+    def _key_parts(self, source_row):
+        key = self.keys[source_row]
+        return key if isinstance(key, tuple) else (key,)
+
 
 class CalculationsWindow(QWidget):
     def __init__(self, intermediates):
@@ -18,15 +168,18 @@ class CalculationsWindow(QWidget):
         title.setStyleSheet("font-size: 20px; font-weight: bold; color: #283593; margin-bottom: 16px;")
         layout.addWidget(title)
 
+        # The tables read the arrays of the compact form through its views
+        table = compact(intermediates)
+
         # === Reconstruct priority groups from weights ===
-        U_H = [u for u, weight in intermediates["w"].items() if weight == 3]
-        U_M = [u for u, weight in intermediates["w"].items() if weight == 2]
-        U_L = [u for u, weight in intermediates["w"].items() if weight == 1]
+        U_H = [table.user_names[i] for i in np.nonzero(table.weights == 3)[0].tolist()]
+        U_M = [table.user_names[i] for i in np.nonzero(table.weights == 2)[0].tolist()]
+        U_L = [table.user_names[i] for i in np.nonzero(table.weights == 1)[0].tolist()]
 
         # === Summary Table ===
         summary_items = [
-            ("Maximum AP range", intermediates["D_max"]),
-            ("AP interference radius", intermediates["D_intf"]),
+            ("Maximum AP range", table.D_max),
+            ("AP interference radius", table.D_intf),
             ("High Priority Users", ", ".join(U_H)),
             ("Medium Priority Users", ", ".join(U_M)),
             ("Low Priority Users", ", ".join(U_L))
@@ -47,19 +200,22 @@ class CalculationsWindow(QWidget):
         layout.addWidget(summary_table)
 
         # === Subtables in pairs ===
+        # c and distances are keyed by E and M by I, in the same order, so those views index their rows
         row1 = QHBoxLayout()
-        row1.addWidget(self.make_table("Feasible Edges ", intermediates["E"], ["User", "AP"]))
-        row1.addWidget(self.make_table("Distances", intermediates["distances"], ["(User, AP)", "Distance"]))
+        row1.addWidget(self.make_table("Feasible Edges ", table["E"], ["User", "AP"]))
+        row1.addWidget(self.make_table("Distances (feasible edges)", table.get("distances", {}),
+                                       ["(User, AP)", "Distance"]))
         layout.addLayout(row1)
 
         row2 = QHBoxLayout()
-        row2.addWidget(self.make_table("Energy Costs ", intermediates["c"], ["(User, AP)", "Cost"]))
-        row2.addWidget(self.make_table("Interference Pairs ", intermediates["I"], ["AP1", "AP2"]))
+        row2.addWidget(self.make_table("Energy Costs ", table["c"], ["(User, AP)", "Cost"], keys=table["E"]))
+        row2.addWidget(self.make_table("Interference Pairs ", table["I"], ["AP1", "AP2"]))
         layout.addLayout(row2)
 
         row3 = QHBoxLayout()
         row3.addStretch()
-        row3.addWidget(self.make_table("Maximum combined users", intermediates["M"], ["(AP1, AP2)", "M_ab"]))
+        row3.addWidget(self.make_table("Maximum combined users", table["M"], ["(AP1, AP2)", "M_ab"],
+                                       keys=table["I"]))
         row3.addStretch()
         layout.addLayout(row3)
 
@@ -68,7 +224,7 @@ class CalculationsWindow(QWidget):
     # === Add these two methods ===
     def table_style(self):
         return """
-            QTableWidget {
+            QTableView {
                 background-color: #f9f9f9;
                 border: 1px solid #b39ddb;
                 border-radius: 8px;
@@ -84,35 +240,46 @@ class CalculationsWindow(QWidget):
             }
         """
 
-    def make_table(self, title, data, headers):
+    def make_table(self, title, data, headers, keys=None):
+        """
+        A filterable, sortable table over data (a sequence of rows or a mapping).
+        keys gives the mapping's rows in order; otherwise its key_at() or a
+        list of its keys is used.
+        """
         box = QGroupBox(title)
         box_layout = QVBoxLayout(box)
 
-        table = QTableWidget()
-        table.setColumnCount(2)
-        table.setHorizontalHeaderLabels(headers)
+        if isinstance(data, Mapping):
+            if keys is None:
+                keys = _KeyAt(data) if hasattr(data, "key_at") else list(data)
+            model = IntermediatesTableModel(keys, headers, values=data)
+        elif isinstance(data, Sequence) and not isinstance(data, str):
+            model = IntermediatesTableModel(data, headers)
+        else:
+            model = IntermediatesTableModel([data], headers)
+
+        search = QLineEdit()
+        search.setPlaceholderText(f"Filter {len(model.keys):,} rows by user or AP name...")
+        search.setClearButtonEnabled(True)
+        # Filtering scans every row, so wait for a pause in typing
+        timer = QTimer(box)
+        timer.setSingleShot(True)
+        timer.setInterval(300)
+        timer.timeout.connect(lambda: model.set_filter(search.text()))
+        search.textChanged.connect(timer.start)
+        box_layout.addWidget(search)
+
+        table = QTableView()
+        model.setParent(table)
+        table.setModel(model)
+        # No sort column yet: enabling sorting must not sort everything up front
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Fixed row heights so the view never measures rows it does not show
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         table.verticalHeader().setVisible(False)
         table.setStyleSheet(self.table_style())
 
-        if isinstance(data, dict):
-            table.setRowCount(len(data))
-            for row, (key, value) in enumerate(data.items()):
-                table.setItem(row, 0, QTableWidgetItem(str(key)))
-                table.setItem(row, 1, QTableWidgetItem(str(round(value, 2) if isinstance(value, float) else value)))
-        elif isinstance(data, list):
-            table.setRowCount(len(data))
-            for row, item in enumerate(data):
-                if isinstance(item, tuple) and len(item) == 2:
-                    table.setItem(row, 0, QTableWidgetItem(str(item[0])))
-                    table.setItem(row, 1, QTableWidgetItem(str(item[1])))
-                else:
-                    table.setItem(row, 0, QTableWidgetItem(str(item)))
-                    table.setItem(row, 1, QTableWidgetItem(""))
-        else:
-            table.setRowCount(1)
-            table.setItem(0, 0, QTableWidgetItem(str(data)))
-            table.setItem(0, 1, QTableWidgetItem(""))
-
         box_layout.addWidget(table)
         return box
@@ -0,0 +1,175 @@
+# cli.py - headless batch runner
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from calculations import compute_intermediates
+from interference import MODELS
+from scenario import SCENARIO_EXTENSIONS, read_scenario
+from solver import solve_network, solver_options
+
+CSV_FIELDS = [
+    "file", "title", "status", "backend", "connected", "users", "aps", "avg_priority",
+    "load_time", "preprocess_time", "build_time", "optimize_time", "extract_time", "total_time",
+    "variables", "constraints", "nonzeros", "mip_gap", "node_count", "components",
+    "presolve_groups", "presolve_kept_edges", "interference_pairs", "interference_rows",
+    "error", "assignments",
+]
+
+
+def find_scenarios(paths):
+    """Expand files, directories (their scenario files) and glob patterns, in a stable order."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(f for f in os.listdir(path) if f.endswith(SCENARIO_EXTENSIONS))
+            found.extend(os.path.join(path, f) for f in names)
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            found.extend(sorted(glob.glob(path)))
+    return list(dict.fromkeys(found))
+
+
+def solve_scenario(file_path, overrides=None):
+    """
+    Load and solve one scenario file. Never raises: failures are reported in
+    the "error" field so one bad site does not stop a batch.
+    """
+    result = {"file": file_path, "title": None, "status": None, "error": None}
+    start = time.perf_counter()
+    try:
+        data = read_scenario(file_path)
+        users, aps, settings = data["users"], data["aps"], data["settings"]
+        result["title"] = data.get("title")
+        loaded = time.perf_counter()
+
+        intermediates = compute_intermediates(users, aps, settings)
+        preprocessed = time.perf_counter()
+
+        options = solver_options(settings)
+        options.update({k: v for k, v in (overrides or {}).items() if v is not None})
+        stats = {}
+        assignments, status = solve_network(intermediates, aps, stats=stats, **options)
+
+        connected = [u for u_list in assignments.values() for u in u_list]
+        result.update({
+            "status": status,
+            "backend": stats.get("backend"),
+            "connected": len(connected),
+            "users": len(users),
+            "aps": len(aps),
+            "avg_priority": (
+                sum(intermediates["w"][u] for u in connected) / len(connected) if connected else None
+            ),
+            "load_time": loaded - start,
+            "preprocess_time": preprocessed - loaded,
+            "build_time": stats.get("build_time"),
+            "optimize_time": stats.get("optimize_time"),
+            "extract_time": stats.get("extract_time"),
+            "variables": stats.get("variables"),
+            "constraints": stats.get("constraints"),
+            "nonzeros": stats.get("nonzeros"),
+            "mip_gap": stats.get("mip_gap"),
+            "node_count": stats.get("node_count"),
+            "components": stats.get("components"),
+            "presolve_groups": stats.get("presolve_groups"),
+            "presolve_kept_edges": stats.get("presolve_kept_edges"),
+            "interference_pairs": stats.get("interference_pairs"),
+            "interference_rows": stats.get("interference_rows"),
+            "assignments": assignments,
+        })
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["total_time"] = time.perf_counter() - start
+    return result
+
+
+def write_results(results, output, fmt):
+    """Write results to output (a path or "-") as JSON Lines or CSV, one row per scenario."""
+    stream = sys.stdout if output == "-" else open(output, "w", newline="")
+    try:
+        if fmt == "csv":
+            writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+        for result in results:
+            if fmt == "csv":
+                row = dict(result)
+                row["assignments"] = json.dumps(result.get("assignments"))
+                writer.writerow(row)
+            else:
+                stream.write(json.dumps(result) + "\n")
+            stream.flush()
+            yield result
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Solve scenario files (test_cases/ JSON format or .scnb) without the GUI."
+    )
+    parser.add_argument("paths", nargs="+", help="scenario files, directories or glob patterns")
+    parser.add_argument("-j", "--processes", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+                        help="output format (default: from the output extension, else jsonl)")
+    parser.add_argument("--backend", help="solver backend, overrides the scenario's SolverBackend")
+    parser.add_argument("--threads", type=int, help="solver threads per scenario")
+    parser.add_argument("--lambda", dest="lambda_energy", type=float, help="energy weight lambda")
+    parser.add_argument("--time-limit", dest="time_limit", type=float,
+                        help="seconds per scenario solve; returns the best incumbent when reached")
+    parser.add_argument("--mip-gap", dest="mip_gap", type=float, help="relative MIP gap target (e.g. 0.01)")
+    parser.add_argument("--portfolio", action="store_true", default=None,
+                        help="race several solver configurations per scenario and keep the first optimal one")
+    parser.add_argument("--decompose", action="store_true", default=None,
+                        help="solve each connected component of a scenario separately")
+    parser.add_argument("--component-processes", dest="component_processes", type=int,
+                        help="worker processes per scenario for --decompose/--portfolio "
+                             "(default: CPU count, or 1 when -j runs several scenarios at once)")
+    parser.add_argument("--presolve", action="store_true", default=None,
+                        help="aggregate interchangeable users and drop dominated edges first")
+    parser.add_argument("--presolve-tolerance", dest="presolve_tolerance", type=float,
+                        help="energy cost tolerance for merging users (default: exact)")
+    parser.add_argument("--interference", choices=MODELS,
+                        help="interference model of the MIP backends (default: the scenario's, else pairwise)")
+    args = parser.parse_args(argv)
+
+    files = find_scenarios(args.paths)
+    if not files:
+        parser.error("no scenario files found")
+
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+    component_processes = args.component_processes
+    if component_processes is None and args.processes > 1 and len(files) > 1:
+        # Scenarios already run in parallel: no CPU-count pool inside every worker
+        component_processes = 1
+    overrides = {
+        "backend": args.backend, "threads": args.threads, "lambda_energy": args.lambda_energy,
+        "decompose": args.decompose, "processes": component_processes,
+        "presolve": args.presolve, "presolve_tolerance": args.presolve_tolerance,
+        "time_limit": args.time_limit, "mip_gap": args.mip_gap, "portfolio": args.portfolio,
+        "interference": args.interference,
+    }
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.processes)) as pool:
+        results = pool.map(solve_scenario, files, [overrides] * len(files))
+        for result in write_results(results, args.output, fmt):
+            if result["error"]:
+                failed += 1
+                print(f"{result['file']}: {result['error']}", file=sys.stderr)
+
+    print(f"Solved {len(files) - failed}/{len(files)} scenarios.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
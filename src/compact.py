@@ -0,0 +1,299 @@
+# compact.py - array form of the intermediates, with dict views for older callers
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+KEYS = ("D_max", "D_intf", "distances", "E", "c", "I", "M", "w")
+
+
+def _ranks(names):
+    """Rank of each name in sorted order."""
+    ranks = np.empty(len(names), dtype=np.int64)
+    ranks[np.argsort(np.array(names, dtype=object), kind="stable")] = np.arange(len(names))
+    return ranks
+
+
+def _matching(names, text):
+    """Ids of the names containing text (already lower-cased)."""
+    return np.array([i for i, name in enumerate(names) if text in str(name).lower()], dtype=np.int64)
+
+
+def _csr(ids, n):
+    """(order, ptr) such that order[ptr[i]:ptr[i + 1]] are the positions of id i."""
+    order = np.argsort(ids, kind="stable")
+    ptr = np.concatenate(([0], np.cumsum(np.bincount(ids, minlength=n)))).astype(np.int64)
+    return order, ptr
+
+
+class NamePairs(Sequence):
+    """
+    (first, second) name tuples built on access from two id arrays and
+    their name tables: the E and I views of CompactIntermediates.
+    """
+
+    def __init__(self, first_names, second_names, first, second, locate):
+        self.first_names, self.second_names = first_names, second_names
+        self.first, self.second = first, second
+        self._locate = locate
+
+    def __len__(self):
+        return len(self.first)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(len(self)))]
+        return (self.first_names[self.first[index]], self.second_names[self.second[index]])
+
+    def __iter__(self):
+        first_names, second_names = self.first_names, self.second_names
+        for i, j in zip(self.first.tolist(), self.second.tolist()):
+            yield (first_names[i], second_names[j])
+
+    def __contains__(self, key):
+        return self._locate(key) is not None
+
+    # --- Whole-table helpers for sorting/filtering views without per-row Python ---
+    def key_ranks(self, column=0):
+        """
+        Per-row integers that sort like the (first, second) keys, or for
+        column 1 by the second name with the first as tie-break.
+        """
+        first, second = _ranks(self.first_names)[self.first], _ranks(self.second_names)[self.second]
+        if column == 1:
+            return second * len(self.first_names) + first
+        return first * len(self.second_names) + second
+
+    def rows_matching(self, text):
+        """Sorted row numbers whose first or second name contains text (case-insensitive)."""
+        text = text.lower()
+        hits = np.isin(self.first, _matching(self.first_names, text))
+        hits |= np.isin(self.second, _matching(self.second_names, text))
+        return np.nonzero(hits)[0]
+
+
+class PairValues(Mapping):
+    """Read-only {key: value} view over a NamePairs and a value array in the same order."""
+
+    def __init__(self, keys, values):
+        self.keys_view, self.values = keys, values
+
+    def __getitem__(self, key):
+        k = self.keys_view._locate(key)
+        if k is None:
+            raise KeyError(key)
+        return self.values[k].item()
+
+    def __iter__(self):
+        return iter(self.keys_view)
+
+    def __len__(self):
+        return len(self.keys_view)
+
+    def items(self):
+        return zip(self.keys_view, self.values.tolist())
+
+    def key_at(self, index):
+        """The index-th key in iteration order, in constant time (for table views)."""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.keys_view[index]
+
+    def values_array(self):
+        return self.values
+
+    def key_ranks(self, column=0):
+        return self.keys_view.key_ranks(column)
+
+    def rows_matching(self, text):
+        return self.keys_view.rows_matching(text)
+
+
+class CompactIntermediates(Mapping):
+    """
+    The intermediates as name tables and integer arrays.
+
+    Users and APs are stored once, in user_names / ap_names; everything
+    else refers to them by position. The feasible edges are sorted by user,
+    then AP, so user i's edges are the range user_ptr[i]:user_ptr[i + 1]
+    (CSR); ap_order[ap_ptr[j]:ap_ptr[j + 1]] lists AP j's edges. Each edge
+    has its energy cost and distance, each interference pair (pair_a1,
+    pair_a2) its limit M. Aggregated users (see presolve) have a count in
+    multiplicity.
+
+    As a mapping it offers the keys of compute_intermediates ("E", "c",
+    "distances", "I", "M", "w", ...) as read-only views built on access,
+    for callers that look up (user, AP) tuples. Only feasible edges have a
+    distance.
+    """
+
+    def __init__(self, D_max, D_intf, user_names, weights, ap_names, edge_user, edge_ap, edge_cost,
+                 edge_distance=None, pair_a1=None, pair_a2=None, pair_limit=None, multiplicity=None):
+        self.D_max, self.D_intf = D_max, D_intf
+        self.user_names = list(user_names)
+        self.ap_names = list(ap_names)
+        self.user_id = {name: i for i, name in enumerate(self.user_names)}
+        self.ap_id = {name: j for j, name in enumerate(self.ap_names)}
+        self.weights = np.asarray(weights, dtype=float)
+        self.multiplicity = None if multiplicity is None else np.asarray(multiplicity, dtype=np.int64)
+
+        edge_user = np.asarray(edge_user, dtype=np.int32)
+        edge_ap = np.asarray(edge_ap, dtype=np.int32)
+        order = np.lexsort((edge_ap, edge_user))
+        self.edge_user, self.edge_ap = edge_user[order], edge_ap[order]
+        self.edge_cost = np.asarray(edge_cost, dtype=float)[order]
+        self.edge_distance = None if edge_distance is None else np.asarray(edge_distance, dtype=float)[order]
+        _, self.user_ptr = _csr(self.edge_user, len(self.user_names))
+        self.ap_order, self.ap_ptr = _csr(self.edge_ap, len(self.ap_names))
+
+        empty = np.empty(0, dtype=np.int32)
+        self.pair_a1 = empty if pair_a1 is None else np.asarray(pair_a1, dtype=np.int32)
+        self.pair_a2 = empty if pair_a2 is None else np.asarray(pair_a2, dtype=np.int32)
+        self.pair_limit = np.empty(0, dtype=np.int64) if pair_limit is None else np.asarray(pair_limit, dtype=np.int64)
+        self._pair_index = None
+        self._views = {}
+
+    @classmethod
+    def from_dict(cls, intermediates):
+        """Intern a dict of intermediates (E, c, I, M, w and the optional n)."""
+        w = intermediates["w"]
+        E, c = intermediates["E"], intermediates["c"]
+        user_names = list(w)
+        user_id = {u: i for i, u in enumerate(user_names)}
+        ap_id = {}
+        for (_, a) in E:
+            ap_id.setdefault(a, len(ap_id))
+        for pair in intermediates["I"]:
+            for a in pair:
+                ap_id.setdefault(a, len(ap_id))
+        n = intermediates.get("n")
+        return cls(
+            intermediates.get("D_max"), intermediates.get("D_intf"),
+            user_names, list(w.values()), list(ap_id),
+            [user_id[u] for (u, _) in E], [ap_id[a] for (_, a) in E], [c[e] for e in E],
+            pair_a1=[ap_id[a1] for (a1, _) in intermediates["I"]],
+            pair_a2=[ap_id[a2] for (_, a2) in intermediates["I"]],
+            pair_limit=[intermediates["M"][pair] for pair in intermediates["I"]],
+            multiplicity=None if n is None else [n.get(u, 1) for u in user_names],
+        )
+
+    # --- Lookups ---
+    def edge_index(self, key):
+        """Position of edge (user, AP), or None."""
+        try:
+            u, a = key
+            i, j = self.user_id[u], self.ap_id[a]
+        except (TypeError, ValueError, KeyError):
+            return None
+        lo, hi = self.user_ptr[i], self.user_ptr[i + 1]
+        k = lo + int(np.searchsorted(self.edge_ap[lo:hi], j))
+        return k if k < hi and self.edge_ap[k] == j else None
+
+    def pair_index(self, key):
+        """Position of interference pair (AP1, AP2), or None."""
+        if self._pair_index is None:
+            self._pair_index = {pair: k for k, pair in enumerate(self["I"])}
+        try:
+            return self._pair_index.get(key)
+        except TypeError:
+            return None
+
+    # --- Arrays for the solvers ---
+    def profits(self, lambda_energy=1):
+        """w[u] - lambda * c[(u, a)] for every edge."""
+        return self.weights[self.edge_user] - lambda_energy * self.edge_cost
+
+    def edge_multiplicity(self):
+        """Upper bound of each edge's variable (the user's count, or 1)."""
+        if self.multiplicity is None:
+            return np.ones(len(self.edge_user))
+        return self.multiplicity[self.edge_user].astype(float)
+
+    def ap_positions(self, aps_data):
+        """Position in aps_data of each AP in ap_names (-1 if missing)."""
+        index = {a["Name"]: k for k, a in enumerate(aps_data)}
+        return np.array([index.get(a, -1) for a in self.ap_names], dtype=np.intp)
+
+    def take(self, edges, pairs):
+        """A CompactIntermediates over the given edge and pair positions, with their own name tables."""
+        users, edge_user = np.unique(self.edge_user[edges], return_inverse=True)
+        aps, ap_ids = np.unique(np.concatenate((self.edge_ap[edges], self.pair_a1[pairs], self.pair_a2[pairs])),
+                                return_inverse=True)
+        n_edges = len(edges)
+        edge_ap, pair_ids = ap_ids[:n_edges], ap_ids[n_edges:]
+        return CompactIntermediates(
+            self.D_max, self.D_intf,
+            [self.user_names[i] for i in users.tolist()], self.weights[users],
+            [self.ap_names[j] for j in aps.tolist()],
+            edge_user, edge_ap, self.edge_cost[edges],
+            None if self.edge_distance is None else self.edge_distance[edges],
+            pair_ids[:len(pairs)], pair_ids[len(pairs):], self.pair_limit[pairs],
+            None if self.multiplicity is None else self.multiplicity[users],
+        )
+
+    # --- Mapping (dict views) ---
+    def _view(self, key):
+        if key == "D_max":
+            return self.D_max
+        if key == "D_intf":
+            return self.D_intf
+        if key == "E":
+            return NamePairs(self.user_names, self.ap_names, self.edge_user, self.edge_ap, self.edge_index)
+        if key == "c":
+            return PairValues(self["E"], self.edge_cost)
+        if key == "distances":
+            return PairValues(self["E"], self.edge_distance)
+        if key == "I":
+            return NamePairs(self.ap_names, self.ap_names, self.pair_a1, self.pair_a2, self.pair_index)
+        if key == "M":
+            return PairValues(self["I"], self.pair_limit)
+        if key == "w":
+            return dict(zip(self.user_names, (int(v) if v.is_integer() else v for v in self.weights.tolist())))
+        if key == "n":
+            return dict(zip(self.user_names, self.multiplicity.tolist()))
+        raise KeyError(key)
+
+    def _keys(self):
+        keys = [k for k in KEYS if k != "distances" or self.edge_distance is not None]
+        return keys + ["n"] if self.multiplicity is not None else keys
+
+    def __getitem__(self, key):
+        if key not in self._views:
+            if key not in self._keys():
+                raise KeyError(key)
+            self._views[key] = self._view(key)
+        return self._views[key]
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __getstate__(self):
+        # Views are rebuilt on access; only the arrays travel to worker processes
+        state = dict(self.__dict__)
+        state["_views"], state["_pair_index"] = {}, None
+        return state
+
+
+def compact(intermediates):
+    """intermediates as a CompactIntermediates (converted from a dict if needed)."""
+    if isinstance(intermediates, CompactIntermediates):
+        return intermediates
+    return CompactIntermediates.from_dict(intermediates)
+
+
+def edge_profits(intermediates, lambda_energy=1):
+    """w[u] - lambda * c[(u, a)] for every edge, in the order of intermediates["E"]."""
+    if isinstance(intermediates, CompactIntermediates):
+        return intermediates.profits(lambda_energy)
+    w, c = intermediates["w"], intermediates["c"]
+    return np.array([w[u] - lambda_energy * c[(u, a)] for (u, a) in intermediates["E"]], dtype=float)
+
+
+def edge_costs(intermediates):
+    """c[(u, a)] for every edge, in the order of intermediates["E"]."""
+    if isinstance(intermediates, CompactIntermediates):
+        return intermediates.edge_cost
+    c = intermediates["c"]
+    return np.array([c[e] for e in intermediates["E"]], dtype=float)
@@ -0,0 +1,295 @@
+# decomposition.py - split the assignment model into independent components
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+
+from compact import compact
+from solver import solve_network
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # scipy is optional: fall back to a plain union-find
+    connected_components = None
+
+# Below this many edges a pool costs more than it saves; solve in-process
+MIN_PARALLEL_EDGES = 20000
+
+# Tasks per worker process, so one large component does not leave the others idle
+TASKS_PER_PROCESS = 4
+
+# Seconds stopped workers get to finish by themselves before they are killed
+STOP_GRACE = 1.0
+
+# Seconds between should_stop() checks while pooled components run
+_POLL = 0.05
+
+# Set in each pool worker: the run's stop event, shared at process start
+_stop_event = None
+
+
+def _labels_union_find(n, pairs):
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[ri] = rj
+    return [find(i) for i in range(n)]
+
+
+def _labels(table):
+    """Component label of every node: the table's users, then its APs."""
+    n_users = len(table.user_names)
+    n = n_users + len(table.ap_names)
+    rows = np.concatenate((table.edge_user, n_users + table.pair_a1)).astype(np.int64)
+    cols = np.concatenate((n_users + table.edge_ap, n_users + table.pair_a2)).astype(np.int64)
+    if connected_components is not None and len(rows):
+        graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+        return connected_components(graph, directed=False)[1]
+    return np.array(_labels_union_find(n, zip(rows.tolist(), cols.tolist())), dtype=np.int64)
+
+
+def _parts(table):
+    """
+    (labels, [(label, edges, pairs), ...]): the edge and interference pair
+    positions of each component with users, largest first (by edge count).
+    """
+    labels = _labels(table)
+    edge_labels = labels[table.edge_user]
+    pair_labels = labels[len(table.user_names) + table.pair_a1]
+
+    edge_order = np.argsort(edge_labels, kind="stable")
+    present, starts, counts = np.unique(edge_labels[edge_order], return_index=True, return_counts=True)
+    pair_order = np.argsort(pair_labels, kind="stable")
+    sorted_pairs = pair_labels[pair_order]
+
+    parts = []
+    for label, start, count in sorted(zip(present.tolist(), starts.tolist(), counts.tolist()),
+                                      key=lambda part: -part[2]):
+        lo, hi = np.searchsorted(sorted_pairs, label), np.searchsorted(sorted_pairs, label, side="right")
+        parts.append((label, edge_order[start:start + count], pair_order[lo:hi]))
+    return labels, parts
+
+
+def _component_aps(table, labels, parts, aps_data):
+    """aps_data split by component (in the order of parts); APs outside them are dropped."""
+    index = {label: k for k, (label, _, _) in enumerate(parts)}
+    n_users = len(table.user_names)
+    split = [[] for _ in parts]
+    for a in aps_data:
+        j = table.ap_id.get(a["Name"])
+        k = None if j is None else index.get(int(labels[n_users + j]))
+        if k is not None:
+            split[k].append(a)
+    return split
+
+
+def components(intermediates, aps_data):
+    """
+    Connected components of the graph whose nodes are users and APs and whose
+    links are the edges in E plus the interference pairs in I.
+
+    Returns a list of (users, aps) name lists, largest first (by edge count).
+    Only components with users are listed: nothing can be assigned to the
+    APs of the others.
+    """
+    table = compact(intermediates)
+    labels, parts = _parts(table)
+    split = _component_aps(table, labels, parts, aps_data)
+    return [
+        ([table.user_names[i] for i in np.unique(table.edge_user[edges]).tolist()], [a["Name"] for a in aps])
+        for (_, edges, _), aps in zip(parts, split)
+    ]
+
+
+def sub_problems(intermediates, aps_data):
+    """
+    The intermediates (as CompactIntermediates) and aps_data restricted to
+    each component, in the order of components(), sliced from the arrays.
+    """
+    table = compact(intermediates)
+    labels, parts = _parts(table)
+    split = _component_aps(table, labels, parts, aps_data)
+    return [(table.take(edges, pairs), aps) for (_, edges, pairs), aps in zip(parts, split)]
+
+
+def _init_worker(stop, started):
+    global _stop_event
+    _stop_event = stop
+    started.put(os.getpid())
+
+
+def _worker_should_stop():
+    """should_stop of the components solved in a pool worker."""
+    return _stop_event is not None and _stop_event.is_set()
+
+
+def _stop_pool(pool, started, n_workers):
+    """
+    Shut a stopped pool down without waiting for its queue: workers that
+    poll the stop event (Gurobi, flow) return by themselves, the others are
+    killed after STOP_GRACE seconds. The pool's workers are the (up to
+    n_workers) processes whose pids _init_worker put on started.
+    """
+    pids = set()
+    while len(pids) < n_workers and not started.empty():
+        pids.add(started.get())
+    workers = [p for p in multiprocessing.active_children() if p.pid in pids]
+    pool.shutdown(wait=False, cancel_futures=True)
+    grace_end = time.perf_counter() + STOP_GRACE
+    for worker in workers:
+        worker.join(max(0.0, grace_end - time.perf_counter()))
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+
+
+def _solve_task(problems, lambda_energy, backend, threads, warm_start, deadline=None, mip_gap=None,
+                should_stop=None, interference="pairwise"):
+    """
+    Solve a batch of sub-problems in order (runs in a worker process). With
+    a deadline (time.time() seconds, comparable across processes), each
+    component gets the share of the remaining time its edges make up of the
+    batch's remaining edges.
+    """
+    results = []
+    edges_left = sum(len(intermediates["E"]) + 1 for intermediates, _ in problems)
+    for intermediates, aps_data in problems:
+        if should_stop is not None and should_stop():
+            break
+        time_limit = None
+        if deadline is not None:
+            edges = len(intermediates["E"]) + 1
+            time_limit = max(0.0, deadline - time.time()) * edges / edges_left
+            edges_left -= edges
+        stats = {}
+        start = warm_start
+        if isinstance(warm_start, dict):
+            start = {a["Name"]: warm_start.get(a["Name"], []) for a in aps_data}
+        assignments, status = solve_network(intermediates, aps_data, lambda_energy, backend=backend,
+                                            threads=threads, stats=stats, warm_start=start,
+                                            time_limit=time_limit, mip_gap=mip_gap, should_stop=should_stop,
+                                            interference=interference)
+        results.append((assignments, status, stats))
+    return results
+
+
+def _tasks(problems, n_tasks):
+    """Split the problems into n_tasks batches of similar edge counts (largest first)."""
+    bins = [[0, []] for _ in range(n_tasks)]
+    for problem in problems:   # already sorted largest first
+        lightest = min(bins, key=lambda b: b[0])
+        lightest[0] += len(problem[0]["E"]) + 1
+        lightest[1].append(problem)
+    return [batch for _, batch in sorted(bins, key=lambda b: -b[0]) if batch]
+
+
+def _merge_status(statuses):
+    """Optimal only if every component is; otherwise the first other status, infeasibility first."""
+    if "Infeasible" in statuses:
+        return "Infeasible"
+    return next((s for s in statuses if s != "Optimal"), "Optimal")
+
+
+def solve_decomposed(intermediates, aps_data, lambda_energy=1, backend=None, threads=1, stats=None,
+                     warm_start=None, processes=None, time_limit=None, mip_gap=None, should_stop=None,
+                     interference="pairwise"):
+    """
+    solve_network over each connected component separately, across a process
+    pool of `processes` workers (default: CPU count), merged into one
+    assignments dict. Each component picks its backend on its own, so blocks
+    without interference pairs use the exact min-cost flow under "auto".
+    time_limit covers the whole run: each component gets a share of the
+    time left (see _solve_task), and keeps FALLBACK_RESERVE of it for the
+    heuristic fallback as in solve_network. mip_gap and interference apply
+    to each component's solve. should_stop() is checked between components
+    and passed on to their solves (through an event in pooled workers, see
+    _stop_pool); a stopped run keeps the components solved so far and
+    returns status "Interrupted".
+
+    The stats dict gets "components", "largest_component" (edges) and the
+    backends used, with build_time covering the split, optimize_time the
+    parallel solves and extract_time the merge.
+    """
+    start = time.perf_counter()
+    deadline = None if time_limit is None else time.time() + time_limit
+    problems = sub_problems(intermediates, aps_data)
+    split = time.perf_counter()
+
+    processes = processes or os.cpu_count() or 1
+    n_edges = len(intermediates["E"])
+    if processes > 1 and len(problems) > 1 and n_edges >= MIN_PARALLEL_EDGES:
+        tasks = _tasks(problems, min(len(problems), processes * TASKS_PER_PROCESS))
+        # spawn, not fork: the GUI solves from a QThread, and forking a threaded process is unsafe
+        context = multiprocessing.get_context("spawn")
+        stop, started = context.Event(), context.SimpleQueue()
+        n_workers = min(processes, len(tasks))
+        pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=context,
+                                   initializer=_init_worker, initargs=(stop, started))
+        try:
+            futures = [pool.submit(_solve_task, task, lambda_energy, backend, threads, warm_start,
+                                   deadline, mip_gap, _worker_should_stop, interference)
+                       for task in tasks]
+            results = []
+            for future in futures:
+                while not future.done() and not stop.is_set():
+                    if should_stop is not None and should_stop():
+                        stop.set()
+                    else:
+                        wait([future], timeout=_POLL)
+                if stop.is_set():
+                    break
+                results.extend(future.result())
+        finally:
+            if stop.is_set():
+                _stop_pool(pool, started, n_workers)
+            else:
+                pool.shutdown()
+    else:
+        results = _solve_task(problems, lambda_energy, backend, threads, warm_start, deadline, mip_gap,
+                              should_stop, interference)
+    solved = time.perf_counter()
+
+    assignments = {a["Name"]: [] for a in aps_data}
+    for sub_assignments, _, _ in results:
+        for a, users in sub_assignments.items():
+            assignments[a] = users
+    status = _merge_status([s for _, s, _ in results])
+    if len(results) < len(problems):
+        status = "Interrupted"
+
+    if stats is not None:
+        backends = sorted({s.get("backend") for _, _, s in results if s.get("backend")})
+        stats.update({
+            "backend": f"decomposed ({', '.join(backends) or 'none'})",
+            "components": len(problems),
+            "largest_component": len(problems[0][0]["E"]) if problems else 0,
+            "build_time": split - start,
+            "optimize_time": solved - split,
+            "extract_time": time.perf_counter() - solved,
+        })
+        for key in ("variables", "constraints", "nonzeros",
+                    "interference_pairs", "interference_rows", "interference_cliques", "implied_pairs"):
+            values = [s[key] for _, _, s in results if s.get(key) is not None]
+            if values:
+                stats[key] = sum(values)
+        models = {s["interference_model"] for _, _, s in results if s.get("interference_model")}
+        if models:
+            stats["interference_model"] = ", ".join(sorted(models))
+        rounds = [s["lazy_rounds"] for _, _, s in results if s.get("lazy_rounds") is not None]
+        if rounds:
+            stats["lazy_rounds"] = max(rounds)
+        gaps = [s["mip_gap"] for _, _, s in results if s.get("mip_gap") is not None]
+        if gaps:
+            stats["mip_gap"] = max(gaps)
+    return assignments, status
@@ -0,0 +1,178 @@
+# generator.py - seeded synthetic scenarios
+import argparse
+import json
+import math
+import os
+import numpy as np
+import scenario_binary
+from calculations import radio_parameters
+
+LAYOUTS = ("uniform", "clustered", "corridor")
+
+PRIORITIES = ["High", "Medium", "Low"]
+DEVICES = ["IoT Sensor", "Wearable", "Smartphone", "Tablet", "Laptop"]
+CHANNELS = [1, 6, 11]
+
+DEFAULT_SETTINGS = {
+    "WifiBand": "2.4 GHz",
+    "EnvironmentType": "Indoor",
+    "IncludePowerConsumption": True
+}
+
+
+def _points(rng, n, layout, side, corridor_width, centers):
+    """n integer points in the layout's footprint."""
+    if layout == "uniform":
+        xy = rng.uniform(0, side, size=(n, 2))
+    elif layout == "clustered":
+        # Tight Gaussian groups around the centers, like "Dense User Cluster"
+        which = rng.integers(0, len(centers), size=n)
+        xy = centers[which] + rng.normal(0, side / (4 * math.sqrt(len(centers))), size=(n, 2))
+    else:  # corridor: a long strip of fixed width
+        xy = np.column_stack((rng.uniform(0, side, n), rng.uniform(0, corridor_width, n)))
+    return np.rint(xy).astype(int)
+
+
+def generate_scenario(n_users, n_aps=None, layout="uniform", seed=0, settings=None,
+                      users_per_ap=10, capacity=(5, 15), title=None, ap_spacing=1.0):
+    """
+    Build a scenario dict in the test_cases/ format (title, users, aps, settings).
+
+    Users follow the layout ("uniform", "clustered" or "corridor"); APs sit on
+    a jittered grid over the same footprint, spaced at about ap_spacing
+    coverage radii (1 by default) so most users are reachable; smaller
+    spacings give dense deployments with many same-channel neighbours. The
+    area grows with the number of APs, keeping density (and so edges per
+    user) roughly constant across sizes.
+    The same arguments always give the same scenario.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Choose from: {', '.join(LAYOUTS)}")
+
+    rng = np.random.default_rng(seed)
+    settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+    n_aps = n_aps or max(1, math.ceil(n_users / users_per_ap))
+
+    # AP spacing ~ ap_spacing coverage radii for these settings
+    _, D_max, _ = radio_parameters(settings)
+    spacing = ap_spacing * D_max
+
+    if layout == "corridor":
+        corridor_width = 2 * spacing
+        cols = n_aps
+    else:
+        corridor_width = None
+        cols = max(1, math.ceil(math.sqrt(n_aps)))
+    side = cols * spacing
+
+    grid = np.array([((i % cols) + 0.5, (i // cols) + 0.5) for i in range(n_aps)]) * spacing
+    if layout == "corridor":
+        grid[:, 1] = corridor_width / 2
+    ap_xy = np.rint(grid + rng.uniform(-spacing / 4, spacing / 4, size=grid.shape)).astype(int)
+
+    centers = rng.uniform(0, side, size=(max(1, n_aps // 4), 2))
+    user_xy = _points(rng, n_users, layout, side, corridor_width, centers)
+
+    priorities = rng.integers(0, len(PRIORITIES), size=n_users)
+    devices = rng.integers(0, len(DEVICES), size=n_users)
+    capacities = rng.integers(capacity[0], capacity[1] + 1, size=n_aps)
+    channels = rng.integers(0, len(CHANNELS), size=n_aps)
+
+    users = [
+        {"Name": f"U{i + 1}", "Priority": PRIORITIES[p], "X": int(x), "Y": int(y), "Device": DEVICES[d]}
+        for i, ((x, y), p, d) in enumerate(zip(user_xy.tolist(), priorities.tolist(), devices.tolist()))
+    ]
+    aps = [
+        {"Name": f"AP{j + 1}", "Capacity": int(k), "Channel": CHANNELS[ch], "X": int(x), "Y": int(y)}
+        for j, ((x, y), k, ch) in enumerate(zip(ap_xy.tolist(), capacities.tolist(), channels.tolist()))
+    ]
+
+    return {
+        "title": title or f"Synthetic {layout} ({n_users} users, {n_aps} APs, seed {seed})",
+        "users": users,
+        "aps": aps,
+        "settings": settings,
+    }
+
+
+def generate_events(scenario, n_events, seed=0, mix=(0.4, 0.3, 0.3), rate=100.0):
+    """
+    A seeded event log (see online.read_events) over a scenario: joins at
+    random points of the APs' footprint, leaves of present users and moves of
+    up to one coverage radius, drawn with probabilities mix = (join, leave,
+    move). Timestamps follow a Poisson process of `rate` events per second.
+    """
+    rng = np.random.default_rng(seed)
+    _, D_max, _ = radio_parameters(scenario["settings"])
+    ap_xy = np.array([(a["X"], a["Y"]) for a in scenario["aps"]], dtype=float).reshape(-1, 2)
+    lo, hi = ap_xy.min(axis=0) - D_max, ap_xy.max(axis=0) + D_max
+
+    present = {u["Name"]: (u["X"], u["Y"]) for u in scenario["users"]}
+    names = list(present)   # may hold departed names; skipped when drawn
+    events, t, joined = [], 0.0, 0
+    while len(events) < n_events:
+        t += float(rng.exponential(1 / rate))
+        kind = ("join", "leave", "move")[int(rng.choice(3, p=mix))]
+        if kind != "join" and not present:
+            kind = "join"
+        if kind == "join":
+            joined += 1
+            name = f"J{joined}"
+            x, y = np.rint(rng.uniform(lo, hi)).astype(int).tolist()
+            user = {"Name": name, "Priority": PRIORITIES[int(rng.integers(len(PRIORITIES)))],
+                    "X": x, "Y": y, "Device": DEVICES[int(rng.integers(len(DEVICES)))]}
+            present[name] = (x, y)
+            names.append(name)
+            events.append({"t": round(t, 6), "type": "join", "user": user})
+            continue
+
+        name = names[int(rng.integers(len(names)))]
+        while name not in present:
+            name = names[int(rng.integers(len(names)))]
+        if kind == "leave":
+            del present[name]
+            events.append({"t": round(t, 6), "type": "leave", "name": name})
+        else:
+            x, y = present[name]
+            x, y = np.rint(np.array((x, y)) + rng.uniform(-D_max, D_max, size=2)).astype(int).tolist()
+            present[name] = (x, y)
+            events.append({"t": round(t, 6), "type": "move", "name": name, "X": x, "Y": y})
+    return events
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic scenario file (JSON, or .scnb by extension).")
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--aps", type=int, help="default: one AP per 10 users")
+    parser.add_argument("--layout", choices=LAYOUTS, default="uniform")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--band", choices=("2.4 GHz", "5 GHz"), default=DEFAULT_SETTINGS["WifiBand"])
+    parser.add_argument("--environment", choices=("Indoor", "Urban", "Outdoor"),
+                        default=DEFAULT_SETTINGS["EnvironmentType"])
+    parser.add_argument("--ap-spacing", type=float, default=1.0,
+                        help="AP grid spacing in coverage radii (smaller is denser)")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--events", type=int, help="also write an event log with this many events")
+    parser.add_argument("--events-output", help="event log path (default: <output>.events.jsonl)")
+    args = parser.parse_args(argv)
+
+    scenario = generate_scenario(
+        args.users, args.aps, args.layout, args.seed,
+        settings={"WifiBand": args.band, "EnvironmentType": args.environment},
+        ap_spacing=args.ap_spacing,
+    )
+    if args.output.endswith(scenario_binary.EXTENSION):
+        scenario_binary.write_scenario(args.output, scenario)
+    else:
+        with open(args.output, "w") as f:
+            json.dump(scenario, f, indent=2)
+
+    if args.events:
+        path = args.events_output or os.path.splitext(args.output)[0] + ".events.jsonl"
+        with open(path, "w") as f:
+            for event in generate_events(scenario, args.events, args.seed):
+                f.write(json.dumps(event) + "\n")
+
+
+if __name__ == "__main__":
+    main()
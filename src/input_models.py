@@ -0,0 +1,220 @@
+# input_models.py - table models, delegates and bulk import for the input tables
+import csv
+import os
+
+from PyQt5.QtWidgets import QStyledItemDelegate, QComboBox, QLineEdit, QSpinBox
+from PyQt5.QtGui import QIntValidator
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from scenario import read_scenario
+
+# (header, record key, editor kind, choices or default)
+# Kinds: "text", "choice" (combo box), "coord" (integer or empty), "count" (spin box)
+USER_COLUMNS = [
+    ("Name", "Name", "text", ""),
+    ("Priority", "Priority", "choice", ["Low", "Medium", "High"]),
+    ("X", "X", "coord", None),
+    ("Y", "Y", "coord", None),
+    ("Device type", "Device", "choice", ["IoT Sensor", "Wearable", "Smartphone", "Tablet", "Laptop"]),
+]
+
+AP_COLUMNS = [
+    ("Name", "Name", "text", ""),
+    ("Capacity", "Capacity", "count", 0),
+    ("Channel", "Channel", "count", 0),
+    ("X", "X", "coord", None),
+    ("Y", "Y", "coord", None),
+]
+
+
+def _default(kind, extra):
+    return extra[0] if kind == "choice" else extra
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Editable table over a list of record dicts (the users/aps format of the
+    scenario files). Rows are plain dicts, so records() needs no per-cell
+    widget work and bulk loads are a single model reset.
+    """
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.rows = []
+        self.disabled = set()   # record keys whose column is greyed out
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if self.columns[index.column()][1] in self.disabled:
+            return Qt.ItemIsSelectable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        value = self.rows[index.row()].get(self.columns[index.column()][1])
+        if role == Qt.DisplayRole:
+            return "" if value is None else str(value)
+        return value
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        self.rows[index.row()][self.columns[index.column()][1]] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    # --- Row management ---
+    def new_record(self):
+        return {key: _default(kind, extra) for _, key, kind, extra in self.columns}
+
+    def append_row(self):
+        row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.append(self.new_record())
+        self.endInsertRows()
+
+    def remove_last_row(self):
+        if self.rows:
+            row = len(self.rows) - 1
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.rows.pop()
+            self.endRemoveRows()
+
+    def set_records(self, records):
+        """Replace every row; missing fields get the column defaults."""
+        self.beginResetModel()
+        self.rows = [dict(self.new_record(), **record) for record in records]
+        self.endResetModel()
+
+    def records(self):
+        """The rows as a list of fresh dicts, in the scenario format."""
+        return [{key: row.get(key) for _, key, _, _ in self.columns} for row in self.rows]
+
+    def set_column_enabled(self, key, enabled):
+        if enabled:
+            self.disabled.discard(key)
+        else:
+            self.disabled.add(key)
+        column = next(i for i, c in enumerate(self.columns) if c[1] == key)
+        if self.rows:
+            self.dataChanged.emit(self.index(0, column), self.index(len(self.rows) - 1, column))
+
+
+class RecordDelegate(QStyledItemDelegate):
+    """Editors matching the old per-cell widgets, created only while a cell is edited."""
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+
+    def createEditor(self, parent, option, index):
+        _, _, kind, extra = self.columns[index.column()]
+        if kind == "choice":
+            editor = QComboBox(parent)
+            editor.addItems(extra)
+        elif kind == "count":
+            editor = QSpinBox(parent)
+        else:
+            editor = QLineEdit(parent)
+            if kind == "coord":
+                editor.setValidator(QIntValidator(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.EditRole)
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText("" if value is None else str(value))
+        elif isinstance(editor, QSpinBox):
+            editor.setValue(int(value or 0))
+        else:
+            editor.setText("" if value is None else str(value))
+
+    def setModelData(self, editor, model, index):
+        kind = self.columns[index.column()][2]
+        if isinstance(editor, QComboBox):
+            value = editor.currentText()
+        elif isinstance(editor, QSpinBox):
+            value = editor.value()
+        elif kind == "coord":
+            text = editor.text()
+            value = int(text) if text else None
+        else:
+            value = editor.text()
+        model.setData(index, value, Qt.EditRole)
+
+
+# --- Bulk import ---
+def _integer(text):
+    """An integer written as "3" or "3.0"; raises ValueError for "2.7" rather than truncating it."""
+    value = float(text)
+    if not value.is_integer():
+        raise ValueError(text)
+    return int(value)
+
+
+def _convert(kind, text):
+    text = (text or "").strip()
+    if kind == "coord":
+        return _integer(text) if text else None
+    if kind == "count":
+        return _integer(text) if text else 0
+    return text
+
+
+def read_csv_records(file_path, columns):
+    """
+    Read records from a CSV file whose header names the record keys (e.g.
+    Name,Priority,X,Y,Device); missing columns get their defaults.
+    """
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        header = {name.strip(): name for name in reader.fieldnames or []}
+        if "Name" not in header:
+            raise ValueError("CSV must have a 'Name' column.")
+        records = []
+        for line, raw in enumerate(reader, start=2):
+            record = {}
+            for _, key, kind, extra in columns:
+                if key in header:
+                    try:
+                        record[key] = _convert(kind, raw[header[key]])
+                    except ValueError:
+                        raise ValueError(f"Line {line}: invalid {key} '{raw[header[key]]}'") from None
+                else:
+                    record[key] = _default(kind, extra)
+            records.append(record)
+    return records
+
+
+def csv_table(file_path):
+    """Which table a CSV file is for: "aps" if it has a Capacity or Channel column, else "users"."""
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        header = {name.strip() for name in next(csv.reader(f), [])}
+    return "aps" if header & {"Capacity", "Channel"} else "users"
+
+
+def import_file(file_path):
+    """
+    Read a CSV table or a scenario JSON file for the input window.
+    Returns {"users": [...], "aps": [...], "settings": {...}} with only the
+    parts the file provides.
+    """
+    if os.path.splitext(file_path)[1].lower() == ".csv":
+        table = csv_table(file_path)
+        return {table: read_csv_records(file_path, AP_COLUMNS if table == "aps" else USER_COLUMNS)}
+    data = read_scenario(file_path)
+    return {"users": data["users"], "aps": data["aps"], "settings": data["settings"]}
@@ -1,20 +1,20 @@
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QTableWidget, QTableWidgetItem, QPushButton,
-    QComboBox, QCheckBox, QLineEdit, QSpinBox,
-    QSizePolicy, QSpacerItem, QHeaderView, QMessageBox
+    QLabel, QTableView, QPushButton, QComboBox, QCheckBox,
+    QSizePolicy, QSpacerItem, QHeaderView, QMessageBox, QFileDialog, QAbstractItemView
 )
-from PyQt5.QtGui import QFont, QPixmap, QIntValidator
+from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt
 from calculations import compute_intermediates
+from input_models import AP_COLUMNS, USER_COLUMNS, RecordDelegate, RecordTableModel, import_file
 from output_ui import OutputWindow
-from solver_thread import SolverThread  # QThread wrapper for the solver
+from instrumentation import format_incumbent, format_stats
+from scheduler import shared_scheduler, status_text  # shared solver job queue
 
 
 class NetworkGUI(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.device_combos = []
         self.setWindowTitle("Wireless Network Optimization")
         self.setWindowState(Qt.WindowMaximized)
         self.setFont(QFont("Roboto", 11))
@@ -51,12 +51,10 @@ class NetworkGUI(QMainWindow):
         )
         user_layout.addWidget(user_label)
 
-        self.user_table = QTableWidget(0, 5)
-        self.user_table.setHorizontalHeaderLabels(["Name", "Priority", "X", "Y", "Device type"])
-        self.user_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.user_table.verticalHeader().setVisible(False)
+        self.user_model = RecordTableModel(USER_COLUMNS, self)
+        self.user_table = self.make_input_table(self.user_model, USER_COLUMNS)
         self.user_table.setStyleSheet("""
-            QTableWidget { background-color: #e8eaf6; font-family: Roboto; border: 1px solid #7e57c2; }
+            QTableView { background-color: #e8eaf6; font-family: Roboto; border: 1px solid #7e57c2; }
             QHeaderView::section { background-color: #5c6bc0; color: white; font-weight: bold; padding: 6px; }
         """)
         user_layout.addWidget(self.user_table)
@@ -91,12 +89,10 @@ class NetworkGUI(QMainWindow):
         )
         ap_layout.addWidget(ap_label)
 
-        self.ap_table = QTableWidget(0, 5)
-        self.ap_table.setHorizontalHeaderLabels(["Name", "Capacity", "Channel", "X", "Y"])
-        self.ap_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.ap_table.verticalHeader().setVisible(False)
+        self.ap_model = RecordTableModel(AP_COLUMNS, self)
+        self.ap_table = self.make_input_table(self.ap_model, AP_COLUMNS)
         self.ap_table.setStyleSheet("""
-            QTableWidget { background-color: #e8eaf6; font-family: Roboto; border: 1px solid #5c6bc0; }
+            QTableView { background-color: #e8eaf6; font-family: Roboto; border: 1px solid #5c6bc0; }
             QHeaderView::section { background-color: #5c6bc0; color: white; font-weight: bold; padding: 6px; }
         """)
         ap_layout.addWidget(self.ap_table)
@@ -136,6 +132,10 @@ class NetworkGUI(QMainWindow):
         """)
         self.power_checkbox.stateChanged.connect(self.toggle_device_combos)
         self.power_checkbox.setChecked(False)
+        self.toggle_device_combos(Qt.Unchecked)
+
+        self.import_btn = QPushButton("Import CSV/JSON")
+        self.import_btn.setStyleSheet(self.green_button())
 
         self.calculate_btn = QPushButton("Calculate")
         self.calculate_btn.setStyleSheet("""
@@ -144,6 +144,12 @@ class NetworkGUI(QMainWindow):
                     font-weight: bold; padding: 10px 20px; border-radius: 18px; }
             QPushButton:hover { background-color: #6a1b9a; }
         """)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setStyleSheet(self.red_button())
+        self.cancel_btn.setEnabled(False)
+        self.solver_status = QLabel(status_text(0, 0))
+        self.solver_status.setStyleSheet("QLabel { color: #283593; font-weight: 600; }")
+
         self.test_examples_btn = QPushButton("Test predefined examples")
         self.test_examples_btn.setStyleSheet("""
             QPushButton { background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
@@ -158,8 +164,11 @@ class NetworkGUI(QMainWindow):
         settings_layout.addWidget(env_label)
         settings_layout.addWidget(self.env_type)
         settings_layout.addWidget(self.power_checkbox)
+        settings_layout.addWidget(self.import_btn)
         settings_layout.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Expanding, QSizePolicy.Minimum))
         settings_layout.addWidget(self.calculate_btn)
+        settings_layout.addWidget(self.cancel_btn)
+        settings_layout.addWidget(self.solver_status)
         settings_layout.addWidget(self.test_examples_btn)
         settings_layout.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
@@ -170,7 +179,10 @@ class NetworkGUI(QMainWindow):
         self.remove_user_btn.clicked.connect(self.remove_user_row)
         self.add_ap_btn.clicked.connect(self.add_ap_row)
         self.remove_ap_btn.clicked.connect(self.remove_ap_row)
+        self.import_btn.clicked.connect(self.import_data)
         self.calculate_btn.clicked.connect(self.run_solver)
+        self.cancel_btn.clicked.connect(self.cancel_solver)
+        shared_scheduler().status_changed.connect(self.update_solver_status)
         self.test_examples_btn.clicked.connect(self.open_test_cases_window)
 
     # --- Styles ---
@@ -184,88 +196,65 @@ class NetworkGUI(QMainWindow):
         return "QComboBox { background-color: #ffffff; border: 1px solid #90caf9; border-radius: 10px; padding: 6px 8px; min-width: 140px; } QComboBox QAbstractItemView { background-color: #ffffff; border: 1px solid #90caf9; selection-background-color: #bbdefb; }"
 
     # --- Table logic ---
+    def make_input_table(self, model, columns):
+        table = QTableView()
+        table.setModel(model)
+        table.setItemDelegate(RecordDelegate(columns, table))
+        table.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.verticalHeader().setVisible(False)
+        return table
+
     def add_user_row(self):
-        row = self.user_table.rowCount()
-        self.user_table.insertRow(row)
-        self.user_table.setCellWidget(row, 0, QLineEdit())
-        priority_combo = QComboBox()
-        priority_combo.addItems(["Low", "Medium", "High"])
-        self.user_table.setCellWidget(row, 1, priority_combo)
-        x_edit = QLineEdit()
-        x_edit.setValidator(QIntValidator())
-        self.user_table.setCellWidget(row, 2, x_edit)
-        y_edit = QLineEdit()
-        y_edit.setValidator(QIntValidator())
-        self.user_table.setCellWidget(row, 3, y_edit)
-        device_combo = QComboBox()
-        device_combo.addItems(["IoT Sensor", "Wearable", "Smartphone", "Tablet", "Laptop"])
-        device_combo.setEnabled(self.power_checkbox.isChecked())
-        self.user_table.setCellWidget(row, 4, device_combo)
-        self.device_combos.append(device_combo)
+        self.user_model.append_row()
 
     def remove_user_row(self):
-        row = self.user_table.rowCount()
-        if row > 0:
-            self.user_table.removeRow(row - 1)
-            self.device_combos.pop()
+        self.user_model.remove_last_row()
 
     def add_ap_row(self):
-        row = self.ap_table.rowCount()
-        self.ap_table.insertRow(row)
-        self.ap_table.setCellWidget(row, 0, QLineEdit())
-        self.ap_table.setCellWidget(row, 1, QSpinBox())
-        self.ap_table.setCellWidget(row, 2, QSpinBox())
-        x_edit = QLineEdit()
-        x_edit.setValidator(QIntValidator())
-        self.ap_table.setCellWidget(row, 3, x_edit)
-        y_edit = QLineEdit()
-        y_edit.setValidator(QIntValidator())
-        self.ap_table.setCellWidget(row, 4, y_edit)
+        self.ap_model.append_row()
 
     def remove_ap_row(self):
-        row = self.ap_table.rowCount()
-        if row > 0:
-            self.ap_table.removeRow(row - 1)
+        self.ap_model.remove_last_row()
 
     def toggle_device_combos(self, state):
-        enabled = state == Qt.Checked
-        for combo in self.device_combos:
-            combo.setEnabled(enabled)
+        self.user_model.set_column_enabled("Device", state == Qt.Checked)
 
     # --- Save/load tables ---
     def save_user_table(self):
-        users_data = []
-        for row in range(self.user_table.rowCount()):
-            name = self.user_table.cellWidget(row, 0).text()
-            priority = self.user_table.cellWidget(row, 1).currentText()
-            x_text = self.user_table.cellWidget(row, 2).text()
-            y_text = self.user_table.cellWidget(row, 3).text()
-            device = self.user_table.cellWidget(row, 4).currentText()
-            users_data.append({
-                "Name": name,
-                "Priority": priority,
-                "X": int(x_text) if x_text else None,
-                "Y": int(y_text) if y_text else None,
-                "Device": device
-            })
-        return users_data
+        return self.user_model.records()
 
     def save_ap_table(self):
-        aps_data = []
-        for row in range(self.ap_table.rowCount()):
-            name = self.ap_table.cellWidget(row, 0).text()
-            capacity = self.ap_table.cellWidget(row, 1).value()
-            channel = self.ap_table.cellWidget(row, 2).value()
-            x_text = self.ap_table.cellWidget(row, 3).text()
-            y_text = self.ap_table.cellWidget(row, 4).text()
-            aps_data.append({
-                "Name": name,
-                "Capacity": capacity,
-                "Channel": channel,
-                "X": int(x_text) if x_text else None,
-                "Y": int(y_text) if y_text else None
-            })
-        return aps_data
+        return self.ap_model.records()
+
+    def import_data(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import users/APs", "", "Scenario or table (*.json *.scnb *.csv);;All files (*)"
+        )
+        if not file_path:
+            return
+        try:
+            data = import_file(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Import Error", f"Failed to import {file_path}:\n{e}")
+            return
+
+        if "users" in data:
+            self.user_model.set_records(data["users"])
+        if "aps" in data:
+            self.ap_model.set_records(data["aps"])
+        settings = data.get("settings")
+        if settings:
+            self.set_global_settings(settings)
+
+    def set_global_settings(self, settings):
+        if "WifiBand" in settings:
+            self.wifi_band.setCurrentText(settings["WifiBand"])
+        if "EnvironmentType" in settings:
+            self.env_type.setCurrentText(settings["EnvironmentType"])
+        if "IncludePowerConsumption" in settings:
+            self.power_checkbox.setChecked(bool(settings["IncludePowerConsumption"]))
 
     def get_global_settings(self):
         return {
@@ -279,17 +268,39 @@ class NetworkGUI(QMainWindow):
         users = self.save_user_table()
         aps = self.save_ap_table()
         settings = self.get_global_settings()
-        self.calculate_btn.setEnabled(False)
 
-        self.solver_thread = SolverThread(users, aps, settings)
-        self.solver_thread.result_ready.connect(
-            lambda assignments, status, intermediates: self.on_solver_finished(assignments, status, intermediates, users, aps, settings)
+        # A new request replaces this window's queued or running one
+        self.live_output = None   # opened by the first streamed incumbent
+        shared_scheduler().submit(
+            self, users, aps, settings,
+            on_result=lambda assignments, status, intermediates, stats:
+            self.on_solver_finished(assignments, status, intermediates, users, aps, settings, stats),
+            on_error=self.on_solver_error,
+            on_incumbent=lambda assignments, info: self.on_incumbent(assignments, info, users, aps, settings),
         )
-        self.solver_thread.error.connect(self.on_solver_error)
-        self.solver_thread.start()
 
-    def on_solver_finished(self, assignments, status, intermediates, users, aps, settings):
-        self.calculate_btn.setEnabled(True)
+    def cancel_solver(self):
+        shared_scheduler().cancel(self)
+        if self.live_output is not None:
+            self.live_output.append_solver_message("Cancelled: showing the best assignment found so far.")
+            self.live_output = None
+
+    def update_solver_status(self, running, queued):
+        self.solver_status.setText(status_text(running, queued))
+        self.cancel_btn.setEnabled(shared_scheduler().has_job(self))
+
+    def on_incumbent(self, assignments, info, users, aps, settings):
+        """Show the best assignment found so far while the solver keeps searching."""
+        messages = [format_incumbent(info)]
+        if self.live_output is None:
+            self.live_output = OutputWindow(users, aps, settings, assignments, messages=messages)
+            self.output_window = self.live_output
+            self.output_window.show()
+        else:
+            self.live_output.set_assignments(assignments)
+            self.live_output.set_solver_messages(messages)
+
+    def on_solver_finished(self, assignments, status, intermediates, users, aps, settings, stats=None):
         total_connected = sum(len(u_list) for u_list in assignments.values())
         total_users = len(users)
         if total_connected > 0:
@@ -305,11 +316,16 @@ class NetworkGUI(QMainWindow):
                 f"Total users connected: {total_connected}/{total_users}",
                 "Average priority cannot be computed (no users connected)."
             ]
+        messages.extend(format_stats(stats or {}))
+        if self.live_output is not None:
+            self.live_output.set_assignments(assignments)
+            self.live_output.set_solver_messages(messages)
+            self.live_output = None
+            return
         self.output_window = OutputWindow(users, aps, settings, assignments, messages=messages)
         self.output_window.show()
 
     def on_solver_error(self, error_msg):
-        self.calculate_btn.setEnabled(True)
         QMessageBox.critical(self, "Solver Error", error_msg)
 
     # --- Test cases ---
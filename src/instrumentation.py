@@ -0,0 +1,114 @@
+# instrumentation.py - per-solve timings, solver statistics and optional profiling
+import cProfile
+import itertools
+import os
+import time
+from contextlib import contextmanager
+
+PROFILE_ENV_VAR = "RO_MATCHING_PROFILE_DIR"
+
+_profile_counter = itertools.count(1)
+
+PHASES = [
+    ("preprocess_time", "preprocess"),
+    ("presolve_time", "presolve"),
+    ("warm_start_time", "warm start"),
+    ("build_time", "build"),
+    ("optimize_time", "optimize"),
+    ("extract_time", "extract"),
+]
+
+
+@contextmanager
+def phase(stats, key):
+    """Record the wall time of the block in stats[key] (seconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats[key] = time.perf_counter() - start
+
+
+def profile_dir(settings):
+    """Directory for cProfile dumps: the ProfileDir setting, else RO_MATCHING_PROFILE_DIR, else None."""
+    return settings.get("ProfileDir") or os.environ.get(PROFILE_ENV_VAR) or None
+
+
+def run_profiled(fn, directory, label="solve"):
+    """Call fn() under cProfile and dump the profile into directory; returns (result, dump path)."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_profile_counter)}.prof")
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(fn)
+    finally:
+        profiler.dump_stats(path)
+    return result, path
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.1f} ms"
+
+
+def format_stats(stats):
+    """Human-readable lines for the output window's message area."""
+    lines = []
+    if stats.get("backend"):
+        lines.append(f"Solver backend: {stats['backend']}")
+
+    timings = [f"{label} {_ms(stats[key])}" for key, label in PHASES if stats.get(key) is not None]
+    if timings:
+        lines.append("Timings: " + ", ".join(timings))
+
+    if stats.get("presolve_groups") is not None:
+        before, after = stats["presolve_edges"], stats["presolve_kept_edges"]
+        reduction = 1 - after / before if before else 0
+        lines.append(
+            f"Presolve: {stats['presolve_users']} users in {stats['presolve_groups']} groups, "
+            f"{before} -> {after} edges ({reduction:.0%} smaller)"
+        )
+
+    if stats.get("components") is not None:
+        lines.append(
+            f"Decomposition: {stats['components']} components, largest {stats['largest_component']} edges"
+        )
+
+    if stats.get("interference_model") not in (None, "pairwise"):
+        line = (
+            f"Interference: {stats['interference_model']} model, "
+            f"{stats['interference_pairs']} pair rows -> {stats['interference_rows']} rows"
+        )
+        if stats.get("interference_cliques") is not None:
+            line += f" ({stats['interference_cliques']} cliques, {stats['implied_pairs']} implied pairs dropped)"
+        if stats.get("lazy_rounds") is not None:
+            line += f" (added lazily over {stats['lazy_rounds']} rounds)"
+        lines.append(line)
+
+    if stats.get("variables") is not None:
+        lines.append(
+            f"Model size: {stats['variables']} variables, {stats.get('constraints', '?')} constraints, "
+            f"{stats.get('nonzeros', '?')} nonzeros"
+        )
+
+    solver = []
+    if stats.get("mip_gap") is not None:
+        solver.append(f"MIP gap {stats['mip_gap']:.2%}")
+    if stats.get("node_count") is not None:
+        solver.append(f"{int(stats['node_count'])} nodes")
+    if stats.get("runtime") is not None:
+        solver.append(f"runtime {_ms(stats['runtime'])}")
+    if solver:
+        lines.append("Solver statistics: " + ", ".join(solver))
+
+    if stats.get("profile_path"):
+        lines.append(f"Profile written to {stats['profile_path']}")
+    return lines
+
+
+def format_incumbent(info):
+    """Message line for an incumbent streamed while the solver is still searching."""
+    gap = f"{info['mip_gap']:.2%}" if info["mip_gap"] != float("inf") else "unknown"
+    return (
+        f"Searching... best so far: objective {info['objective']:.2f}, "
+        f"gap {gap} after {info['runtime']:.1f} s"
+    )
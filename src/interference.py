@@ -0,0 +1,159 @@
+# interference.py - reformulations of the AP interference constraints
+import numpy as np
+
+# How the MIP backends write the interference pairs in I:
+#   pairwise: one row per pair over the two APs' full load expressions
+#   clique:   one load variable per AP; pairs grouped into cliques of the
+#             conflict graph, each clique adding one combined limit
+#   lazy:     no interference rows up front; pairs violated by a solution
+#             are added as they turn up (Gurobi callback, HiGHS re-solves)
+MODELS = ("pairwise", "clique", "lazy")
+
+
+def check_model(name):
+    """The interference model name, lower-cased; raises ValueError for unknown ones."""
+    name = (name or "pairwise").strip().lower()
+    if name not in MODELS:
+        raise ValueError(f"Unknown interference model '{name}'. Choose from: {', '.join(MODELS)}")
+    return name
+
+
+def clique_cover(n_aps, pair_a1, pair_a2):
+    """
+    Greedy cover of the conflict graph (APs linked by interference pairs)
+    by cliques: starting from the APs with the most conflicts, each clique
+    grows from an uncovered pair by the common neighbour adding the most
+    uncovered pairs. Returns lists of AP ids; every pair lies in at least
+    one of them.
+    """
+    adjacent = [set() for _ in range(n_aps)]
+    for i, j in zip(pair_a1.tolist(), pair_a2.tolist()):
+        if i != j:
+            adjacent[i].add(j)
+            adjacent[j].add(i)
+    degree = [len(neighbours) for neighbours in adjacent]
+    uncovered = [set(neighbours) for neighbours in adjacent]
+
+    cliques = []
+    for a in sorted(range(n_aps), key=lambda v: (-degree[v], v)):
+        while uncovered[a]:
+            b = max(uncovered[a], key=lambda v: (degree[v], -v))
+            clique = [a, b]
+            candidates = adjacent[a] & adjacent[b]
+            while candidates:
+                v = max(candidates, key=lambda v: (sum(u in uncovered[v] for u in clique), degree[v], -v))
+                clique.append(v)
+                candidates &= adjacent[v]
+            for u in clique:
+                uncovered[u].difference_update(clique)
+            cliques.append(clique)
+    return cliques
+
+
+def clique_rows(table, aps_data):
+    """
+    Interference rows of the clique model for a CompactIntermediates, over
+    one load variable per AP (table AP ids). Returns (rows, report) with
+    rows a list of (AP ids, limit).
+
+    For a clique C of the conflict graph, adding up its pair rows
+    y_a + y_b <= M_ab counts every load |C| - 1 times, so the integer loads
+    satisfy sum(y_a, a in C) <= floor(sum(M_ab) / (|C| - 1)). That row is
+    added when it is tighter than the summed capacities. A pair row is
+    dropped when it is implied: by the capacities (M_ab >= k_a + k_b) or
+    by the row of a clique holding both APs with a limit of at most M_ab.
+    The rows describe the same integer loads as the pairs in I.
+    """
+    # APs missing from aps_data (position -1) get the unbounded last entry
+    positions = table.ap_positions(aps_data)
+    capacities = np.array([a["Capacity"] for a in aps_data] + [np.inf], dtype=float)[positions]
+
+    limits = {}
+    for i, j, limit in zip(table.pair_a1.tolist(), table.pair_a2.tolist(), table.pair_limit.tolist()):
+        key = (min(i, j), max(i, j))
+        limits[key] = min(limit, limits.get(key, limit))
+
+    clique_limits = []
+    tightest = {}   # pair -> lowest clique limit covering it
+    for clique in clique_cover(len(table.ap_names), table.pair_a1, table.pair_a2):
+        if len(clique) < 3:
+            continue
+        pairs = [(min(a, b), max(a, b)) for k, a in enumerate(clique) for b in clique[k + 1:]]
+        limit = sum(limits[pair] for pair in pairs) // (len(clique) - 1)
+        if limit >= capacities[clique].sum():
+            continue
+        clique_limits.append((sorted(clique), int(limit)))
+        for pair in pairs:
+            tightest[pair] = min(limit, tightest.get(pair, limit))
+
+    rows = []
+    for (i, j), limit in limits.items():
+        if limit >= capacities[i] + capacities[j] or tightest.get((i, j), np.inf) <= limit:
+            continue
+        rows.append(([i, j], limit))
+    implied = len(limits) - len(rows)
+    rows += clique_limits
+
+    report = {
+        "interference_model": "clique",
+        "interference_pairs": len(table.pair_limit),
+        "interference_rows": len(rows),
+        "interference_cliques": len(clique_limits),
+        "implied_pairs": implied,
+    }
+    return rows, report
+
+
+def pairwise_report(n_pairs):
+    """The reformulation report of the pairwise model: one row per pair."""
+    return {
+        "interference_model": "pairwise",
+        "interference_pairs": n_pairs,
+        "interference_rows": n_pairs,
+    }
+
+
+def ap_loads(table, assignments):
+    """Number of assigned users of each AP in the table (by AP id)."""
+    return np.array([len(assignments.get(a, ())) for a in table.ap_names], dtype=np.int64)
+
+
+def violated_pairs(table, loads, active=None):
+    """
+    Positions of the interference pairs whose limit M the AP loads (by table
+    AP id) exceed, leaving out those already in the boolean mask active.
+    """
+    over = loads[table.pair_a1] + loads[table.pair_a2] > table.pair_limit
+    if active is not None:
+        over &= ~active
+    return np.nonzero(over)[0]
+
+
+def repair_pairs(table, assignments, lambda_energy=1):
+    """
+    A copy of assignments that satisfies every interference pair: while a
+    pair is over its limit M, the least profitable user on its two APs is
+    dropped. Used on incumbents the lazy model had no chance to cut off.
+    """
+    assignments = {a: list(users) for a, users in assignments.items()}
+    profits = table.profits(lambda_energy)
+    loads = ap_loads(table, assignments)
+    violated = violated_pairs(table, loads)
+    while len(violated):
+        k = violated[0]
+        pair = (table.ap_names[table.pair_a1[k]], table.ap_names[table.pair_a2[k]])
+        _, u, a = min((profits[table.edge_index((u, a))], u, a) for a in pair for u in assignments.get(a, ()))
+        assignments[a].remove(u)
+        loads[table.ap_id[a]] -= 1
+        violated = violated_pairs(table, loads)
+    return assignments
+
+
+def lazy_report(n_pairs, added, rounds):
+    """The reformulation report of the lazy model: the pairs added, over how many solves."""
+    return {
+        "interference_model": "lazy",
+        "interference_pairs": n_pairs,
+        "interference_rows": added,
+        "lazy_rounds": rounds,
+    }
@@ -0,0 +1,59 @@
+# intermediates_cache.py - memoized compute_intermediates shared by the windows
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from calculations import SETTINGS_KEYS, compute_intermediates
+
+MAX_ENTRIES = 8
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _encode(obj):
+    # Columnar tables (scenario_binary) hash their arrays instead of every record
+    if hasattr(obj, "digest"):
+        return obj.digest()
+    return str(obj)
+
+
+def scenario_key(users, aps, settings):
+    """
+    Canonical hash of a scenario: equal contents give equal keys, whatever the
+    dict key order. Only the settings compute_intermediates reads count, so
+    changing a solver option (LambdaEnergy, TimeLimit, ...) keeps the key.
+    """
+    used = {key: settings.get(key) for key in SETTINGS_KEYS}
+    payload = json.dumps([users, aps, used], sort_keys=True, separators=(",", ":"), default=_encode)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_intermediates(users, aps, settings):
+    """
+    compute_intermediates with a bounded LRU cache keyed by scenario_key().
+
+    The returned intermediates are shared between callers and must be treated as
+    read-only. Safe to call from the solver thread and the GUI thread.
+    """
+    key = scenario_key(users, aps, settings)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    # Computed outside the lock; a concurrent miss on the same key just
+    # computes it twice
+    intermediates = compute_intermediates(users, aps, settings)
+    with _lock:
+        _cache[key] = intermediates
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return intermediates
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
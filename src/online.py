@@ -0,0 +1,466 @@
+# online.py - incremental assignment for streams of user joins, leaves and moves
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+
+from calculations import (
+    BASE_POWER, PRIORITY_WEIGHTS, _coordinates, compute_intermediates, radio_parameters
+)
+from scenario import read_scenario
+from solver import solve_network
+from sweep import assignment_objective
+
+EVENT_TYPES = ("join", "leave", "move")
+
+
+# --- Event log (JSON Lines) ---
+# One event per line, replayed in order; "t" (seconds from the start) is
+# optional and only used by realtime replay:
+#   {"t": 0.5, "type": "join", "user": {"Name": "U7", "Priority": "High", "X": 3, "Y": 4, "Device": "Laptop"}}
+#   {"t": 0.9, "type": "move", "name": "U7", "X": 5, "Y": 4}
+#   {"t": 1.2, "type": "leave", "name": "U7"}
+def read_events(file_path):
+    """Parse an event log; raises ValueError on the first malformed line."""
+    events = []
+    with open(file_path) as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event.get("type") not in EVENT_TYPES:
+                raise ValueError(f"Line {line_no}: unknown event type {event.get('type')!r}")
+            if event["type"] == "join" and not isinstance(event.get("user"), dict):
+                raise ValueError(f"Line {line_no}: join events need a 'user' record")
+            if event["type"] != "join" and "name" not in event:
+                raise ValueError(f"Line {line_no}: {event['type']} events need a 'name'")
+            events.append(event)
+    return events
+
+
+def write_events(file_path, events):
+    with open(file_path, "w") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+class OnlineEngine:
+    """
+    Keeps an assignment up to date while users join, leave and move.
+
+    AP data (capacities, interference pairs I and limits M) is fixed and
+    computed once. Each event only touches the affected user: its feasible
+    edges and energy costs come from a grid over the APs (same formulas as
+    compute_intermediates), and it is placed by a fast feasible rule, the
+    best-valued AP with room under capacity and interference. Freed slots
+    are offered to waiting users with an edge to that AP.
+
+    Every `reoptimize_every` events, or `reoptimize_interval` seconds, the
+    region touched since the last round (changed APs and their interference
+    partners) is re-solved with `backend` while everything outside it stays
+    fixed. A round is applied only if it improves the region's objective.
+    With background=True this runs in a worker thread and the result is
+    dropped if newer events touched the same region or the interference
+    partners around it (only its still-feasible, improving moves are
+    salvaged).
+    """
+
+    def __init__(self, aps, settings, lambda_energy=1, backend="heuristic",
+                 reoptimize_every=100, reoptimize_interval=None, background=True):
+        self.aps = aps
+        self.settings = settings
+        self.lambda_energy = lambda_energy
+        self.backend = backend
+        self.reoptimize_every = reoptimize_every
+        self.reoptimize_interval = reoptimize_interval
+        self.background = background
+
+        static = compute_intermediates([], aps, settings)
+        self.alpha, self.D_max, self.D_intf = radio_parameters(settings)
+        self.include_power = settings["IncludePowerConsumption"]
+        self.I, self.M = static["I"], static["M"]
+
+        self.capacity = {a["Name"]: a["Capacity"] for a in aps}
+        self.conflicts = {a: [] for a in self.capacity}
+        for (a1, a2) in self.I:
+            self.conflicts[a1].append((a2, self.M[(a1, a2)]))
+            self.conflicts[a2].append((a1, self.M[(a1, a2)]))
+
+        # Grid of placed APs, cells of side D_max: a user's APs are in its 3x3 block
+        ap_names, ap_xy = _coordinates(aps)
+        self.cells = {}
+        for name, (x, y) in zip(ap_names, ap_xy.tolist()):
+            self.cells.setdefault(self._cell(x, y), []).append((name, x, y))
+
+        self.users = {}          # name -> record
+        self.edges = {}          # name -> {ap: energy cost}
+        self.weight = {}         # name -> priority weight
+        self.assigned = {}       # name -> ap
+        self.members = {a: set() for a in self.capacity}
+        self.load = dict.fromkeys(self.capacity, 0)
+        self.waiting = {a: set() for a in self.capacity}   # unassigned users with an edge to a
+
+        self._lock = threading.RLock()
+        self._worker = None
+        self.events = 0
+        self._events_since = 0
+        self._last_round = time.perf_counter()
+        self.dirty = set()                  # APs touched since the last round started
+        self._touched_aps, self._touched_users = set(), set()   # since the running round's snapshot
+        self.rounds = []                    # one dict per re-optimization round
+
+    # --- Geometry and costs ---
+    def _cell(self, x, y):
+        return (math.floor(x / self.D_max), math.floor(y / self.D_max))
+
+    def _edges_for(self, record):
+        """{ap: cost} for the APs within D_max of a user, costs as in compute_intermediates."""
+        x, y = record.get("X"), record.get("Y")
+        if x is None or y is None:
+            return {}
+        x, y = float(x), float(y)
+        cx, cy = self._cell(x, y)
+        factor = BASE_POWER.get(record.get("Device"), 1) if self.include_power else 0
+        scale = self.D_max ** self.alpha
+        edges = {}
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for name, ax, ay in self.cells.get((cx + dx, cy + dy), ()):
+                    ddx, ddy = x - ax, y - ay
+                    d = math.sqrt(ddx * ddx + ddy * ddy)
+                    if d <= self.D_max and name not in edges:
+                        edges[name] = 0.1 * factor * d ** self.alpha / scale
+        return edges
+
+    def profit(self, u, a):
+        return self.weight[u] - self.lambda_energy * self.edges[u][a]
+
+    # --- Feasibility and placement ---
+    def _fits(self, a):
+        if self.load[a] + 1 > self.capacity[a]:
+            return False
+        return all(self.load[a] + 1 + self.load[b] <= limit for b, limit in self.conflicts[a])
+
+    def _assign(self, u, a):
+        self.assigned[u] = a
+        self.members[a].add(u)
+        self.load[a] += 1
+        for b in self.edges[u]:
+            self.waiting[b].discard(u)
+        self._touch(u, a)
+
+    def _unassign(self, u):
+        a = self.assigned.pop(u, None)
+        if a is not None:
+            self.members[a].discard(u)
+            self.load[a] -= 1
+            self._touch(u, a)
+        return a
+
+    def _touch(self, u, a=None):
+        self._touched_users.add(u)
+        if a is not None:
+            self.dirty.add(a)
+            self._touched_aps.add(a)
+
+    def _place(self, u):
+        """Fast rule: best-valued feasible AP, or wait for a slot."""
+        best = None
+        for a in self.edges[u]:
+            value = self.profit(u, a)
+            if value > 0 and self._fits(a) and (best is None or value > best[0]):
+                best = (value, a)
+        if best is not None:
+            self._assign(u, best[1])
+        else:
+            for a in self.edges[u]:
+                self.waiting[a].add(u)
+
+    def _refill(self, a):
+        """Offer slots freed at a (and so on its interference partners) to waiting users."""
+        for ap in [a] + [b for b, _ in self.conflicts[a]]:
+            for u in sorted(self.waiting[ap], key=lambda v: -self.profit(v, ap)):
+                if self.profit(u, ap) > 0 and self._fits(ap):
+                    self._assign(u, ap)
+
+    # --- Events ---
+    def join(self, record):
+        u = record["Name"]
+        if u in self.users:
+            self.leave(u)
+        self.users[u] = record
+        self.weight[u] = PRIORITY_WEIGHTS.get(record.get("Priority"), 1)
+        self.edges[u] = self._edges_for(record)
+        self._touch(u)
+        self._place(u)
+
+    def leave(self, u):
+        if u not in self.users:
+            return
+        a = self._unassign(u)
+        for b in self.edges.pop(u):
+            self.waiting[b].discard(u)
+        del self.users[u], self.weight[u]
+        self._touch(u)
+        if a is not None:
+            self._refill(a)
+
+    def move(self, u, x, y):
+        if u not in self.users:
+            return
+        record = dict(self.users[u], X=x, Y=y)
+        self.leave(u)
+        self.join(record)
+
+    def apply(self, event):
+        """Apply one event-log entry and start a re-optimization round when one is due."""
+        with self._lock:
+            kind = event["type"]
+            if kind == "join":
+                self.join(event["user"])
+            elif kind == "leave":
+                self.leave(event["name"])
+            elif kind == "move":
+                self.move(event["name"], event["X"], event["Y"])
+            else:
+                raise ValueError(f"Unknown event type {kind!r}")
+            self.events += 1
+            self._events_since += 1
+
+        due = self.reoptimize_every and self._events_since >= self.reoptimize_every
+        due = due or (self.reoptimize_interval is not None
+                      and time.perf_counter() - self._last_round >= self.reoptimize_interval)
+        if due and self.dirty and not self.busy():
+            self.reoptimize()
+
+    def add_users(self, users):
+        """Initial users, placed one by one with the fast rule."""
+        with self._lock:
+            for record in users:
+                self.join(record)
+
+    # --- Bounded re-optimization ---
+    def busy(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def _region_problem(self, region):
+        """
+        Sub-problem over the APs in region: their members and waiting users,
+        with capacities tightened by the fixed loads of partners outside it.
+        """
+        users = set()
+        for a in region:
+            users |= self.members[a]
+            users |= self.waiting[a]
+        users = sorted(users)
+
+        E = [(u, a) for u in users for a in self.edges[u] if a in region]
+        # Users assigned outside the region keep their AP
+        E = [(u, a) for (u, a) in E if self.assigned.get(u, a) in region]
+        capacity = {}
+        for a in region:
+            limit = self.capacity[a]
+            for b, m in self.conflicts[a]:
+                if b not in region:
+                    limit = min(limit, m - self.load[b])
+            capacity[a] = max(0, limit)
+        I = [(a1, a2) for (a1, a2) in self.I if a1 in region and a2 in region]
+        intermediates = {
+            "D_max": self.D_max,
+            "D_intf": self.D_intf,
+            "E": E,
+            "c": {(u, a): self.edges[u][a] for (u, a) in E},
+            "I": I,
+            "M": {pair: self.M[pair] for pair in I},
+            "w": {u: self.weight[u] for u in users},
+        }
+        aps_data = [{"Name": a, "Capacity": capacity[a]} for a in sorted(region)]
+        return intermediates, aps_data, {u for (u, _) in E}
+
+    def reoptimize(self, wait=False):
+        """Start a round over the dirty region (in the background unless background=False or wait)."""
+        with self._lock:
+            if not self.dirty:
+                return
+            region = set(self.dirty)
+            for a in self.dirty:
+                region.update(b for b, _ in self.conflicts[a])
+            self.dirty = set()
+            self._events_since = 0
+            self._last_round = time.perf_counter()
+            self._touched_aps, self._touched_users = set(), set()
+            problem = self._region_problem(region)
+
+        if self.background and not wait:
+            self._worker = threading.Thread(target=self._run_round, args=(region, problem), daemon=True)
+            self._worker.start()
+        else:
+            self._run_round(region, problem)
+
+    def _run_round(self, region, problem):
+        intermediates, aps_data, users = problem
+        start = time.perf_counter()
+        assignments, status = solve_network(intermediates, aps_data, self.lambda_energy, backend=self.backend)
+        solve_time = time.perf_counter() - start
+
+        with self._lock:
+            # Events since the snapshot may have changed these users or loads,
+            # including those of the outside partners that sized the region's capacities
+            watched = region | {b for a in region for b, _ in self.conflicts[a]}
+            stale = bool(self._touched_aps & watched or self._touched_users & users)
+            before = self.objective()
+            applied = False
+            if status in ("Optimal", "Heuristic"):
+                if stale:
+                    self._salvage(assignments, users - self._touched_users)
+                    applied = self.objective() > before + 1e-9
+                elif self._round_gain(assignments, users) > 1e-9:
+                    applied = True
+                    for u in users:
+                        if u in self.assigned:
+                            self._unassign(u)
+                    for a, u_list in assignments.items():
+                        for u in u_list:
+                            self._assign(u, a)
+                    for u in users:
+                        if u not in self.assigned:
+                            for a in self.edges[u]:
+                                self.waiting[a].add(u)
+                    # Applying the round is not a change worth another round
+                    self.dirty -= region
+            gain = self.objective() - before
+            self.rounds.append({
+                "region_aps": len(region),
+                "region_users": len(users),
+                "status": status,
+                "solve_time": solve_time,
+                "gain": gain,
+                "accepted": applied,
+                "stale": stale,
+            })
+
+    def _round_gain(self, assignments, users):
+        """Objective change from giving the region's users the round's assignment."""
+        new = sum(self.profit(u, a) for a, u_list in assignments.items() for u in u_list)
+        old = sum(self.profit(u, self.assigned[u]) for u in users if u in self.assigned)
+        return new - old
+
+    def _salvage(self, assignments, users):
+        """
+        Apply what still holds of a stale round: moves of the untouched users
+        that are feasible and improving in the current state, then the
+        insertion of waiting users.
+        """
+        target = {u: a for a, u_list in assignments.items() for u in u_list if u in users}
+        moves = [u for u in target if u in self.assigned and self.assigned[u] != target[u]]
+        for u in sorted(moves, key=lambda v: self.profit(v, self.assigned[v]) - self.profit(v, target[v])):
+            current = self._unassign(u)
+            a = target[u] if self._fits(target[u]) and self.profit(u, target[u]) > self.profit(u, current) else current
+            self._assign(u, a)
+        for u in sorted((u for u in target if u not in self.assigned), key=lambda v: -self.profit(v, target[v])):
+            if self._fits(target[u]) and self.profit(u, target[u]) > 0:
+                self._assign(u, target[u])
+
+    def wait(self):
+        """Block until a running round has finished."""
+        if self._worker is not None:
+            self._worker.join()
+
+    # --- Results ---
+    def assignments(self):
+        """Current assignment in the solve_network format ({ap: [users]})."""
+        with self._lock:
+            result = {a["Name"]: [] for a in self.aps}
+            for u, a in self.assigned.items():
+                result[a].append(u)
+            return result
+
+    def objective(self):
+        with self._lock:
+            return sum(self.profit(u, a) for u, a in self.assigned.items())
+
+
+def replay(users, aps, settings, events, lambda_energy=1, backend="heuristic", full_backend=None,
+           reoptimize_every=100, reoptimize_interval=None, background=True, realtime=False):
+    """
+    Run an event log through an OnlineEngine and compare with a full re-solve.
+
+    Returns a report with throughput (events/s, excluding the full re-solve),
+    the online and full objectives and their relative gap, and the
+    re-optimization rounds.
+    """
+    engine = OnlineEngine(aps, settings, lambda_energy, backend, reoptimize_every,
+                          reoptimize_interval, background)
+    engine.add_users(users)
+    engine.reoptimize(wait=True)
+
+    start = time.perf_counter()
+    for event in events:
+        if realtime and "t" in event:
+            delay = event["t"] - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        engine.apply(event)
+    elapsed = time.perf_counter() - start
+    engine.wait()
+
+    online_objective = engine.objective()
+    final_users = list(engine.users.values())
+    full_start = time.perf_counter()
+    intermediates = compute_intermediates(final_users, aps, settings)
+    full_assignments, full_status = solve_network(intermediates, aps, lambda_energy, backend=full_backend)
+    full_objective = assignment_objective(full_assignments, intermediates, lambda_energy)
+    full_time = time.perf_counter() - full_start
+
+    rounds = engine.rounds
+    return {
+        "events": len(events),
+        "elapsed": elapsed,
+        "events_per_sec": len(events) / elapsed if elapsed > 0 else None,
+        "users": len(final_users),
+        "connected": len(engine.assigned),
+        "online_objective": online_objective,
+        "full_objective": full_objective,
+        "full_status": full_status,
+        "full_time": full_time,
+        "gap": (full_objective - online_objective) / abs(full_objective) if full_objective else 0.0,
+        "rounds": len(rounds),
+        "rounds_accepted": sum(r["accepted"] for r in rounds),
+        "rounds_stale": sum(r["stale"] for r in rounds),
+        "round_time": sum(r["solve_time"] for r in rounds),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a user event log through the online assignment engine.")
+    parser.add_argument("scenario", help="initial scenario (APs, settings and starting users)")
+    parser.add_argument("events", help="event log (JSON Lines)")
+    parser.add_argument("--every", type=int, default=100, help="re-optimize every N events (0: never)")
+    parser.add_argument("--interval", type=float, help="also re-optimize every T seconds")
+    parser.add_argument("--backend", default="heuristic", help="backend for re-optimization rounds")
+    parser.add_argument("--full-backend", help="backend for the reference full re-solve (default: auto)")
+    parser.add_argument("--lambda", dest="lambda_energy", type=float, default=1, help="energy weight lambda")
+    parser.add_argument("--foreground", action="store_true", help="run rounds inline instead of in a thread")
+    parser.add_argument("--realtime", action="store_true", help="honour event timestamps")
+    parser.add_argument("-o", "--output", default="-", help="JSON report path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    data = read_scenario(args.scenario)
+    report = replay(
+        list(data["users"]), list(data["aps"]), data["settings"], read_events(args.events),
+        lambda_energy=args.lambda_energy, backend=args.backend, full_backend=args.full_backend,
+        reoptimize_every=args.every, reoptimize_interval=args.interval,
+        background=not args.foreground, realtime=args.realtime,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHBoxLayout, QLabel, QMessageBox
 from PyQt5.QtCore import Qt
 from calculations_ui import CalculationsWindow
-from calculations import compute_intermediates
+from intermediates_cache import cached_intermediates
 from topology import TopologyWindow
 
 
@@ -15,20 +15,6 @@ class OutputWindow(QWidget):
         self.aps = aps
         self.settings = settings
 
-        # === Ensure assignments is a dict with all APs as keys ===
-        if assignments is None:
-            assignments = {a["Name"]: [] for a in aps}
-        else:
-            # Fill missing APs with empty lists
-            for a in aps:
-                if a["Name"] not in assignments:
-                    assignments[a["Name"]] = []
-            # Ensure all values are lists
-            for k, v in assignments.items():
-                if not isinstance(v, list):
-                    assignments[k] = []
-        self.assignments = assignments
-
         layout = QVBoxLayout(self)
 
         # === Styled Table ===
@@ -55,18 +41,7 @@ class OutputWindow(QWidget):
             }
             QTableWidget::item { padding: 6px; }
         """)
-        self.table.setRowCount(len(self.assignments))
-        for row, (ap, users_list) in enumerate(self.assignments.items()):
-            ap_item = QTableWidgetItem(ap)
-            ap_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 0, ap_item)
-
-            # Safe: ensure users_list is a list
-            if not isinstance(users_list, list):
-                users_list = []
-            users_item = QTableWidgetItem(", ".join(users_list))
-            users_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 1, users_item)
+        self.set_assignments(assignments)
 
         layout.addWidget(self.table)
 
@@ -119,9 +94,35 @@ class OutputWindow(QWidget):
             QPushButton:hover { background-color: #6a1b9a; }
         """
 
+    def set_assignments(self, assignments):
+        """Show an assignments dict; also used to replace an incumbent with a better one."""
+        # === Ensure assignments is a dict with all APs as keys ===
+        if assignments is None:
+            assignments = {a["Name"]: [] for a in self.aps}
+        else:
+            # Fill missing APs with empty lists
+            for a in self.aps:
+                if a["Name"] not in assignments:
+                    assignments[a["Name"]] = []
+            # Ensure all values are lists
+            for k, v in assignments.items():
+                if not isinstance(v, list):
+                    assignments[k] = []
+        self.assignments = assignments
+
+        self.table.setRowCount(len(self.assignments))
+        for row, (ap, users_list) in enumerate(self.assignments.items()):
+            ap_item = QTableWidgetItem(ap)
+            ap_item.setTextAlignment(Qt.AlignCenter)
+            self.table.setItem(row, 0, ap_item)
+
+            users_item = QTableWidgetItem(", ".join(users_list))
+            users_item.setTextAlignment(Qt.AlignCenter)
+            self.table.setItem(row, 1, users_item)
+
     def show_intermediates(self):
         try:
-            intermediates = compute_intermediates(self.users, self.aps, self.settings)
+            intermediates = cached_intermediates(self.users, self.aps, self.settings)
             self.calculations_window = CalculationsWindow(intermediates)
             self.calculations_window.show()
         except Exception as e:
@@ -132,7 +133,7 @@ class OutputWindow(QWidget):
             if not isinstance(self.assignments, dict):
                 raise ValueError("Assignments not available or invalid.")
 
-            intermediates = compute_intermediates(self.users, self.aps, self.settings)
+            intermediates = cached_intermediates(self.users, self.aps, self.settings)
             self.topology_window = TopologyWindow(self.users, self.aps, self.assignments, intermediates)
             self.topology_window.show()
         except Exception as e:
@@ -0,0 +1,168 @@
+# portfolio.py - race several solver configurations on the same model
+import multiprocessing
+import os
+import queue
+import time
+
+from compact import compact
+from solver import load_backend
+from sweep import assignment_objective
+
+# (name, backend, extra Gurobi parameters), in launch priority order
+CONFIGURATIONS = [
+    ("heuristic", "heuristic", None),
+    ("gurobi", "gurobi", None),
+    ("highs", "highs", None),
+    ("gurobi-feasibility", "gurobi", {"MIPFocus": 1, "Seed": 1}),
+    ("gurobi-bound", "gurobi", {"MIPFocus": 2, "Seed": 2}),
+    ("gurobi-optimality", "gurobi", {"MIPFocus": 3, "Seed": 3}),
+]
+
+# Seconds cancelled runs get to stop by themselves before they are killed
+STOP_GRACE = 1.0
+
+_POLL = 0.05
+
+
+def configurations(intermediates, processes=None):
+    """
+    The configurations to race with `processes` workers (default: CPU count,
+    at least two). Without interference pairs the min-cost flow is exact and
+    fast, so it runs alone.
+    """
+    if not intermediates["I"]:
+        return [("flow", "flow", None)]
+    usable = [c for c in CONFIGURATIONS if load_backend(c[1]) is not None]
+    return usable[:max(2, processes or os.cpu_count() or 1)]
+
+
+def _run(name, backend, params, intermediates, aps_data, lambda_energy, time_limit, mip_gap, interference,
+         stop, results):
+    """One racer (in its own process); reports incumbents, then ("done", ...) or ("error", ...)."""
+    try:
+        module = load_backend(backend)
+        options = {
+            "time_limit": time_limit,
+            "mip_gap": mip_gap,
+            "should_stop": stop.is_set,
+            "interference": interference,
+            "on_incumbent": lambda assignments, info: results.put(("incumbent", name, assignments, info)),
+        }
+        if params:
+            options["params"] = params
+        stats = {}
+        assignments, status = module.solve(intermediates, aps_data, lambda_energy, stats=stats, **options)
+        results.put(("done", name, assignments, status, stats))
+    except Exception as e:
+        results.put(("error", name, f"{type(e).__name__}: {e}"))
+
+
+def solve_portfolio(intermediates, aps_data, lambda_energy=1, threads=1, stats=None, time_limit=None,
+                    mip_gap=None, processes=None, on_incumbent=None, should_stop=None, interference="pairwise"):
+    """
+    Run the configurations() in parallel processes on the same model and
+    return the first proven-optimal result, cancelling the others. If none
+    proves optimality by time_limit (seconds), the best assignment seen so far
+    (a finished run or a streamed incumbent) is returned with status "Time
+    limit", or nothing with "Time limit (no solution)" if no racer reported
+    in time. on_incumbent, should_stop and interference work as in
+    solve_network; threads is ignored (every racer is single-threaded).
+
+    stats gets the winning run's statistics plus "portfolio_runs" and
+    "portfolio_winner".
+    """
+    start = time.perf_counter()
+    configs = configurations(intermediates, processes)
+    # Racers receive the arrays only, not per-edge tuples
+    problem = compact(intermediates)
+
+    # spawn, not fork: the GUI solves from a QThread, and forking a threaded process is unsafe
+    context = multiprocessing.get_context("spawn")
+    stop, results = context.Event(), context.Queue()
+    workers = [
+        context.Process(
+            target=_run, daemon=True,
+            args=(name, backend, params, problem, aps_data, lambda_energy, time_limit, mip_gap, interference,
+                  stop, results),
+        )
+        for name, backend, params in configs
+    ]
+    for worker in workers:
+        worker.start()
+
+    deadline = start + time_limit if time_limit is not None else None
+    best = None        # (objective, name, assignments, status, stats)
+    winner = None
+    errors = []
+    reported = 0
+    status = None
+    while reported < len(workers):
+        if should_stop is not None and should_stop():
+            status = "Interrupted"
+            break
+        if deadline is not None and time.perf_counter() > deadline:
+            status = "Time limit"
+            break
+        try:
+            item = results.get(timeout=_POLL)
+        except queue.Empty:
+            if not any(worker.is_alive() for worker in workers) and results.empty():
+                break   # a racer died without reporting
+            continue
+
+        kind, name = item[0], item[1]
+        if kind == "error":
+            reported += 1
+            errors.append(f"{name}: {item[2]}")
+            continue
+        assignments = item[2]
+        objective = assignment_objective(assignments, intermediates, lambda_energy)
+        if kind == "done":
+            reported += 1
+            run_status, run_stats = item[3], item[4]
+            if run_status == "Optimal":
+                winner = (objective, name, assignments, run_status, run_stats)
+                break
+            info = {"objective": objective, "bound": None, "runtime": time.perf_counter() - start,
+                    "mip_gap": run_stats.get("mip_gap") if run_stats.get("mip_gap") is not None else float("inf")}
+        else:
+            info = item[3]
+            run_status, run_stats = "Time limit", {"mip_gap": info["mip_gap"]}
+        if best is None or objective > best[0] + 1e-9:
+            best = (objective, name, assignments, run_status, run_stats)
+            if on_incumbent is not None:
+                on_incumbent(assignments, dict(info, configuration=name))
+
+    # Cancel the rest: Gurobi stops at its next callback (and frees its
+    # licence cleanly), the others are killed
+    stop.set()
+    grace_end = time.perf_counter() + STOP_GRACE
+    for worker, (_, backend, _) in zip(workers, configs):
+        if backend == "gurobi":
+            worker.join(max(0.0, grace_end - time.perf_counter()))
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+
+    result = winner or best
+    if result is None and status is not None:
+        # Cancelled or out of time before any racer reported (solve_network
+        # then falls back to the heuristic)
+        if status == "Time limit":
+            status = "Time limit (no solution)"
+        result = (None, "none", {}, status, {})
+    if result is None:
+        raise RuntimeError("No portfolio configuration produced a result. " + "; ".join(errors))
+    _, name, assignments, run_status, run_stats = result
+    if winner is not None or status is None:
+        status = run_status
+
+    if stats is not None:
+        stats.update(run_stats)
+        stats.update({
+            "backend": f"portfolio ({name})",
+            "portfolio_runs": len(configs),
+            "portfolio_winner": name,
+            "optimize_time": time.perf_counter() - start,
+        })
+    return {a["Name"]: assignments.get(a["Name"], []) for a in aps_data}, status
@@ -0,0 +1,120 @@
+# presolve.py - aggregate interchangeable users and drop dominated edges before solving
+import time
+
+from compact import edge_costs, edge_profits
+
+
+def _cost_key(cost, tolerance):
+    return round(cost / tolerance) if tolerance > 0 else cost
+
+
+class Presolved:
+    """
+    A reduced copy of the intermediates for one lambda_energy.
+
+    Dominated edges are removed: an edge whose profit w[u] - lambda * c[(u, a)]
+    is not positive never improves the objective, and an AP with no capacity
+    (or in an interference pair with M <= 0) can take nobody.
+
+    With aggregate set, users with the same weight, the same reachable APs
+    and the same energy cost to each of them (within tolerance) become one
+    group: a single "user" named after its first member whose intermediates
+    entry n[group] holds the member count. The group's costs are the
+    members' averages. Backends with HANDLES_MULTIPLICITY solve it with
+    integer count variables instead of one binary per member, which removes
+    the symmetry between interchangeable users.
+    """
+
+    def __init__(self, intermediates, aps_data, lambda_energy=1, tolerance=0.0, aggregate=True):
+        E, w, I, M = (intermediates[k] for k in ("E", "w", "I", "M"))
+        capacity = {a["Name"]: a["Capacity"] for a in aps_data}
+        blocked = {a for a, k in capacity.items() if k <= 0}
+        for (a1, a2) in I:
+            if M[(a1, a2)] <= 0:
+                blocked.update((a1, a2))
+
+        # Kept edges per user, with their costs
+        self.user_edges = {}
+        profits = edge_profits(intermediates, lambda_energy).tolist()
+        for (u, a), profit, cost in zip(E, profits, edge_costs(intermediates).tolist()):
+            if a not in blocked and profit > 0:
+                self.user_edges.setdefault(u, {})[a] = cost
+
+        # Group interchangeable users; each group is keyed by its signature
+        self.members = {}
+        signatures = {}
+        for u, costs in self.user_edges.items():
+            if aggregate:
+                signature = (w[u], tuple(sorted((a, _cost_key(cost, tolerance)) for a, cost in costs.items())))
+            else:
+                signature = u
+            group = signatures.setdefault(signature, u)
+            self.members.setdefault(group, []).append(u)
+
+        reduced_E, reduced_c = [], {}
+        for group, members in self.members.items():
+            for a in self.user_edges[group]:
+                reduced_E.append((group, a))
+                reduced_c[(group, a)] = sum(self.user_edges[u][a] for u in members) / len(members)
+
+        self.original = intermediates
+        self.aggregated = aggregate
+        self.intermediates = dict(
+            intermediates, E=reduced_E, c=reduced_c,
+            w={group: w[group] for group in self.members},
+        )
+        if aggregate:
+            self.intermediates["n"] = {group: len(members) for group, members in self.members.items()}
+        self.report = {
+            "presolve_users": len({u for (u, _) in E}),
+            "presolve_groups": len(self.members),
+            "presolve_edges": len(E),
+            "presolve_kept_edges": len(reduced_E),
+        }
+
+    def reduce(self, assignments):
+        """Named-user assignments (e.g. a MIP start) in terms of the groups."""
+        group_of = {u: group for group, members in self.members.items() for u in members}
+        kept = self.intermediates["c"]
+        return {
+            a: [group_of[u] for u in users if (group_of.get(u), a) in kept]
+            for a, users in assignments.items()
+        }
+
+    def expand(self, assignments):
+        """
+        Group assignments (a group name listed once per assigned member) back
+        to named users. Within a group, members go to the APs where their own
+        energy cost is lowest, cheapest pairs first.
+        """
+        costs = self.user_edges
+        expanded = {a: [] for a in assignments}
+        slots = {}
+        for a, groups in assignments.items():
+            for group in groups:
+                slots.setdefault(group, {}).setdefault(a, 0)
+                slots[group][a] += 1
+
+        for group, counts in slots.items():
+            members = self.members[group]
+            if len(members) == 1:
+                for a in counts:
+                    expanded[a].append(group)
+                continue
+            free = set(members)
+            for cost, u, a in sorted((costs[u][a], u, a) for u in members for a in counts):
+                if u in free and counts[a] > 0:
+                    expanded[a].append(u)
+                    counts[a] -= 1
+                    free.discard(u)
+        return expanded
+
+
+def presolve(intermediates, aps_data, lambda_energy=1, tolerance=0.0, aggregate=True, stats=None):
+    """Presolved(...) for the arguments; stats receives the size report and "presolve_time"."""
+    start = time.perf_counter()
+    result = Presolved(intermediates, aps_data, lambda_energy, tolerance, aggregate)
+    if stats is not None:
+        stats.update(result.report)
+        stats["presolve_time"] = time.perf_counter() - start
+    return result
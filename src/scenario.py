@@ -0,0 +1,37 @@
+# scenario.py
+import json
+import os
+
+import scenario_binary
+
+SCENARIO_EXTENSIONS = (".json", scenario_binary.EXTENSION)
+
+
+def read_scenario(file_path):
+    """
+    Load and validate a scenario file; returns the whole document (title included).
+    JSON and the columnar .scnb format are accepted; for .scnb, users and aps
+    are memory-mapped ColumnarTables (read-only sequences of dicts).
+    """
+    if os.path.splitext(file_path)[1].lower() == scenario_binary.EXTENSION:
+        data = scenario_binary.open_scenario(file_path).to_dict()
+    else:
+        with open(file_path, "r") as f:
+            data = json.load(f)
+
+    if not all(k in data for k in ("users", "aps", "settings")):
+        raise ValueError("JSON must contain 'users', 'aps', and 'settings' keys.")
+
+    # Lists from JSON, ColumnarTables from .scnb; a string is not a record table
+    tables = (list, scenario_binary.ColumnarTable)
+    if not isinstance(data["users"], tables) or not isinstance(data["aps"], tables) \
+            or not isinstance(data["settings"], dict):
+        raise ValueError("Invalid JSON structure.")
+
+    return data
+
+
+def load_scenario(file_path):
+    """Load and validate a scenario file (JSON or .scnb); returns (users, aps, settings)."""
+    data = read_scenario(file_path)
+    return data["users"], data["aps"], data["settings"]
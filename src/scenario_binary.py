@@ -0,0 +1,328 @@
+# scenario_binary.py - compact columnar scenario files (.scnb), memory-mapped on load
+import argparse
+import hashlib
+import json
+import mmap
+import numbers
+from collections.abc import Sequence
+
+import numpy as np
+
+EXTENSION = ".scnb"
+MAGIC = b"SCNB"
+VERSION = 1
+_PREFIX = 16        # magic, uint32 version, uint64 header length
+_ALIGN = 8
+
+# Column layout per table: field -> kind
+#   string:   utf-8 blob + int64 offsets (names)
+#   category: int32 codes into a list of strings kept in the header
+#   int:      int64 values
+#   coord:    int64 values, or float64 if any value is fractional
+USER_FIELDS = {"Name": "string", "Priority": "category", "X": "coord", "Y": "coord", "Device": "category"}
+AP_FIELDS = {"Name": "string", "Capacity": "int", "Channel": "int", "X": "coord", "Y": "coord"}
+TABLE_FIELDS = {"users": USER_FIELDS, "aps": AP_FIELDS}
+
+
+def _is_int(value):
+    return isinstance(value, numbers.Integral) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _encode_table(records, fields, arrays):
+    """
+    Columns of one table as header metadata; the arrays are appended to
+    `arrays`. Values a column cannot hold exactly (None, missing or extra
+    keys, wrong types) are kept per record in "extras", so decoding gives
+    back the same records.
+    """
+    n = len(records)
+    extras = {}
+
+    def keep(i, key, value):
+        extras.setdefault(str(i), {})[key] = value
+
+    for i, record in enumerate(records):
+        for key, value in record.items():
+            if key not in fields:
+                keep(i, key, value)
+        missing = [key for key in fields if key not in record]
+        if missing:
+            extras.setdefault(str(i), {})["__missing__"] = missing
+
+    def add(array):
+        arrays.append(np.ascontiguousarray(array))
+        return len(arrays) - 1
+
+    columns = {}
+    for key, kind in fields.items():
+        values = [record.get(key) for record in records]
+        if kind == "string":
+            parts = []
+            for i, value in enumerate(values):
+                if not isinstance(value, str):
+                    if key in records[i]:
+                        keep(i, key, value)
+                    value = ""
+                parts.append(value.encode("utf-8"))
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum([len(p) for p in parts], out=offsets[1:])
+            columns[key] = {
+                "kind": kind,
+                "offsets": add(offsets),
+                "data": add(np.frombuffer(b"".join(parts), dtype=np.uint8)),
+            }
+        elif kind == "category":
+            categories = {}
+            codes = np.full(n, -1, dtype=np.int32)
+            for i, value in enumerate(values):
+                if isinstance(value, str):
+                    codes[i] = categories.setdefault(value, len(categories))
+                elif key in records[i]:
+                    keep(i, key, value)
+            columns[key] = {"kind": kind, "categories": list(categories), "codes": add(codes)}
+        else:
+            usable = _is_int if kind == "int" else _is_number
+            ok = [usable(v) for v in values]
+            as_float = kind == "coord" and any(o and not _is_int(v) for o, v in zip(ok, values))
+            dtype = np.float64 if as_float else np.int64
+            for i, (o, value) in enumerate(zip(ok, values)):
+                if not o and key in records[i]:
+                    keep(i, key, value)
+            column = np.array([v if o else 0 for o, v in zip(ok, values)], dtype=dtype).reshape(n)
+            columns[key] = {"kind": kind, "values": add(column)}
+            if as_float:
+                # Integers sharing a float column are turned back into ints on load
+                columns[key]["ints"] = [i for i, (o, v) in enumerate(zip(ok, values)) if o and _is_int(v)]
+
+    return {"length": n, "columns": columns, "extras": extras}
+
+
+def write_scenario(file_path, data):
+    """Write a scenario document (title, users, aps, settings, ...) as a .scnb file."""
+    arrays = []
+    header = {
+        "document": {k: v for k, v in data.items() if k not in TABLE_FIELDS},
+        "tables": {name: _encode_table(data[name], fields, arrays) for name, fields in TABLE_FIELDS.items()},
+        "arrays": [],
+    }
+    offset = 0
+    for array in arrays:
+        header["arrays"].append({"offset": offset, "dtype": array.dtype.str, "length": int(array.size)})
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+
+    blob = json.dumps(header).encode("utf-8")
+    blob += b" " * (-len(blob) % _ALIGN)
+    with open(file_path, "wb") as f:
+        f.write(MAGIC + np.uint32(VERSION).tobytes() + np.uint64(len(blob)).tobytes())
+        f.write(blob)
+        for array in arrays:
+            raw = array.tobytes()
+            f.write(raw + b"\0" * (-len(raw) % _ALIGN))
+
+
+class ColumnarTable(Sequence):
+    """
+    One table of a .scnb file: a read-only sequence of record dicts built on
+    access, over numpy views of the memory-mapped columns. Records are for
+    the GUI; compute_intermediates reads names(), coordinates() and
+    column_values(), which never decode the other columns.
+    """
+
+    def __init__(self, name, meta, arrays):
+        self.name = name
+        self.length = meta["length"]
+        self.kinds = {key: col["kind"] for key, col in meta["columns"].items()}
+        self.extras = {int(i): extra for i, extra in meta["extras"].items()}
+        self._columns = {}
+        self._categories = {}
+        self._ints = {key: col["ints"] for key, col in meta["columns"].items() if col.get("ints")}
+        for key, col in meta["columns"].items():
+            if col["kind"] == "string":
+                self._columns[key] = (arrays[col["offsets"]], arrays[col["data"]])
+            elif col["kind"] == "category":
+                self._columns[key] = arrays[col["codes"]]
+                self._categories[key] = col["categories"]
+            else:
+                self._columns[key] = arrays[col["values"]]
+        self._lists = None
+        self._names = None
+
+    def column(self, key):
+        """The raw column: an int/float array, category codes, or (offsets, utf-8 bytes)."""
+        return self._columns[key]
+
+    def values(self, key):
+        """Decoded column as a Python list (names, category strings or numbers)."""
+        kind, col = self.kinds[key], self._columns[key]
+        if kind == "string":
+            offsets, data = col
+            raw = data.tobytes()
+            bounds = offsets.tolist()
+            return [raw[a:b].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+        if kind == "category":
+            categories = self._categories[key]
+            return [categories[code] if code >= 0 else None for code in col.tolist()]
+        values = col.tolist()
+        for i in self._ints.get(key, ()):
+            values[i] = int(values[i])
+        return values
+
+    def _overridden(self, *keys):
+        """Whether some record keeps one of keys in its extras (odd values, missing keys)."""
+        return any(set(keys) & (set(extra) | set(extra.get("__missing__", ()))) for extra in self.extras.values())
+
+    def names(self):
+        """The Name of every record; only the name column is decoded."""
+        if self._names is None:
+            self._names = [r["Name"] for r in self] if self._overridden("Name") else self.values("Name")
+        return self._names
+
+    def column_values(self, key, table=None, default=None):
+        """
+        A column as one value per record, straight from the mapped arrays:
+        int/float columns as stored, category columns mapped through table
+        (default for missing values and values not in it). None when records
+        override the column in their extras, or for string columns, so the
+        caller reads records instead.
+        """
+        kind = self.kinds.get(key)
+        if kind is None or kind == "string" or self._overridden(key):
+            return None
+        col = self._columns[key]
+        if kind == "category":
+            if table is None:
+                return None
+            # Code -1 (no value) picks the default at the end
+            lookup = np.array([table.get(c, default) for c in self._categories[key]] + [default])
+            return lookup[col]
+        if table is not None:
+            return np.array([table.get(v, default) for v in col.tolist()])
+        return col
+
+    def _decoded(self):
+        if self._lists is None:
+            self._lists = {key: self.values(key) for key in self.kinds}
+        return self._lists
+
+    def _record(self, i, lists):
+        record = {key: lists[key][i] for key in self.kinds}
+        extra = self.extras.get(i)
+        if extra:
+            for key in extra.get("__missing__", ()):
+                del record[key]
+            record.update((k, v) for k, v in extra.items() if k != "__missing__")
+        return record
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return self._record(index, self._decoded())
+
+    def __iter__(self):
+        lists = self._decoded()
+        for i in range(self.length):
+            yield self._record(i, lists)
+
+    def coordinates(self):
+        """(names, (n, 2) float xy) of the records with both X and Y set, like calculations._coordinates."""
+        if not self._overridden("Name", "X", "Y"):
+            xy = np.column_stack((self._columns["X"], self._columns["Y"])).astype(float)
+            return self.names(), xy.reshape(-1, 2)
+        placed = [r for r in self if r.get("X") is not None and r.get("Y") is not None]
+        xy = np.array([(r["X"], r["Y"]) for r in placed], dtype=float).reshape(-1, 2)
+        return [r["Name"] for r in placed], xy
+
+    def digest(self):
+        """Content hash, for caches keyed on scenario contents."""
+        h = hashlib.sha256(json.dumps([self.kinds, self.extras, self._ints], sort_keys=True, default=str).encode())
+        for key in self.kinds:
+            col = self._columns[key]
+            for part in (col if isinstance(col, tuple) else (col,)):
+                h.update(part.dtype.str.encode())
+                h.update(part.tobytes())
+            h.update(json.dumps(self._categories.get(key)).encode())
+        return h.hexdigest()
+
+    def __reduce__(self):
+        # The memory map cannot cross a process boundary; send plain records
+        return list, (list(self),)
+
+
+class ColumnarScenario:
+    """An open .scnb file: document fields plus users/aps ColumnarTables over one mmap."""
+
+    def __init__(self, file_path):
+        with open(file_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = self._mmap
+        if buffer[:4] != MAGIC:
+            raise ValueError(f"{file_path} is not a {EXTENSION} scenario file.")
+        version = int(np.frombuffer(buffer, dtype=np.uint32, count=1, offset=4)[0])
+        if version != VERSION:
+            raise ValueError(f"Unsupported {EXTENSION} version {version}.")
+        header_len = int(np.frombuffer(buffer, dtype=np.uint64, count=1, offset=8)[0])
+        header = json.loads(bytes(buffer[_PREFIX:_PREFIX + header_len]).decode("utf-8"))
+
+        data_start = _PREFIX + header_len
+        arrays = [
+            np.frombuffer(buffer, dtype=np.dtype(a["dtype"]), count=a["length"], offset=data_start + a["offset"])
+            for a in header["arrays"]
+        ]
+        self.document = header["document"]
+        self.tables = {name: ColumnarTable(name, meta, arrays) for name, meta in header["tables"].items()}
+
+    @property
+    def users(self):
+        return self.tables["users"]
+
+    @property
+    def aps(self):
+        return self.tables["aps"]
+
+    def to_dict(self, materialize=False):
+        """
+        The scenario document. users/aps stay ColumnarTables unless
+        materialize is set, in which case they are plain lists of dicts
+        (exactly the JSON document the file was written from).
+        """
+        data = dict(self.document)
+        for name, table in self.tables.items():
+            data[name] = list(table) if materialize else table
+        return data
+
+
+def open_scenario(file_path):
+    return ColumnarScenario(file_path)
+
+
+def convert(src, dst):
+    """Convert between JSON and .scnb by extension, losslessly."""
+    if src.lower().endswith(EXTENSION):
+        with open(dst, "w") as f:
+            json.dump(open_scenario(src).to_dict(materialize=True), f, indent=2)
+    else:
+        with open(src) as f:
+            write_scenario(dst, json.load(f))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"Convert scenarios between JSON and {EXTENSION}.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    args = parser.parse_args(argv)
+    convert(args.src, args.dst)
+
+
+if __name__ == "__main__":
+    main()
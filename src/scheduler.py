@@ -0,0 +1,122 @@
+# scheduler.py - shared solver job queue for the GUI windows
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from solver_thread import SolverThread
+
+# Solves that may run at once; further requests wait in the queue
+MAX_WORKERS = 2
+
+
+class SolverScheduler(QObject):
+    """
+    Runs SolverThreads for the windows on a bounded pool.
+
+    Each owner (a window) has at most one pending request: submitting again
+    replaces its queued request and cancels its running one, so only the
+    latest request of a window runs and stale results are never delivered.
+    Cancelled Gurobi solves stop at the next callback (SolverThread.terminate);
+    other backends finish in the background, still holding their slot.
+    All methods must be called from the GUI thread.
+    """
+    status_changed = pyqtSignal(int, int)  # running, queued
+
+    def __init__(self, max_workers=MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self.queue = OrderedDict()   # owner -> job dict, oldest first
+        self.running = {}            # owner -> (thread, job) of its current solve
+        self.retiring = set()        # cancelled threads that have not stopped yet
+
+    # --- Public API ---
+    def submit(self, owner, users, aps, settings, on_result, on_error=None, on_incumbent=None):
+        """
+        Queue a solve for owner. on_result(assignments, status, intermediates,
+        stats), on_error(message) and on_incumbent(assignments, info) are
+        called on the GUI thread, only if this is still owner's latest request.
+        """
+        self.queue.pop(owner, None)
+        self.queue[owner] = {
+            "users": users, "aps": aps, "settings": settings,
+            "on_result": on_result, "on_error": on_error, "on_incumbent": on_incumbent,
+        }
+        self._retire(owner)
+        self._start_jobs()
+
+    def cancel(self, owner):
+        """Drop owner's queued request and stop its running solve, if any."""
+        self.queue.pop(owner, None)
+        self._retire(owner)
+        self._start_jobs()
+
+    def has_job(self, owner):
+        return owner in self.queue or owner in self.running
+
+    def counts(self):
+        """(running, queued); running includes cancelled solves still winding down."""
+        return len(self.running) + len(self.retiring), len(self.queue)
+
+    # --- Internals ---
+    def _retire(self, owner):
+        if owner in self.running:
+            thread, _ = self.running.pop(owner)
+            thread.terminate()
+            self.retiring.add(thread)
+
+    def _start_jobs(self):
+        while self.queue and len(self.running) + len(self.retiring) < self.max_workers:
+            # Oldest queued owner without a solve in progress
+            owner = next((o for o in self.queue if o not in self.running), None)
+            if owner is None:
+                break
+            job = self.queue.pop(owner)
+            thread = SolverThread(job["users"], job["aps"], job["settings"])
+            self.running[owner] = (thread, job)
+
+            def current(thread=thread, owner=owner):
+                return self.running.get(owner, (None,))[0] is thread
+
+            def on_result(assignments, status, intermediates, stats, job=job, current=current):
+                if current():
+                    job["on_result"](assignments, status, intermediates, stats)
+
+            def on_error(message, job=job, current=current):
+                if current() and job["on_error"]:
+                    job["on_error"](message)
+
+            def on_incumbent(assignments, info, job=job, current=current):
+                if current() and job["on_incumbent"]:
+                    job["on_incumbent"](assignments, info)
+
+            thread.result_ready.connect(on_result)
+            thread.error.connect(on_error)
+            thread.incumbent_ready.connect(on_incumbent)
+            thread.finished.connect(lambda thread=thread, owner=owner: self._finished(thread, owner))
+            thread.start()
+        self.status_changed.emit(*self.counts())
+
+    def _finished(self, thread, owner):
+        if self.running.get(owner, (None,))[0] is thread:
+            del self.running[owner]
+        self.retiring.discard(thread)
+        thread.deleteLater()
+        self._start_jobs()
+
+
+def status_text(running, queued):
+    """Label text for the scheduler's status."""
+    if not running and not queued:
+        return "Solver: idle"
+    return f"Solver: {running} running, {queued} queued"
+
+
+_scheduler = None
+
+
+def shared_scheduler():
+    """The application-wide scheduler (created on first use, after the QApplication)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = SolverScheduler()
+    return _scheduler
@@ -1,75 +1,307 @@
 # solver.py
-from gurobipy import Model, GRB, quicksum
+import importlib
+import os
+import time
+from interference import check_model
+from presolve import presolve as presolve_problem
+from solver_heuristic import heuristic_assignment
 
-def solve_network(intermediates, aps_data, lambda_energy=1):
+# Backend name -> module. Each backend module provides
+#   solve(intermediates, aps_data, lambda_energy=1, threads=1, stats=None, warm_start=None,
+#         time_limit=None, mip_gap=None, on_incumbent=None, should_stop=None,
+#         interference="pairwise")
+#   is_available() -> bool
+#   HANDLES_INTERFERENCE: whether it models the interference pairs in I
+#   USES_WARM_START: whether it makes use of warm_start
+#   HANDLES_MULTIPLICITY: whether it models aggregated users (intermediates["n"])
+# and optionally a PersistentModel(intermediates, aps_data, threads, interference) class whose
+# solve(lambda_energy, stats=None) re-solves without rebuilding the model, and
+#   licence_error(exception) -> bool: whether the licence cannot take this
+#   model, so "auto" moves on to the next backend
+
+BACKENDS = {
+    "gurobi": "solver_gurobi",
+    "highs": "solver_highs",
+    "flow": "solver_flow",
+    "heuristic": "solver_heuristic",
+}
+
+# Order tried by "auto" for scenarios with interference pairs
+MIP_BACKENDS = ("gurobi", "highs")
+
+BACKEND_ENV_VAR = "RO_MATCHING_BACKEND"
+
+# Share of time_limit kept back from the backend for the heuristic fallback
+FALLBACK_RESERVE = 0.1
+
+
+def edge_incidence(E, aps_data):
+    """
+    Index the edge list once: edges per user (in first-seen order) and edges
+    per AP (for every AP in aps_data, even those without edges).
+    """
+    user_edges = {}
+    ap_edges = {a["Name"]: [] for a in aps_data}
+    for (u, a) in E:
+        user_edges.setdefault(u, []).append((u, a))
+        ap_edges.setdefault(a, []).append((u, a))
+    return user_edges, ap_edges
+
+
+def load_backend(name):
+    """Import and return the module of a backend, or None if it cannot be used here."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown solver backend '{name}'. Choose from: auto, {', '.join(BACKENDS)}")
+    try:
+        module = importlib.import_module(BACKENDS[name])
+    except ImportError:
+        return None
+    return module if module.is_available() else None
+
+
+def available_backends():
+    return [name for name in BACKENDS if load_backend(name) is not None]
+
+
+def requested_backend(backend=None):
+    """The backend name asked for: the explicit one, else RO_MATCHING_BACKEND, else "auto"."""
+    return (backend or os.environ.get(BACKEND_ENV_VAR) or "auto").strip().lower()
+
+
+def select_backend(intermediates, backend=None, exclude=()):
+    """
+    Resolve the backend to use: the explicit name, else the RO_MATCHING_BACKEND
+    environment variable, else "auto". Auto uses the exact min-cost flow when
+    there are no interference pairs, and the first installed MIP backend
+    otherwise, skipping the names in exclude. Returns (name, module).
+    """
+    name = requested_backend(backend)
+
+    if name == "auto":
+        candidates = ("flow",) + MIP_BACKENDS if not intermediates["I"] else MIP_BACKENDS
+        for candidate in candidates:
+            if candidate in exclude:
+                continue
+            module = load_backend(candidate)
+            if module is not None:
+                return candidate, module
+        raise RuntimeError("No MIP solver backend is available (install gurobipy or scipy).")
+
+    module = load_backend(name)
+    if module is None:
+        raise RuntimeError(f"Solver backend '{name}' is not available on this machine.")
+    if intermediates["I"] and not module.HANDLES_INTERFERENCE:
+        raise ValueError(f"Solver backend '{name}' cannot model interference constraints.")
+    return name, module
+
+
+def solver_options(settings):
+    """solve_network keyword arguments from the optional solver keys of a scenario's settings."""
+    return {
+        "backend": settings.get("SolverBackend"),
+        "lambda_energy": settings.get("LambdaEnergy", 1),
+        "threads": settings.get("Threads", 1),
+        "warm_start": settings.get("WarmStart", False),
+        "decompose": settings.get("Decompose", False),
+        "processes": settings.get("Processes"),
+        "presolve": settings.get("Presolve", False),
+        "presolve_tolerance": settings.get("PresolveTolerance", 0.0),
+        "time_limit": settings.get("TimeLimit"),
+        "mip_gap": settings.get("MipGap"),
+        "portfolio": settings.get("Portfolio", False),
+        "interference": settings.get("InterferenceModel", "pairwise"),
+    }
+
+
+def solve_network(intermediates, aps_data, lambda_energy=1, backend=None, threads=1, stats=None,
+                  warm_start=None, decompose=False, processes=None, presolve=False, presolve_tolerance=0.0,
+                  time_limit=None, mip_gap=None, on_incumbent=None, should_stop=None, portfolio=False,
+                  interference="pairwise"):
     """
-    Solve the AP-user assignment using Gurobi with a combined weighted objective:
+    Solve the AP-user assignment with a combined weighted objective:
     user priorities and optional energy minimization (lambda_energy = 0 or 1).
 
+    backend picks the solver ("gurobi", "highs", "flow", "heuristic" or
+    "auto", see select_backend); "heuristic" is the fast mode, feasible but
+    not proven optimal. threads is passed on to backends that support it.
+    warm_start is an assignments dict used as MIP start, or True to build
+    one with the heuristic first.
+    decompose solves each connected component of the model separately
+    across `processes` worker processes (see decomposition.solve_decomposed).
+    presolve drops dominated edges and, for backends that support it, merges
+    users whose energy costs agree within presolve_tolerance (see presolve).
+    time_limit (seconds) and mip_gap (relative) let the MIP backends stop
+    early and return their best incumbent (status "Time limit", gap in
+    stats["mip_gap"]), or the heuristic assignment if they found none. The
+    backend gets time_limit less FALLBACK_RESERVE of it, and the heuristic
+    (warm start or fallback) stops improving once the budget is spent.
+    on_incumbent(assignments, info) is called from the solving thread with
+    each improved incumbent, where the backend supports it (Gurobi, not in
+    decomposed solves). should_stop() is polled by the backends that can be
+    cancelled (Gurobi, flow; decomposed solves between components); a
+    cancelled solve returns status "Interrupted".
+    portfolio races several backends and Gurobi settings in `processes`
+    worker processes instead of using backend (see portfolio.solve_portfolio).
+    interference picks how the MIP backends write the interference pairs:
+    "pairwise" (one row per pair), "clique" (AP load variables and clique
+    limits, see interference.clique_rows) or "lazy" (only the pairs a
+    solution violates, added from Gurobi's callback or by HiGHS re-solves);
+    stats gets the reformulation report (interference_pairs rows before,
+    interference_rows after).
+    If a stats dict is given, it is filled with the backend name and the
+    wall time in seconds of each phase: "build_time", "optimize_time" and
+    "extract_time" (plus "warm_start_time" when the heuristic ran).
+
     Returns:
         assignments: dict with AP names as keys and lists of assigned user names
         status: string describing solver result ("Optimal", "Infeasible", etc.)
     """
+    interference = check_model(interference)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    reserve = None if time_limit is None else FALLBACK_RESERVE * time_limit
+    if presolve:
+        name, module = select_backend(intermediates, backend)
+        # The portfolio also runs the heuristic, which needs one entry per user
+        aggregate = getattr(module, "HANDLES_MULTIPLICITY", False) and not portfolio
+        if warm_start is True and module.USES_WARM_START:
+            start = time.perf_counter()
+            warm_start = heuristic_assignment(intermediates, aps_data, lambda_energy, time_limit=reserve)
+            if stats is not None:
+                stats["warm_start_time"] = time.perf_counter() - start
+        reduced = presolve_problem(intermediates, aps_data, lambda_energy, presolve_tolerance, aggregate, stats)
+        if isinstance(warm_start, dict):
+            warm_start = reduced.reduce(warm_start)
+        # Aggregated users need the chosen backend in every component, not "auto"
+        expand_incumbent = None
+        if on_incumbent is not None:
+            def expand_incumbent(assignments, info):
+                on_incumbent(reduced.expand(assignments), info)
+        assignments, status = solve_network(
+            reduced.intermediates, aps_data, lambda_energy, name if aggregate else backend, threads, stats,
+            warm_start, decompose, processes, time_limit=_remaining(deadline), mip_gap=mip_gap,
+            on_incumbent=expand_incumbent, should_stop=should_stop, portfolio=portfolio,
+            interference=interference
+        )
+        return reduced.expand(assignments), status
+
+    if decompose:
+        from decomposition import solve_decomposed
+        return solve_decomposed(intermediates, aps_data, lambda_energy, backend, threads, stats,
+                                warm_start, processes, time_limit, mip_gap, should_stop, interference)
+
+    fallback = None
+    backend_limit = None if deadline is None else max(0.0, _remaining(deadline) - reserve)
+    if portfolio:
+        from portfolio import solve_portfolio
+        assignments, status = solve_portfolio(intermediates, aps_data, lambda_energy, threads, stats, backend_limit,
+                                              mip_gap, processes, on_incumbent, should_stop, interference)
+    else:
+        name, module = select_backend(intermediates, backend)
+        if stats is not None:
+            stats["backend"] = name
+
+        if warm_start is True and module.USES_WARM_START:
+            start = time.perf_counter()
+            warm_start = heuristic_assignment(intermediates, aps_data, lambda_energy, time_limit=reserve)
+            if stats is not None:
+                stats["warm_start_time"] = time.perf_counter() - start
+            fallback = warm_start
+            backend_limit = None if deadline is None else max(0.0, _remaining(deadline) - reserve)
+
+        options = {
+            "threads": threads, "stats": stats, "warm_start": warm_start if isinstance(warm_start, dict) else None,
+            "time_limit": backend_limit, "mip_gap": mip_gap, "on_incumbent": on_incumbent,
+            "should_stop": should_stop, "interference": interference,
+        }
+        try:
+            assignments, status = module.solve(intermediates, aps_data, lambda_energy, **options)
+        except Exception as error:
+            if not _auto_fallback(backend, module, error):
+                raise
+            # e.g. Gurobi's size-limited licence: auto moves on to the next backend
+            name, module = select_backend(intermediates, backend, exclude=(name,))
+            if stats is not None:
+                stats["backend"] = name
+            if deadline is not None:
+                options["time_limit"] = max(0.0, _remaining(deadline) - reserve)
+            assignments, status = module.solve(intermediates, aps_data, lambda_energy, **options)
+    if status == "Time limit (no solution)":
+        # Still answer within the budget: the warm start, else a heuristic cut off at the deadline
+        if fallback is None:
+            fallback = heuristic_assignment(intermediates, aps_data, lambda_energy, time_limit=_remaining(deadline))
+        assignments, status = fallback, "Time limit (heuristic)"
+    return assignments, status
+
+
+def _auto_fallback(backend, module, error):
+    """Whether "auto" should retry with the next backend after module raised error."""
+    licence_error = getattr(module, "licence_error", None)
+    return requested_backend(backend) == "auto" and licence_error is not None and licence_error(error)
+
 
-    # Unpack intermediates
-    E = intermediates["E"]
-    c = intermediates["c"]        # normalized energy costs
-    w = intermediates["w"]        # integer user weights (priority)
-    I = intermediates["I"]
-    M = intermediates["M"]
-
-    # Create model
-    m = Model("AP_Assignment")
-    m.setParam('OutputFlag', 0)
-    m.setParam('Threads', 1)
-
-    # Variables
-    x = {(u, a): m.addVar(vtype=GRB.BINARY, name=f"x_{u}_{a}") for (u, a) in E}
-    m.update()
-
-    # Constraints
-    # 1. Exclusivity: each user ≤ 1 AP
-    for u in set(u for u,_ in E):
-        m.addConstr(quicksum(x[(u,a)] for (uu,a) in E if uu == u) <= 1)
-
-    # 2. AP capacity
-    aps = {a["Name"]: a["Capacity"] for a in aps_data}
-    for a in aps:
-        m.addConstr(quicksum(x[(u,a)] for (u,aa) in E if aa == a) <= aps[a])
-
-    # 3. Interference
-    for a1, a2 in I:
-        m.addConstr(
-            quicksum(x[(u,a1)] for (u,aa) in E if aa==a1) +
-            quicksum(x[(u,a2)] for (u,aa) in E if aa==a2)
-            <= M[(a1,a2)]
+def _remaining(deadline):
+    """Seconds left until deadline (a perf_counter time), or None without one."""
+    return None if deadline is None else max(0.0, deadline - time.perf_counter())
+
+
+class _Resolver:
+    """PersistentModel stand-in for backends without one: every solve starts over."""
+
+    def __init__(self, module, intermediates, aps_data, threads=1, interference="pairwise"):
+        self.module = module
+        self.intermediates = intermediates
+        self.aps_data = aps_data
+        self.threads = threads
+        self.interference = interference
+
+    def solve(self, lambda_energy=1, stats=None):
+        return self.module.solve(
+            self.intermediates, self.aps_data, lambda_energy, threads=self.threads, stats=stats,
+            interference=self.interference
         )
 
-    # Objective: combined weight + energy
-    m.setObjective(
-        quicksum((w[u] - lambda_energy * c[(u,a)]) * x[(u,a)] for (u,a) in E),
-        GRB.MAXIMIZE
-    )
 
-    # === Solve
-    m.optimize()
+class _AutoModel:
+    """
+    Persistent model of "auto": solves with the first backend's model, and
+    moves on to the next backend for good once the first one's licence
+    turns out unable to take the model.
+    """
 
-    # Initialize assignments dictionary (same format for all cases)
-    assignments = {a: [] for a in aps}
+    def __init__(self, intermediates, aps_data, threads=1, interference="pairwise"):
+        self.intermediates = intermediates
+        self.aps_data = aps_data
+        self.threads = threads
+        self.interference = interference
+        self.name, self.module = select_backend(intermediates, "auto")
+        self.model = _backend_model(self.module, intermediates, aps_data, threads, interference)
 
-    # Extract solution if feasible
-    if m.status == GRB.OPTIMAL:
-        for (u,a) in E:
-            if x[(u,a)].X > 0.5:
-                assignments[a].append(u)
-        status = "Optimal"
+    def solve(self, lambda_energy=1, stats=None):
+        try:
+            return self.model.solve(lambda_energy, stats)
+        except Exception as error:
+            if not _auto_fallback("auto", self.module, error):
+                raise
+        self.name, self.module = select_backend(self.intermediates, "auto", exclude=(self.name,))
+        self.model = _backend_model(self.module, self.intermediates, self.aps_data, self.threads, self.interference)
+        return self.model.solve(lambda_energy, stats)
 
-    elif m.status == GRB.INFEASIBLE:
-        # Keep empty lists for all APs
-        status = "Infeasible"
 
-    else:
-        # Keep empty lists but report solver status
-        status = f"Solver status: {m.status}"
+def _backend_model(module, intermediates, aps_data, threads, interference):
+    model_class = getattr(module, "PersistentModel", None)
+    if model_class is not None:
+        return model_class(intermediates, aps_data, threads, interference)
+    return _Resolver(module, intermediates, aps_data, threads, interference)
 
-    return assignments, status
+
+def persistent_model(intermediates, aps_data, backend=None, threads=1, interference="pairwise"):
+    """
+    A model for fixed intermediates that can be solved repeatedly for
+    different lambda_energy values via .solve(lambda_energy, stats=None).
+    Backends with a PersistentModel only update the objective between solves.
+    """
+    interference = check_model(interference)
+    if requested_backend(backend) == "auto":
+        return _AutoModel(intermediates, aps_data, threads, interference)
+    name, module = select_backend(intermediates, backend)
+    return _backend_model(module, intermediates, aps_data, threads, interference)
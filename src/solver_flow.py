@@ -0,0 +1,146 @@
+# solver_flow.py
+import heapq
+import time
+
+from compact import compact
+
+HANDLES_INTERFERENCE = False
+USES_WARM_START = False
+HANDLES_MULTIPLICITY = False
+
+
+def is_available():
+    """Pure Python, always available."""
+    return True
+
+
+def solve(intermediates, aps_data, lambda_energy=1, threads=1, stats=None, warm_start=None,
+          time_limit=None, mip_gap=None, on_incumbent=None, should_stop=None, interference="pairwise"):
+    """
+    Solve an interference-free AP-user assignment exactly as a min-cost flow.
+
+    Without interference pairs the model is a max-weight b-matching: every
+    user takes at most one AP, every AP at most its capacity, and each edge
+    is worth w[u] - lambda_energy * c[(u, a)]. It is solved with successive
+    shortest paths (Dijkstra with node potentials), adding one user at a
+    time; each user either stays unassigned, takes a free slot, or displaces
+    a chain of users along the cheapest augmenting path.
+
+    Takes the same arguments and returns the same (assignments, status) as
+    solver.solve_network; threads, warm_start, the time/gap limits and
+    interference are ignored. If should_stop() turns true, the users added
+    so far are returned with status "Interrupted". Interference pairs in
+    intermediates["I"] are not modelled, so it must only be used when I is
+    empty.
+    """
+    build_start = time.perf_counter()
+
+    table = compact(intermediates)
+    aps = {a["Name"]: a["Capacity"] for a in aps_data}
+
+    # Nodes: the table's users 0..n_users-1, APs after them, then the sink
+    n_users = len(table.user_names)
+    ap_names = list(aps)
+    ap_index = {a: n_users + j for j, a in enumerate(ap_names)}
+    sink = n_users + len(ap_names)
+
+    capacity = [0] * n_users + [aps[a] for a in ap_names]
+    ap_node = [ap_index[a] for a in table.ap_names]
+    profit = table.profits(lambda_energy).tolist()
+    edge_ap, user_ptr = table.edge_ap.tolist(), table.user_ptr.tolist()
+    adjacency = [                                # user -> [(ap node, profit)]
+        [(ap_node[edge_ap[k]], profit[k]) for k in range(user_ptr[i], user_ptr[i + 1])]
+        for i in range(n_users)
+    ]
+
+    assigned = [-1] * n_users          # AP node of each user, -1 if unassigned
+    assigned_profit = [0.0] * n_users
+    members = {node: set() for node in ap_index.values()}
+    potential = [0.0] * (sink + 1)
+
+    # Add the users with the most valuable edges first; the result is optimal
+    # in any order, but this keeps displacement chains short.
+    order = sorted(
+        (i for i in range(n_users) if adjacency[i]),
+        key=lambda i: -max((p for _, p in adjacency[i]), default=0.0)
+    )
+
+    status = "Optimal"
+    optimize_start = time.perf_counter()
+    for step, source in enumerate(order):
+        if should_stop is not None and step % 256 == 0 and should_stop():
+            status = "Interrupted"
+            break
+
+        # Reduced costs c - pi(i) + pi(j) stay non-negative with this potential
+        potential[source] = min(
+            [potential[sink]] + [potential[a] - p for a, p in adjacency[source]]
+        )
+
+        dist = {source: 0.0}
+        pred = {}
+        settled = []
+        heap = [(0.0, source)]
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue
+            settled.append(v)
+            if v == sink:
+                break
+
+            pi_v = potential[v]
+            if v < n_users:
+                # Move to another AP, or drop out (edge to the sink)
+                arcs = [(a, -p) for a, p in adjacency[v] if a != assigned[v]]
+                arcs.append((sink, 0.0))
+            else:
+                # Send a member elsewhere, or use a free slot
+                arcs = [(u, assigned_profit[u]) for u in members[v]]
+                if len(members[v]) < capacity[v]:
+                    arcs.append((sink, 0.0))
+
+            for node, cost in arcs:
+                nd = d + max(0.0, cost - pi_v + potential[node])
+                if nd < dist.get(node, float("inf")):
+                    dist[node] = nd
+                    pred[node] = v
+                    heapq.heappush(heap, (nd, node))
+
+        # Potentials of settled nodes move so reduced costs stay non-negative
+        D = dist[sink]
+        for v in settled:
+            potential[v] += D - dist[v]
+
+        # Augment along source -> ... -> sink
+        path = [sink]
+        while path[-1] != source:
+            path.append(pred[path[-1]])
+        path.reverse()
+        for frm, to in zip(path, path[1:]):
+            if frm < n_users and to == sink:
+                assigned[frm] = -1
+            elif frm < n_users:
+                members[to].add(frm)
+                assigned[frm] = to
+                assigned_profit[frm] = next(p for a, p in adjacency[frm] if a == to)
+            elif to != sink:
+                members[frm].discard(to)
+
+    extract_start = time.perf_counter()
+    assignments = {a: [] for a in aps}
+    for i, node in enumerate(assigned):
+        if node >= 0:
+            assignments[ap_names[node - n_users]].append(table.user_names[i])
+
+    if stats is not None:
+        # Size of the equivalent LP: one column per edge, one row per node
+        n_edges = len(profit)
+        stats["variables"] = n_edges
+        stats["constraints"] = len(order) + len(ap_names)
+        stats["nonzeros"] = 2 * n_edges
+        stats["build_time"] = optimize_start - build_start
+        stats["optimize_time"] = extract_start - optimize_start
+        stats["extract_time"] = time.perf_counter() - extract_start
+
+    return assignments, status
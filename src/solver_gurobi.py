@@ -0,0 +1,357 @@
+# solver_gurobi.py
+import time
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+from gurobipy import Env, GurobiError, Model, GRB, quicksum
+from compact import compact, edge_profits
+from interference import clique_rows, lazy_report, pairwise_report, repair_pairs, violated_pairs
+from solver import edge_incidence
+
+HANDLES_INTERFERENCE = True
+USES_WARM_START = True
+HANDLES_MULTIPLICITY = True
+
+
+@lru_cache(maxsize=None)
+def shared_env():
+    """
+    One quiet environment per process: the licence is checked out once and
+    no banner is printed on stdout (which would corrupt CLI output).
+    """
+    env = Env(empty=True)
+    env.setParam("OutputFlag", 0)
+    env.start()
+    return env
+
+
+def is_available():
+    """True if a Gurobi environment can be started, i.e. a licence is usable."""
+    try:
+        shared_env()
+    except GurobiError:
+        return False
+    return True
+
+
+def licence_error(error):
+    """Whether error means the licence cannot solve this model (no licence, or the size-limited one)."""
+    return isinstance(error, GurobiError) and error.errno in (GRB.Error.NO_LICENSE, GRB.Error.SIZE_LIMIT_EXCEEDED)
+
+
+def build_model(intermediates, aps_data, threads=1, interference="pairwise"):
+    """
+    Build the assignment model: binary x[(u, a)] per edge, exclusivity,
+    AP capacity and interference constraints. Aggregated users (the
+    optional intermediates["n"], see presolve) get integer counts instead.
+    The objective is left to set_objective so the same model can be
+    re-solved for other lambdas.
+    interference="clique" bounds a load variable per AP by its capacity and
+    writes the interference rows of interference.clique_rows over those;
+    the reformulation report is kept in model._interference.
+    interference="lazy" leaves the interference rows out and keeps in
+    model._lazy the check that adds them from the MIP callback and in
+    model._promote_lazy the step that makes them model rows (see
+    lazy_constraints).
+    Returns (model, x).
+    """
+    # Unpack intermediates
+    E = intermediates["E"]
+    I = intermediates["I"]
+    M = intermediates["M"]
+    n = intermediates.get("n", {})
+
+    # Create model
+    m = Model("AP_Assignment", env=shared_env())
+    m.setParam('OutputFlag', 0)
+    m.setParam('Threads', threads)
+
+    # Variables
+    x = {
+        (u, a): m.addVar(vtype=GRB.INTEGER, ub=n[u], name=f"x_{u}_{a}") if n.get(u, 1) > 1
+        else m.addVar(vtype=GRB.BINARY, name=f"x_{u}_{a}")
+        for (u, a) in E
+    }
+    m.update()
+
+    # Incidence lists, so each constraint only touches its own edges
+    user_edges, ap_edges = edge_incidence(E, aps_data)
+    load = {a: quicksum(x[e] for e in edges) for a, edges in ap_edges.items()}
+
+    # Constraints
+    # 1. Exclusivity: each user ≤ 1 AP
+    for u, edges in user_edges.items():
+        m.addConstr(quicksum(x[e] for e in edges) <= n.get(u, 1))
+
+    if interference == "clique":
+        # 2. AP capacity, as the bound of a load variable (>= load is as good as == here)
+        y = {a["Name"]: m.addVar(ub=a["Capacity"], name=f"y_{a['Name']}") for a in aps_data}
+        for a in aps_data:
+            m.addConstr(load[a["Name"]] <= y[a["Name"]])
+
+        # 3. Interference, pairs and clique limits over the loads
+        table = compact(intermediates)
+        rows, m._interference = clique_rows(table, aps_data)
+        for ids, limit in rows:
+            m.addConstr(quicksum(y[table.ap_names[i]] for i in ids) <= limit)
+    else:
+        # 2. AP capacity
+        for a in aps_data:
+            m.addConstr(load[a["Name"]] <= a["Capacity"])
+
+        # 3. Interference
+        if interference == "lazy":
+            m.setParam("LazyConstraints", 1)
+            m._interference = lazy_report(len(I), 0, 0)
+            m._lazy, m._promote_lazy = lazy_constraints(intermediates, x, load)
+        else:
+            for a1, a2 in I:
+                m.addConstr(load[a1] + load[a2] <= M[(a1,a2)])
+            m._interference = pairwise_report(len(I))
+
+    m.ModelSense = GRB.MAXIMIZE
+    return m, x
+
+
+def lazy_constraints(intermediates, x, load):
+    """
+    The lazy interference model, as (check, promote).
+
+    check(model) is called on every MIPSOL candidate: it adds the
+    interference rows load[a1] + load[a2] <= M the candidate violates with
+    cbLazy, which cuts it off, and returns True if there were any.
+    model._interference counts the checks ("lazy_rounds") and the distinct
+    pairs added ("interference_rows").
+    Rows added by cbLazy only last for the current optimize; promote(model)
+    adds the pairs found so far as ordinary constraints, so a model that is
+    optimized again (PersistentModel) keeps them.
+    """
+    table = compact(intermediates)
+    variables = list(x.values())
+    edge_ap = np.array([table.ap_id[a] for (_, a) in x], dtype=np.intp)
+    added = np.zeros(len(table.pair_limit), dtype=bool)
+    promoted = np.zeros(len(table.pair_limit), dtype=bool)
+
+    def row(k):
+        a1, a2 = table.ap_names[table.pair_a1[k]], table.ap_names[table.pair_a2[k]]
+        return load[a1] + load[a2] <= int(table.pair_limit[k])
+
+    def check(model):
+        values = model.cbGetSolution(variables)
+        loads = np.rint(np.bincount(edge_ap, weights=values, minlength=len(table.ap_names))).astype(np.int64)
+        # Promoted pairs are model rows already; pairs added in this optimize may come back
+        violated = violated_pairs(table, loads, promoted)
+        for k in violated.tolist():
+            model.cbLazy(row(k))
+        added[violated] = True
+        model._interference["lazy_rounds"] += 1
+        model._interference["interference_rows"] = int(added.sum())
+        return len(violated) > 0
+
+    def promote(model):
+        for k in np.nonzero(added & ~promoted)[0].tolist():
+            model.addConstr(row(k))
+        promoted[:] = added
+
+    return check, promote
+
+
+def set_objective(m, x, intermediates, lambda_energy=1):
+    """Objective: combined weight + energy, sum of (w[u] - lambda * c[(u,a)]) * x[(u,a)]."""
+    # x was built over E, so its variables are in the same order as the profits
+    m.setAttr("Obj", list(x.values()), edge_profits(intermediates, lambda_energy).tolist())
+
+
+def _assignments(values, edges, aps_data):
+    """Assignments dict from variable values in edge order."""
+    assignments = {a["Name"]: [] for a in aps_data}
+    for (u, a), value in zip(edges, values):
+        if value > 0.5:
+            assignments[a].extend([u] * int(round(value)))
+    return assignments
+
+
+def extract(m, x, aps_data):
+    """
+    Read (assignments, status) off a solved model. A run stopped by the time
+    limit (or any other limit) still returns its best incumbent, with status
+    "Time limit" (or the Gurobi status code); its gap is in model_statistics.
+    """
+    edges = list(x)
+    if m.status == GRB.INFEASIBLE:
+        # Keep empty lists for all APs
+        return {a["Name"]: [] for a in aps_data}, "Infeasible"
+
+    if m.SolCount > 0:
+        assignments = _assignments(m.getAttr("X", [x[e] for e in edges]), edges, aps_data)
+    else:
+        assignments = {a["Name"]: [] for a in aps_data}
+
+    if m.status == GRB.OPTIMAL:
+        status = "Optimal"
+    elif m.status == GRB.TIME_LIMIT:
+        status = "Time limit" if m.SolCount > 0 else "Time limit (no solution)"
+    elif m.status == GRB.INTERRUPTED:
+        status = "Interrupted"
+    else:
+        # Report the solver status (with the incumbent, if any)
+        status = f"Solver status: {m.status}"
+
+    return assignments, status
+
+
+def set_limits(m, time_limit=None, mip_gap=None):
+    """Gurobi TimeLimit (seconds) and MIPGap (relative gap target) when given."""
+    if time_limit is not None:
+        m.setParam("TimeLimit", time_limit)
+    if mip_gap is not None:
+        m.setParam("MIPGap", mip_gap)
+
+
+def search_callback(x, aps_data, on_incumbent=None, should_stop=None, lazy=None):
+    """
+    Gurobi callback calling on_incumbent(assignments, info) for every
+    improved incumbent, with info holding its "objective", "bound", "mip_gap"
+    (inf while there is no finite bound) and "runtime" (seconds), and
+    stopping the search (model.terminate) once should_stop() is true. Runs
+    on the solving thread. lazy(model), the check of lazy_constraints, sees
+    every candidate first, before a stop is honoured; the candidates it cuts
+    off are not reported.
+    """
+    edges = list(x)
+    variables = [x[e] for e in edges]
+    best = [-GRB.INFINITY]
+
+    def callback(model, where):
+        cut = where == GRB.Callback.MIPSOL and lazy is not None and lazy(model)
+        if should_stop is not None and should_stop():
+            model.terminate()
+            return
+        if where != GRB.Callback.MIPSOL or cut or on_incumbent is None:
+            return
+        # MIPSOL also reports solutions that do not beat the incumbent
+        objective = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+        if objective <= best[0]:
+            return
+        best[0] = objective
+        bound = model.cbGet(GRB.Callback.MIPSOL_OBJBND)
+        if abs(bound) < GRB.INFINITY and objective:
+            gap = abs(bound - objective) / abs(objective)
+        else:
+            gap = float("inf")
+        info = {
+            "objective": objective,
+            "bound": bound,
+            "mip_gap": gap,
+            "runtime": model.cbGet(GRB.Callback.RUNTIME),
+        }
+        on_incumbent(_assignments(model.cbGetSolution(variables), edges, aps_data), info)
+
+    return callback
+
+
+def model_statistics(m):
+    """Model size and search statistics of a solved model, for solve_network's stats dict."""
+    stats = {
+        "variables": m.NumVars,
+        "constraints": m.NumConstrs,
+        "nonzeros": m.NumNZs,
+        "runtime": m.Runtime,
+        "node_count": m.NodeCount,
+    }
+    if m.SolCount > 0:
+        stats["mip_gap"] = m.MIPGap
+    stats.update(getattr(m, "_interference", {}))
+    return stats
+
+
+def solve(intermediates, aps_data, lambda_energy=1, threads=1, stats=None, warm_start=None,
+          time_limit=None, mip_gap=None, on_incumbent=None, should_stop=None, params=None,
+          interference="pairwise"):
+    """
+    Solve the AP-user assignment using Gurobi with a combined weighted objective:
+    user priorities and optional energy minimization (lambda_energy = 0 or 1).
+
+    threads is passed to Gurobi's Threads parameter (0 lets Gurobi decide).
+    warm_start, an assignments dict, is loaded as the MIP start (x.Start).
+    time_limit (seconds) and mip_gap stop the search early with the best
+    incumbent; on_incumbent(assignments, info) is called for each improved
+    incumbent while the search runs, and should_stop() is polled to cancel it
+    (see search_callback). params is an optional dict of extra Gurobi
+    parameters (e.g. {"MIPFocus": 1, "Seed": 3}). interference picks the
+    interference model (see build_model).
+    Returns (assignments, status) as described in solver.solve_network;
+    stats also receives model_statistics().
+    """
+    build_start = time.perf_counter()
+    m, x = build_model(intermediates, aps_data, threads, interference)
+    set_objective(m, x, intermediates, lambda_energy)
+    # The build counts against the time limit
+    if time_limit is not None:
+        time_limit = max(0.0, time_limit - (time.perf_counter() - build_start))
+    set_limits(m, time_limit, mip_gap)
+    for name, value in (params or {}).items():
+        m.setParam(name, value)
+
+    # MIP start from a known assignment (e.g. the heuristic)
+    if warm_start:
+        chosen = Counter((u, a) for a, users in warm_start.items() for u in users)
+        for e, var in x.items():
+            var.Start = chosen[e]
+
+    # === Solve
+    optimize_start = time.perf_counter()
+    lazy = getattr(m, "_lazy", None)
+    if on_incumbent is not None or should_stop is not None or lazy is not None:
+        m.optimize(search_callback(x, aps_data, on_incumbent, should_stop, lazy))
+    else:
+        m.optimize()
+    extract_start = time.perf_counter()
+
+    assignments, status = extract(m, x, aps_data)
+    if lazy is not None:
+        assignments = repair_pairs(compact(intermediates), assignments, lambda_energy)
+
+    if stats is not None:
+        stats.update(model_statistics(m))
+        stats["build_time"] = optimize_start - build_start
+        stats["optimize_time"] = extract_start - optimize_start
+        stats["extract_time"] = time.perf_counter() - extract_start
+
+    return assignments, status
+
+
+class PersistentModel:
+    """
+    A model built once for fixed intermediates; each solve only rewrites the
+    objective coefficients for its lambda and re-optimizes, letting Gurobi
+    start from the previous solution. Under the lazy interference model the
+    pairs a solve adds become model rows for the following solves.
+    """
+
+    def __init__(self, intermediates, aps_data, threads=1, interference="pairwise"):
+        self.intermediates = intermediates
+        self.aps_data = aps_data
+        self.model, self.x = build_model(intermediates, aps_data, threads, interference)
+
+    def solve(self, lambda_energy=1, stats=None):
+        build_start = time.perf_counter()
+        set_objective(self.model, self.x, self.intermediates, lambda_energy)
+        optimize_start = time.perf_counter()
+        lazy = getattr(self.model, "_lazy", None)
+        if lazy is not None:
+            self.model._interference["lazy_rounds"] = 0
+            self.model.optimize(search_callback(self.x, self.aps_data, lazy=lazy))
+            self.model._promote_lazy(self.model)
+        else:
+            self.model.optimize()
+        extract_start = time.perf_counter()
+        assignments, status = extract(self.model, self.x, self.aps_data)
+        if lazy is not None:
+            assignments = repair_pairs(compact(self.intermediates), assignments, lambda_energy)
+        if stats is not None:
+            stats.update(model_statistics(self.model))
+            stats["build_time"] = optimize_start - build_start
+            stats["optimize_time"] = extract_start - optimize_start
+            stats["extract_time"] = time.perf_counter() - extract_start
+        return assignments, status
@@ -0,0 +1,189 @@
+# solver_heuristic.py
+import time
+from collections import deque
+
+from compact import edge_profits
+
+HANDLES_INTERFERENCE = True
+USES_WARM_START = False
+HANDLES_MULTIPLICITY = False
+
+
+def is_available():
+    """Pure Python, always available."""
+    return True
+
+
+def heuristic_assignment(intermediates, aps_data, lambda_energy=1, max_moves_per_user=10, time_limit=None):
+    """
+    Build a feasible assignment quickly, without any solver.
+
+    Users are placed greedily by edge value w[u] - lambda_energy * c[(u, a)]
+    while respecting AP capacities and the interference limits M. The result
+    is then improved by local search until no move helps (or after
+    max_moves_per_user moves per user on average, or once time_limit seconds
+    have passed; the greedy construction always completes):
+      - insert:   an unassigned user takes a feasible AP
+      - replace:  an unassigned user takes the slot of a less valuable user
+      - eject:    an assigned user moves elsewhere to make room for an unassigned one
+      - relocate: an assigned user moves to a better feasible AP
+      - swap:     two assigned users exchange APs
+    Returns an assignments dict in the solve_network format.
+    """
+    start = time.perf_counter()
+    E = intermediates["E"]
+    I = intermediates["I"]
+    M = intermediates["M"]
+
+    capacity = {a["Name"]: a["Capacity"] for a in aps_data}
+    profit = dict(zip(E, edge_profits(intermediates, lambda_energy).tolist()))
+
+    user_aps = {}
+    for (u, a) in E:
+        user_aps.setdefault(u, []).append(a)
+    for u, options in user_aps.items():
+        options.sort(key=lambda a: -profit[(u, a)])
+
+    conflicts = {a: [] for a in capacity}
+    for (a1, a2) in I:
+        conflicts[a1].append((a2, M[(a1, a2)]))
+        conflicts[a2].append((a1, M[(a1, a2)]))
+
+    load = dict.fromkeys(capacity, 0)
+    members = {a: set() for a in capacity}
+    assigned = {}
+
+    def fits(a, leaving=None):
+        """Whether AP a can take one more user once `leaving` has lost one."""
+        if load[a] + 1 > capacity[a]:
+            return False
+        for b, limit in conflicts[a]:
+            if load[a] + 1 + load[b] - (b == leaving) > limit:
+                return False
+        return True
+
+    def place(u, a):
+        assigned[u] = a
+        members[a].add(u)
+        load[a] += 1
+
+    def unplace(u):
+        a = assigned.pop(u)
+        members[a].discard(u)
+        load[a] -= 1
+        return a
+
+    # Greedy construction
+    for (u, a) in sorted(E, key=lambda e: -profit[e]):
+        if profit[(u, a)] > 0 and u not in assigned and fits(a):
+            place(u, a)
+
+    def improve(u):
+        """Apply the best improving move involving u; returns the APs it changed."""
+        eps = 1e-9
+        best_gain, best_move = eps, None
+        if u not in assigned:
+            fit_cache = {}  # loads do not change while moves are evaluated
+            for a in user_aps[u]:
+                p_ua = profit[(u, a)]
+                if p_ua <= best_gain:
+                    break  # options are sorted, nothing better follows
+                if fits(a):
+                    best_gain, best_move = p_ua, ("insert", a, None, None)
+                    break
+                for v in members[a]:
+                    gain = p_ua - profit[(v, a)]
+                    if gain > best_gain:
+                        best_gain, best_move = gain, ("replace", a, v, None)
+                    for b in user_aps[v]:
+                        if b not in fit_cache:
+                            fit_cache[b] = fits(b)
+                        if b != a and fit_cache[b]:
+                            gain = p_ua + profit[(v, b)] - profit[(v, a)]
+                            if gain > best_gain:
+                                best_gain, best_move = gain, ("eject", a, v, b)
+                            break  # best feasible destination for v
+            if best_move is None:
+                return ()
+            kind, a, v, b = best_move
+            if kind == "replace":
+                unplace(v)
+            elif kind == "eject":
+                unplace(v)
+                place(v, b)
+            place(u, a)
+            return (a, b) if b is not None else (a,)
+
+        a = assigned[u]
+        p_ua = profit[(u, a)]
+        for b in user_aps[u]:
+            if b == a:
+                continue
+            gain = profit[(u, b)] - p_ua
+            if gain > best_gain and fits(b, leaving=a):
+                best_gain, best_move = gain, ("relocate", b, None)
+            for v in members[b]:
+                if (v, a) in profit:
+                    gain = profit[(u, b)] + profit[(v, a)] - p_ua - profit[(v, b)]
+                    if gain > best_gain:
+                        best_gain, best_move = gain, ("swap", b, v)
+        if best_move is None:
+            return ()
+        kind, b, v = best_move
+        unplace(u)
+        if kind == "swap":
+            unplace(v)
+            place(v, a)
+        place(u, b)
+        return (a, b)
+
+    # Local search: a worklist of users, re-queuing the users around every
+    # AP whose load changed (directly or through an interference partner)
+    ap_users = {a: [] for a in capacity}
+    for (u, a) in E:
+        ap_users[a].append(u)
+
+    queue = deque(sorted(user_aps, key=lambda u: -profit[(u, user_aps[u][0])]))
+    queued = set(queue)
+    moves = 0
+    deadline = None if time_limit is None else start + time_limit
+    while queue and moves < max_moves_per_user * len(user_aps):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        u = queue.popleft()
+        queued.discard(u)
+        changed = improve(u)
+        if not changed:
+            continue
+        moves += 1
+        touched = set(changed)
+        for a in changed:
+            touched.update(b for b, _ in conflicts[a])
+        for a in touched:
+            for v in ap_users[a]:
+                if v not in queued:
+                    queued.add(v)
+                    queue.append(v)
+
+    assignments = {a: [] for a in capacity}
+    for (u, a) in E:
+        if assigned.get(u) == a:
+            assignments[a].append(u)
+    return assignments
+
+
+def solve(intermediates, aps_data, lambda_energy=1, threads=1, stats=None, warm_start=None,
+          time_limit=None, mip_gap=None, on_incumbent=None, should_stop=None, interference="pairwise"):
+    """
+    Fast mode: return the heuristic assignment directly, with status "Heuristic".
+
+    The result is feasible but not proven optimal. threads, warm_start,
+    the time/gap limits, should_stop and interference are ignored.
+    """
+    start = time.perf_counter()
+    assignments = heuristic_assignment(intermediates, aps_data, lambda_energy)
+    if stats is not None:
+        stats["build_time"] = 0.0
+        stats["optimize_time"] = time.perf_counter() - start
+        stats["extract_time"] = 0.0
+    return assignments, "Heuristic"
@@ -0,0 +1,270 @@
+# solver_highs.py
+import time
+import numpy as np
+from compact import compact
+from interference import ap_loads, clique_rows, lazy_report, pairwise_report, violated_pairs
+
+try:
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import csr_matrix
+except ImportError:  # scipy is optional: the backend just reports itself unavailable
+    milp = None
+
+HANDLES_INTERFERENCE = True
+USES_WARM_START = False
+HANDLES_MULTIPLICITY = True
+
+
+def is_available():
+    """True if scipy (>= 1.9, for milp) is installed."""
+    return milp is not None
+
+
+def _ragged_take(ptr, order, groups):
+    """Concatenate order[ptr[g]:ptr[g + 1]] for each g in groups, with the group position of each entry."""
+    starts, counts = ptr[groups], ptr[groups + 1] - ptr[groups]
+    total = counts.sum()
+    run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(np.arange(len(groups)), counts), order[np.repeat(starts, counts) + run_offsets]
+
+
+def build_matrix(intermediates, aps_data, interference="pairwise", pairs=None):
+    """
+    Sparse constraint matrix of the assignment model, one column per edge
+    (in the edge order of compact(intermediates)).
+
+    Rows are the exclusivity constraints (one per user with an edge, in
+    user-table order), the AP capacities (aps_data order) and the
+    interference rows. With interference="pairwise" these are the pairs in
+    I, each over both APs' edges. With "clique" one load column per AP
+    follows the edge columns, the AP rows read load(edges) - y_a <= 0 with
+    y_a <= capacity, and the interference rows are interference.clique_rows
+    over the y columns. With "lazy" only the interference pairs at the
+    positions in pairs are written (none by default; see _solve_lazy).
+    Returns (A, upper, column_upper, report) for
+    A @ x <= upper, 0 <= x <= column_upper, with the reformulation report.
+    An aggregated user (intermediates["n"], see presolve) may take n[u]
+    slots.
+    """
+    table = compact(intermediates)
+    n_aps, n_edges = len(aps_data), len(table.edge_user)
+    positions = table.ap_positions(aps_data)
+    capacity = np.array([a["Capacity"] for a in aps_data], dtype=float)
+
+    # One row per user that has edges; edges are grouped by user already
+    has_edges = np.diff(table.user_ptr) > 0
+    user_row = np.cumsum(has_edges) - 1
+    n_users = int(has_edges.sum())
+    columns = np.arange(n_edges)
+    first_pair_row = n_users + n_aps
+    multiplicity = table.multiplicity if table.multiplicity is not None else np.ones(len(table.user_names))
+
+    if interference == "clique":
+        # y only appears in <= rows, so y_a >= load is as good as equality
+        pair_rows, report = clique_rows(table, aps_data)
+        members = [positions[ids] for ids, _ in pair_rows]
+        counts = [len(m) for m in members]
+        loads = np.arange(n_aps)
+        rows = np.concatenate((
+            user_row[table.edge_user], n_users + positions[table.edge_ap], n_users + loads,
+            first_pair_row + np.repeat(np.arange(len(pair_rows)), counts).astype(np.intp),
+        ))
+        cols = np.concatenate((
+            columns, columns, n_edges + loads, n_edges + np.concatenate(members + [np.empty(0, dtype=np.intp)]),
+        ))
+        values = np.concatenate((np.ones(2 * n_edges), -np.ones(n_aps), np.ones(sum(counts))))
+        A = csr_matrix((values, (rows, cols)), shape=(first_pair_row + len(pair_rows), n_edges + n_aps))
+        upper = np.concatenate((
+            multiplicity[has_edges].astype(float),
+            np.zeros(n_aps),
+            np.array([limit for _, limit in pair_rows], dtype=float),
+        ))
+        column_upper = np.concatenate((table.edge_multiplicity(), capacity))
+        return A, upper, column_upper, report
+
+    if interference == "lazy":
+        pairs = np.empty(0, dtype=np.intp) if pairs is None else np.asarray(pairs, dtype=np.intp)
+        report = lazy_report(len(table.pair_limit), len(pairs), 0)
+    else:
+        pairs = np.arange(len(table.pair_limit))
+        report = pairwise_report(len(table.pair_limit))
+
+    # Interference rows through the AP -> edges adjacency (CSR)
+    rows_1, cols_1 = _ragged_take(table.ap_ptr, table.ap_order, table.pair_a1[pairs])
+    rows_2, cols_2 = _ragged_take(table.ap_ptr, table.ap_order, table.pair_a2[pairs])
+
+    rows = np.concatenate((
+        user_row[table.edge_user], n_users + positions[table.edge_ap],
+        first_pair_row + rows_1, first_pair_row + rows_2,
+    ))
+    cols = np.concatenate((columns, columns, cols_1, cols_2))
+    n_rows = first_pair_row + len(pairs)
+    A = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_rows, n_edges))
+
+    upper = np.concatenate((
+        multiplicity[has_edges].astype(float),
+        capacity,
+        table.pair_limit[pairs].astype(float),
+    ))
+    return A, upper, table.edge_multiplicity(), report
+
+
+def _solve_matrix(A, upper, column_upper, table, aps_data, lambda_energy, stats=None, time_limit=None,
+                  mip_gap=None):
+    """
+    Run milp on a prepared constraint matrix for a CompactIntermediates (the
+    edge columns first, integral, then any load columns);
+    returns (assignments, status, extract start time) and fills stats with
+    model size and MIP statistics. A run stopped by time_limit returns its
+    incumbent with status "Time limit".
+    """
+    n_edges = len(table.edge_user)
+    assignments = {a["Name"]: [] for a in aps_data}
+    profit = np.zeros(A.shape[1])
+    profit[:n_edges] = table.profits(lambda_energy)
+
+    options = {}
+    if time_limit is not None:
+        options["time_limit"] = time_limit
+    if mip_gap is not None:
+        options["mip_rel_gap"] = mip_gap
+
+    if n_edges:
+        res = milp(
+            -profit,  # milp minimizes
+            constraints=LinearConstraint(A, -np.inf, upper),
+            integrality=(np.arange(A.shape[1]) < n_edges).astype(int),
+            bounds=Bounds(0, column_upper),
+            options=options,
+        )
+        res_status, res_x, message = res.status, res.x, res.message
+    else:
+        res = None
+        res_status, res_x, message = 0, np.empty(0), ""
+    extract_start = time.perf_counter()
+
+    if stats is not None:
+        stats.update({
+            "variables": A.shape[1],
+            "constraints": A.shape[0],
+            "nonzeros": A.nnz,
+            "mip_gap": getattr(res, "mip_gap", None),
+            "node_count": getattr(res, "mip_node_count", None),
+        })
+
+    if res_status in (0, 1) and res_x is not None:
+        for k in np.nonzero(res_x[:n_edges] > 0.5)[0].tolist():
+            u, a = table.user_names[table.edge_user[k]], table.ap_names[table.edge_ap[k]]
+            assignments[a].extend([u] * int(round(res_x[k])))
+        status = "Optimal" if res_status == 0 else "Time limit"
+    elif res_status == 1:
+        status = "Time limit (no solution)"
+    elif res_status == 2:
+        status = "Infeasible"
+    else:
+        status = f"Solver status: {message}"
+
+    return assignments, status, extract_start
+
+
+def _solve_lazy(table, aps_data, lambda_energy, active, stats=None, time_limit=None, mip_gap=None):
+    """
+    Cutting-plane loop of the lazy interference model: solve with the
+    interference pairs marked in the boolean mask active only, add the pairs
+    the solution violates to active, and re-solve until none is violated.
+    Every solve is a relaxation of the full model, so the first solution
+    that violates no pair is optimal for it (or within mip_gap). time_limit
+    covers all rounds; a round stopped by it with violated pairs has no
+    usable incumbent, so the result is then "Time limit (no solution)".
+    Returns (assignments, status, extract start time, rounds); active is
+    updated in place, so a PersistentModel keeps its pairs between solves.
+    """
+    start = time.perf_counter()
+    rounds = 0
+    while True:
+        remaining = None if time_limit is None else time_limit - (time.perf_counter() - start)
+        if remaining is not None and remaining <= 0:
+            return {a["Name"]: [] for a in aps_data}, "Time limit (no solution)", time.perf_counter(), rounds
+        A, upper, column_upper, _ = build_matrix(table, aps_data, "lazy", np.nonzero(active)[0])
+        assignments, status, extract_start = _solve_matrix(
+            A, upper, column_upper, table, aps_data, lambda_energy, stats, remaining, mip_gap
+        )
+        rounds += 1
+        if status not in ("Optimal", "Time limit"):
+            return assignments, status, extract_start, rounds
+        violated = violated_pairs(table, ap_loads(table, assignments), active)
+        if not len(violated):
+            return assignments, status, extract_start, rounds
+        active[violated] = True
+        if status == "Time limit":
+            return {a["Name"]: [] for a in aps_data}, "Time limit (no solution)", extract_start, rounds
+
+
+def solve(intermediates, aps_data, lambda_energy=1, threads=1, stats=None, warm_start=None,
+          time_limit=None, mip_gap=None, on_incumbent=None, should_stop=None, interference="pairwise"):
+    """
+    Solve the AP-user assignment with SciPy's HiGHS MILP solver.
+
+    Same model, arguments and (assignments, status) result as the Gurobi
+    backend; threads, warm_start, on_incumbent and should_stop are ignored
+    because scipy's milp does not expose them (time_limit and mip_gap are
+    honoured). interference picks the interference model (see build_matrix);
+    "lazy" solves by the cutting-plane loop of _solve_lazy.
+    """
+    build_start = time.perf_counter()
+    table = compact(intermediates)
+    if interference == "lazy":
+        active = np.zeros(len(table.pair_limit), dtype=bool)
+        optimize_start = time.perf_counter()
+        assignments, status, extract_start, rounds = _solve_lazy(
+            table, aps_data, lambda_energy, active, stats, time_limit, mip_gap
+        )
+        report = lazy_report(len(active), int(active.sum()), rounds)
+    else:
+        A, upper, column_upper, report = build_matrix(table, aps_data, interference)
+        optimize_start = time.perf_counter()
+        if time_limit is not None:
+            time_limit = max(0.0, time_limit - (optimize_start - build_start))
+        assignments, status, extract_start = _solve_matrix(
+            A, upper, column_upper, table, aps_data, lambda_energy, stats, time_limit, mip_gap
+        )
+
+    if stats is not None:
+        stats.update(report)
+        stats["build_time"] = optimize_start - build_start
+        stats["optimize_time"] = extract_start - optimize_start
+        stats["extract_time"] = time.perf_counter() - extract_start
+
+    return assignments, status
+
+
+class PersistentModel:
+    """
+    Constraint matrix built once for fixed intermediates; each solve only
+    recomputes the objective vector for its lambda. In the lazy model the
+    interference pairs added by one solve stay for the next.
+    """
+
+    def __init__(self, intermediates, aps_data, threads=1, interference="pairwise"):
+        self.table = compact(intermediates)
+        self.aps_data = aps_data
+        self.active = np.zeros(len(self.table.pair_limit), dtype=bool) if interference == "lazy" else None
+        self.A, self.upper, self.column_upper, self.report = build_matrix(self.table, aps_data, interference)
+
+    def solve(self, lambda_energy=1, stats=None):
+        optimize_start = time.perf_counter()
+        if self.active is not None:
+            assignments, status, extract_start, rounds = _solve_lazy(
+                self.table, self.aps_data, lambda_energy, self.active, stats
+            )
+            self.report = lazy_report(len(self.active), int(self.active.sum()), rounds)
+        else:
+            assignments, status, extract_start = _solve_matrix(
+                self.A, self.upper, self.column_upper, self.table, self.aps_data, lambda_energy, stats
+            )
+        if stats is not None:
+            stats.update(self.report)
+            stats["build_time"] = 0.0
+            stats["optimize_time"] = extract_start - optimize_start
+            stats["extract_time"] = time.perf_counter() - extract_start
+        return assignments, status
@@ -1,9 +1,15 @@
+import time
 from PyQt5.QtCore import QThread, pyqtSignal
-from solver import solve_network
-from calculations import compute_intermediates
+from solver import solve_network, solver_options
+from intermediates_cache import cached_intermediates
+from instrumentation import phase, profile_dir, run_profiled
+
+# Minimum seconds between incumbent_ready signals; faster improvements are skipped
+INCUMBENT_INTERVAL = 0.25
 
 class SolverThread(QThread):
-    result_ready = pyqtSignal(object, object, object)  # assignments, status, intermediates
+    result_ready = pyqtSignal(object, object, object, object)  # assignments, status, intermediates, stats
+    incumbent_ready = pyqtSignal(object, object)  # assignments, info (objective, bound, mip_gap, runtime)
     error = pyqtSignal(str)
 
     def __init__(self, users, aps, settings):
@@ -11,11 +17,42 @@ class SolverThread(QThread):
         self.users = users
         self.aps = aps
         self.settings = settings
+        self.cancelled = False
+
+    def terminate(self):
+        """
+        Cooperative cancel (unlike QThread.terminate): a Gurobi solve stops at
+        its next callback, and no result or error is emitted afterwards.
+        """
+        self.cancelled = True
 
     def run(self):
         try:
-            intermediates = compute_intermediates(self.users, self.aps, self.settings)
-            assignments, status = solve_network(intermediates, self.aps)
+            stats = {}
+            with phase(stats, "preprocess_time"):
+                intermediates = cached_intermediates(self.users, self.aps, self.settings)
+
+            last_incumbent = [float("-inf")]
+
+            def on_incumbent(assignments, info):
+                # Called inside the solver's search; the signal is queued to the GUI thread
+                now = time.perf_counter()
+                if not self.cancelled and now - last_incumbent[0] >= INCUMBENT_INTERVAL:
+                    last_incumbent[0] = now
+                    self.incumbent_ready.emit(assignments, info)
+
+            def solve():
+                return solve_network(intermediates, self.aps, stats=stats, on_incumbent=on_incumbent,
+                                     should_stop=lambda: self.cancelled, **solver_options(self.settings))
+
+            # Optional cProfile dump of the solve, for offline analysis
+            directory = profile_dir(self.settings)
+            if directory:
+                (assignments, status), stats["profile_path"] = run_profiled(solve, directory)
+            else:
+                assignments, status = solve()
+            if self.cancelled:
+                return
 
             # Ensure assignments is always a dict
             if assignments is None or not isinstance(assignments, dict):
@@ -25,6 +62,7 @@ class SolverThread(QThread):
                     if a["Name"] not in assignments or not isinstance(assignments[a["Name"]], list):
                         assignments[a["Name"]] = []
 
-            self.result_ready.emit(assignments, status, intermediates)
+            self.result_ready.emit(assignments, status, intermediates, stats)
         except Exception as e:
-            self.error.emit(str(e))
+            if not self.cancelled:
+                self.error.emit(str(e))
@@ -0,0 +1,171 @@
+# sweep.py
+import argparse
+import json
+import time
+from calculations import compute_intermediates
+from interference import MODELS
+from scenario import read_scenario
+from solver import persistent_model, solve_network, solver_options
+
+
+def assignment_totals(assignments, intermediates):
+    """(total priority weight, total energy cost, connected users) of an assignment."""
+    w, c = intermediates["w"], intermediates["c"]
+    priority = energy = 0.0
+    connected = 0
+    for a, users in assignments.items():
+        for u in users:
+            priority += w[u]
+            energy += c[(u, a)]
+            connected += 1
+    return priority, energy, connected
+
+
+def assignment_objective(assignments, intermediates, lambda_energy=1):
+    """Objective value of an assignment: total priority weight - lambda * total energy cost."""
+    priority, energy, _ = assignment_totals(assignments, intermediates)
+    return priority - lambda_energy * energy
+
+
+def pareto_front(points):
+    """
+    Points not dominated in (higher priority, lower energy), sorted by
+    increasing energy. Duplicate (priority, energy) pairs are kept once.
+    """
+    front = []
+    for point in sorted(points, key=lambda p: (-p["priority"], p["energy"])):
+        if not front or point["energy"] < front[-1]["energy"]:
+            front.append(point)
+    return front[::-1]
+
+
+def run_sweep(users, aps, settings, lambdas, bands=None, environments=None, backend=None, threads=1,
+              interference="pairwise", **options):
+    """
+    Solve one scenario for every combination of lambda_energy, WifiBand and
+    EnvironmentType.
+
+    compute_intermediates runs once per (band, environment) and one
+    persistent model is built for it; the lambda values then only change the
+    objective of that model. Other solve_network options (time_limit,
+    mip_gap, presolve, decompose, portfolio, ...) can be passed as keywords;
+    when any is set, every lambda goes through solve_network instead.
+    bands/environments default to the ones in settings. Energy costs are
+    only non-zero when settings has IncludePowerConsumption enabled.
+
+    Returns a dict:
+        points: one entry per solve with band, environment, lambda, status,
+                priority, energy, connected, solve_time and assignments
+        fronts: {(band, environment): Pareto front of that combination's points}
+        preprocess_time / build_time: totals in seconds over the sweep
+    """
+    bands = bands or [settings["WifiBand"]]
+    environments = environments or [settings["EnvironmentType"]]
+    persistent = not any(options.values())
+
+    points, fronts = [], {}
+    preprocess_time = build_time = 0.0
+    for band in bands:
+        for env in environments:
+            combo_settings = dict(settings, WifiBand=band, EnvironmentType=env)
+
+            start = time.perf_counter()
+            intermediates = compute_intermediates(users, aps, combo_settings)
+            built = time.perf_counter()
+            if persistent:
+                model = persistent_model(intermediates, aps, backend, threads, interference)
+            preprocess_time += built - start
+            build_time += time.perf_counter() - built
+
+            combo_points = []
+            for lambda_energy in lambdas:
+                start = time.perf_counter()
+                if persistent:
+                    assignments, status = model.solve(lambda_energy)
+                else:
+                    assignments, status = solve_network(intermediates, aps, lambda_energy, backend=backend,
+                                                        threads=threads, interference=interference, **options)
+                priority, energy, connected = assignment_totals(assignments, intermediates)
+                combo_points.append({
+                    "band": band,
+                    "environment": env,
+                    "lambda": lambda_energy,
+                    "status": status,
+                    "priority": priority,
+                    "energy": energy,
+                    "connected": connected,
+                    "solve_time": time.perf_counter() - start,
+                    "assignments": assignments,
+                })
+
+            points.extend(combo_points)
+            fronts[(band, env)] = pareto_front(
+                [p for p in combo_points if p["status"] in ("Optimal", "Heuristic")]
+            )
+
+    return {
+        "points": points,
+        "fronts": fronts,
+        "preprocess_time": preprocess_time,
+        "build_time": build_time,
+    }
+
+
+def sweep_report(result, with_assignments=False):
+    """run_sweep's result as JSON-ready data: fronts as a list, assignments only if asked for."""
+    def keep(point):
+        return point if with_assignments else {k: v for k, v in point.items() if k != "assignments"}
+
+    return {
+        "points": [keep(p) for p in result["points"]],
+        "fronts": [
+            {"band": band, "environment": env, "front": [keep(p) for p in front]}
+            for (band, env), front in result["fronts"].items()
+        ],
+        "preprocess_time": result["preprocess_time"],
+        "build_time": result["build_time"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Solve a scenario over a range of lambda_energy values (and bands/environments) "
+                    "and report the priority/energy Pareto fronts as JSON."
+    )
+    parser.add_argument("scenario", help="scenario file (.json or .scnb)")
+    parser.add_argument("--lambdas", type=float, nargs="+", default=[0, 0.25, 0.5, 1, 2, 4],
+                        help="lambda_energy values (default: 0 0.25 0.5 1 2 4)")
+    parser.add_argument("--bands", nargs="+", help="WifiBand values (default: the scenario's)")
+    parser.add_argument("--environments", nargs="+", help="EnvironmentType values (default: the scenario's)")
+    parser.add_argument("--backend", help="solver backend (default: the scenario's, else auto)")
+    parser.add_argument("--threads", type=int, help="solver threads (Gurobi)")
+    parser.add_argument("--interference", choices=MODELS,
+                        help="interference model of the MIP backends (default: the scenario's, else pairwise)")
+    parser.add_argument("--time-limit", dest="time_limit", type=float, help="seconds per solve")
+    parser.add_argument("--mip-gap", dest="mip_gap", type=float, help="relative MIP gap target per solve")
+    parser.add_argument("--presolve", action="store_true", default=None, help="presolve every solve")
+    parser.add_argument("--assignments", action="store_true", help="include each point's assignments")
+    parser.add_argument("-o", "--output", default="-", help="JSON report path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    data = read_scenario(args.scenario)
+    # The scenario's solver settings, overridden by the flags given; lambda is swept
+    options = solver_options(data["settings"])
+    options.pop("lambda_energy")
+    options.update({k: v for k, v in {
+        "backend": args.backend, "threads": args.threads, "interference": args.interference,
+        "time_limit": args.time_limit, "mip_gap": args.mip_gap, "presolve": args.presolve,
+    }.items() if v is not None})
+
+    result = run_sweep(data["users"], data["aps"], data["settings"], args.lambdas, args.bands, args.environments,
+                       **options)
+    text = json.dumps(sweep_report(result, args.assignments), indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
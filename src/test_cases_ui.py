@@ -1,4 +1,4 @@
-import os, json, sys, subprocess
+import os, sys, subprocess
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton,
     QMessageBox, QScrollArea, QFrame
@@ -6,8 +6,10 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 from calculations import compute_intermediates
+from scenario import SCENARIO_EXTENSIONS, load_scenario
 from output_ui import OutputWindow
-from solver_thread import SolverThread  # threaded solver wrapper
+from instrumentation import format_incumbent, format_stats
+from scheduler import shared_scheduler, status_text  # shared solver job queue
 
 
 class TestCasesWindow(QWidget):
@@ -36,6 +38,20 @@ class TestCasesWindow(QWidget):
         container.setStyleSheet("QWidget { background-color: #f3e5f5; border-radius: 12px; }")
         layout.addWidget(scroll)
 
+        # Solver status and cancel
+        status_row = QHBoxLayout()
+        self.solver_status = QLabel(status_text(*shared_scheduler().counts()))
+        self.solver_status.setStyleSheet("QLabel { font-size: 13px; color: #283593; }")
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setStyleSheet(self.button_style())
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_solver)
+        status_row.addWidget(self.solver_status)
+        status_row.addStretch()
+        status_row.addWidget(self.cancel_btn)
+        layout.addLayout(status_row)
+        shared_scheduler().status_changed.connect(self.update_solver_status)
+
         # Populate test cases
         self.populate_test_cases()
 
@@ -54,9 +70,9 @@ class TestCasesWindow(QWidget):
             QMessageBox.critical(self, "Error", f"Folder not found:\n{test_dir}")
             return
 
-        files = [f for f in os.listdir(test_dir) if f.endswith(".json")]
+        files = [f for f in os.listdir(test_dir) if f.endswith(SCENARIO_EXTENSIONS)]
         if not files:
-            QMessageBox.information(self, "Info", "No JSON test cases found.")
+            QMessageBox.information(self, "Info", "No test cases found.")
             return
 
         for fname in files:
@@ -73,6 +89,7 @@ class TestCasesWindow(QWidget):
             see_btn = QPushButton("See source")
             see_btn.setStyleSheet(self.button_style())
             see_btn.clicked.connect(lambda _, p=fpath: self.open_in_editor(p))
+            see_btn.setEnabled(fname.endswith(".json"))  # .scnb files are binary
             row_layout.addWidget(see_btn)
 
             test_btn = QPushButton("Test")
@@ -103,15 +120,38 @@ class TestCasesWindow(QWidget):
             QMessageBox.critical(self, "Error", f"Failed to load scenario:\n{e}")
             return
 
-        self.solver_thread = SolverThread(users, aps, settings)
-        self.solver_thread.result_ready.connect(
-            lambda assignments, status, intermediates:
-            self.on_solver_finished(users, aps, settings, assignments, status, intermediates)
+        # Only the latest Test click of this window runs
+        self.live_output = None   # opened by the first streamed incumbent
+        shared_scheduler().submit(
+            self, users, aps, settings,
+            on_result=lambda assignments, status, intermediates, stats:
+            self.on_solver_finished(users, aps, settings, assignments, status, intermediates, stats),
+            on_error=lambda msg: QMessageBox.critical(self, "Solver Error", msg),
+            on_incumbent=lambda assignments, info: self.on_incumbent(users, aps, settings, assignments, info),
         )
-        self.solver_thread.error.connect(lambda msg: QMessageBox.critical(self, "Solver Error", msg))
-        self.solver_thread.start()
 
-    def on_solver_finished(self, users, aps, settings, assignments, status, intermediates):
+    def cancel_solver(self):
+        shared_scheduler().cancel(self)
+        if self.live_output is not None:
+            self.live_output.append_solver_message("Cancelled: showing the best assignment found so far.")
+            self.live_output = None
+
+    def update_solver_status(self, running, queued):
+        self.solver_status.setText(status_text(running, queued))
+        self.cancel_btn.setEnabled(shared_scheduler().has_job(self))
+
+    def on_incumbent(self, users, aps, settings, assignments, info):
+        """Show the best assignment found so far while the solver keeps searching."""
+        messages = [format_incumbent(info)]
+        if self.live_output is None:
+            self.live_output = OutputWindow(users, aps, settings, assignments, messages=messages)
+            self.output_window = self.live_output
+            self.output_window.show()
+        else:
+            self.live_output.set_assignments(assignments)
+            self.live_output.set_solver_messages(messages)
+
+    def on_solver_finished(self, users, aps, settings, assignments, status, intermediates, stats=None):
         total_connected = sum(len(u_list) for u_list in assignments.values())
         total_users = len(users)
 
@@ -130,23 +170,16 @@ class TestCasesWindow(QWidget):
                 f"Total users connected: {total_connected}/{total_users}",
                 "Average priority cannot be computed (no users connected)."
             ]
+        messages.extend(format_stats(stats or {}))
 
+        if self.live_output is not None:
+            self.live_output.set_assignments(assignments)
+            self.live_output.set_solver_messages(messages)
+            self.live_output = None
+            return
         self.output_window = OutputWindow(users, aps, settings, assignments, messages=messages)
         self.output_window.show()
 
     def load_scenario(self, file_path):
         """Load and validate JSON scenario file."""
-        with open(file_path, "r") as f:
-            data = json.load(f)
-
-        if not all(k in data for k in ("users", "aps", "settings")):
-            raise ValueError("JSON must contain 'users', 'aps', and 'settings' keys.")
-
-        users = data["users"]
-        aps = data["aps"]
-        settings = data["settings"]
-
-        if not isinstance(users, list) or not isinstance(aps, list) or not isinstance(settings, dict):
-            raise ValueError("Invalid JSON structure.")
-
-        return users, aps, settings
+        return load_scenario(file_path)
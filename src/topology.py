@@ -1,9 +1,22 @@
 from PyQt5.QtWidgets import (
-    QWidget, QGraphicsView, QGraphicsScene, QVBoxLayout,
+    QWidget, QGraphicsView, QGraphicsScene, QVBoxLayout, QGraphicsItem,
     QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsTextItem, QGraphicsPixmapItem
 )
-from PyQt5.QtGui import QPen, QBrush, QColor, QPixmap, QPainter
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPen, QBrush, QColor, QPixmap, QPainter, QPolygonF
+from PyQt5.QtCore import Qt, QPointF, QRectF
+
+# Scenarios with more users than this are drawn by a few batched items
+# (UserTile, ApLayer) instead of separate items per square, icon and label
+BATCH_THRESHOLD = 500
+TILE_SIZE = 200     # scene pixels covered by one UserTile
+DOT_LOD = 0.2       # below this zoom level users are drawn as dots
+DETAIL_LOD = 0.6    # icons and labels only from this zoom level on
+DOT_SIZE = 4        # device pixels
+
+AP_SQUARE = 60
+USER_SQUARE = 40
+LABEL_GAP = 20
+UNASSIGNED_COLOR = QColor("#9e9e9e")
 
 
 class ZoomableView(QGraphicsView):
@@ -33,8 +46,152 @@ class ZoomableView(QGraphicsView):
         self.scale(zoom_factor, zoom_factor)
 
 
+def _draw_label(painter, x, y, text):
+    """Text with its top-left corner at (x, y), like a QGraphicsTextItem placed there."""
+    painter.drawText(QRectF(x, y, 200, LABEL_GAP), Qt.AlignLeft | Qt.AlignVCenter, text)
+
+
+class UserTile(QGraphicsItem):
+    """
+    All users inside one TILE_SIZE square, painted in a single pass.
+
+    users is a list of (x, y, name, priority, color) in scene coordinates,
+    color being the assigned AP's colour or None. The level of detail decides
+    what is drawn: dots when zoomed out, squares in between, and icons and
+    labels from DETAIL_LOD on. Only users in the exposed area are painted.
+    """
+
+    def __init__(self, users, icon):
+        super().__init__()
+        self.users = users
+        self.icon = icon
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+        # Same-coloured users are drawn with one call
+        self.groups = {}
+        for x, y, _, _, color in users:
+            color = UNASSIGNED_COLOR if color is None else color
+            self.groups.setdefault(color.rgba(), (color, []))[1].append((x, y))
+
+        self.half = max(USER_SQUARE, icon.width(), icon.height()) / 2
+        xs = [u[0] for u in users]
+        ys = [u[1] for u in users]
+        # Labels extend to the right of and above/below the icon
+        self.bounds = QRectF(
+            min(xs) - self.half, min(ys) - self.half - LABEL_GAP - 5,
+            max(xs) - min(xs) + self.half + 200, max(ys) - min(ys) + 2 * (self.half + LABEL_GAP + 5)
+        )
+
+    def boundingRect(self):
+        return self.bounds
+
+    def paint(self, painter, option, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+
+        if lod < DOT_LOD:
+            for color, points in self.groups.values():
+                pen = QPen(color, DOT_SIZE)
+                pen.setCosmetic(True)
+                painter.setPen(pen)
+                painter.drawPoints(QPolygonF([QPointF(x, y) for x, y in points]))
+            return
+
+        area = option.exposedRect.adjusted(-self.half - 200, -self.half - LABEL_GAP - 5,
+                                           self.half, self.half + LABEL_GAP + 5)
+        half_square = USER_SQUARE / 2
+        visible = [u for u in self.users if area.contains(u[0], u[1])]
+
+        if lod < DETAIL_LOD:
+            painter.setPen(QPen(Qt.black, 1))
+            for color, points in self.groups.values():
+                if color is UNASSIGNED_COLOR:
+                    continue
+                painter.setBrush(QBrush(color))
+                painter.drawRects([
+                    QRectF(x - half_square, y - half_square, USER_SQUARE, USER_SQUARE)
+                    for x, y in points if area.contains(x, y)
+                ])
+            # No icon yet: mark unassigned users so they stay visible
+            pen = QPen(UNASSIGNED_COLOR, DOT_SIZE)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawPoints(QPolygonF([QPointF(x, y) for x, y, _, _, color in visible if color is None]))
+            return
+
+        # Full detail: each user's square, icon and labels in turn, stacked
+        # like the per-item scene
+        painter.setFont(self.scene().font())
+        iw, ih = self.icon.width(), self.icon.height()
+        for x, y, name, priority, color in visible:
+            if color is not None:
+                painter.setPen(QPen(Qt.black, 1))
+                painter.setBrush(QBrush(color))
+                painter.drawRect(QRectF(x - half_square, y - half_square, USER_SQUARE, USER_SQUARE))
+            if not self.icon.isNull():
+                painter.drawPixmap(QPointF(x - iw / 2, y - ih / 2), self.icon)
+            painter.setPen(Qt.black)
+            _draw_label(painter, x - iw / 2, y - ih / 2 - LABEL_GAP, name)
+            painter.setPen(QColor("#424242"))
+            _draw_label(painter, x - iw / 2, y + ih / 2 + 5, priority)
+
+
+class ApLayer(QGraphicsItem):
+    """
+    Every AP (coverage circle, square, icon, name and channel) as one item,
+    with the same level-of-detail rules as UserTile.
+    """
+
+    def __init__(self, aps, radius, icon):
+        # aps: list of (x, y, name, channel, color) in scene coordinates
+        super().__init__()
+        self.aps = aps
+        self.radius = radius
+        self.icon = icon
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+        reach = max(radius, AP_SQUARE / 2 + LABEL_GAP + 5)
+        xs = [a[0] for a in aps]
+        ys = [a[1] for a in aps]
+        self.reach = reach
+        self.bounds = QRectF(
+            min(xs) - reach, min(ys) - reach,
+            max(xs) - min(xs) + 2 * reach + 200, max(ys) - min(ys) + 2 * reach
+        )
+
+    def boundingRect(self):
+        return self.bounds
+
+    def paint(self, painter, option, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        area = option.exposedRect.adjusted(-self.reach - 200, -self.reach, self.reach, self.reach)
+        visible = [a for a in self.aps if area.contains(a[0], a[1])]
+        r = self.radius
+
+        painter.setBrush(QBrush(QColor(225, 190, 231, 50)))
+        painter.setPen(QPen(QColor("#6a1b9a"), 2))
+        for x, y, _, _, _ in visible:
+            painter.drawEllipse(QRectF(x - r, y - r, 2 * r, 2 * r))
+
+        half = AP_SQUARE / 2
+        painter.setPen(QPen(Qt.black, 2))
+        for x, y, _, _, color in visible:
+            painter.setBrush(QBrush(color))
+            painter.drawRect(QRectF(x - half, y - half, AP_SQUARE, AP_SQUARE))
+
+        if lod < DETAIL_LOD:
+            return
+        painter.setFont(self.scene().font())
+        iw, ih = self.icon.width(), self.icon.height()
+        painter.setPen(Qt.black)
+        for x, y, name, channel, _ in visible:
+            if not self.icon.isNull():
+                painter.drawPixmap(QPointF(x - iw / 2, y - ih / 2), self.icon)
+            _draw_label(painter, x - half, y - half - LABEL_GAP, name)
+            _draw_label(painter, x - half, y + half + 5, f"Ch {channel}")
+
+
 class TopologyWindow(QWidget):
-    def __init__(self, users, aps, assignments, intermediates):
+    def __init__(self, users, aps, assignments, intermediates, batched=None):
         super().__init__()
         self.setWindowTitle("Network Topology")
         self.showMaximized()
@@ -45,6 +202,11 @@ class TopologyWindow(QWidget):
         self.view.setScene(self.scene)
         layout.addWidget(self.view)
 
+        # batched=None picks the mode from the scenario size
+        if batched is None:
+            batched = len(users) > BATCH_THRESHOLD
+        self.batched = batched
+
         self.draw_topology(users, aps, assignments, intermediates)
 
     def generate_ap_colors(self, aps):
@@ -85,6 +247,13 @@ class TopologyWindow(QWidget):
         user_icon = user_icon.scaled(45, 45, Qt.KeepAspectRatio, Qt.SmoothTransformation)
 
         ap_colors = self.generate_ap_colors(aps)
+        # Inverse of assignments, so each user's AP is a dict lookup
+        user_ap = {u: ap_name for ap_name, user_list in assignments.items() for u in user_list}
+
+        if self.batched:
+            self.draw_batched(users, aps, user_ap, ap_colors, ap_icon, user_icon, ap_radius_px,
+                              lambda x: (x - X_min) * s + x_offset, lambda y: (y - Y_min) * s + y_offset)
+            return
 
         # --- Draw APs ---
         for ap in aps:
@@ -127,12 +296,7 @@ class TopologyWindow(QWidget):
             x = (user["X"] - X_min) * s + x_offset
             y = (user["Y"] - Y_min) * s + y_offset
 
-            assigned_ap = None
-            for ap_name, user_list in assignments.items():
-                if uname in user_list:
-                    assigned_ap = ap_name
-                    break
-
+            assigned_ap = user_ap.get(uname)
             if assigned_ap:
                 square_size = 40
                 rect = QGraphicsRectItem(x - square_size / 2, y - square_size / 2, square_size, square_size)
@@ -153,3 +317,20 @@ class TopologyWindow(QWidget):
             priority_text.setDefaultTextColor(QColor("#424242"))
             priority_text.setPos(x - user_icon.width() / 2, y + user_icon.height() / 2 + 5)
             self.scene.addItem(priority_text)
+
+    def draw_batched(self, users, aps, user_ap, ap_colors, ap_icon, user_icon, ap_radius_px, to_x, to_y):
+        """Batched mode: one ApLayer plus one UserTile per occupied TILE_SIZE square."""
+        self.scene.addItem(ApLayer(
+            [(to_x(ap["X"]), to_y(ap["Y"]), ap["Name"], ap["Channel"], ap_colors[ap["Name"]]) for ap in aps],
+            ap_radius_px, ap_icon
+        ))
+
+        tiles = {}
+        for user in users:
+            x, y = to_x(user["X"]), to_y(user["Y"])
+            assigned_ap = user_ap.get(user["Name"])
+            tiles.setdefault((int(x // TILE_SIZE), int(y // TILE_SIZE)), []).append(
+                (x, y, user["Name"], user.get("Priority", ""), ap_colors[assigned_ap] if assigned_ap else None)
+            )
+        for tile_users in tiles.values():
+            self.scene.addItem(UserTile(tile_users, user_icon))
@@ -0,0 +1,28 @@
+# checks.py - shared assertions and scenarios for the solver tests
+from calculations import compute_intermediates
+from generator import generate_scenario
+from solver import MIP_BACKENDS, available_backends
+
+
+def scenario_intermediates(n_users, seed=0, **kwargs):
+    scenario = generate_scenario(n_users, seed=seed, **kwargs)
+    return scenario["aps"], compute_intermediates(scenario["users"], scenario["aps"], scenario["settings"])
+
+
+def mip_backends():
+    """The installed MIP backends; scenarios stay small enough for a size-limited Gurobi licence."""
+    return [name for name in MIP_BACKENDS if name in available_backends()]
+
+
+def assert_feasible(intermediates, aps_data, assignments):
+    """Every user on at most one AP over a feasible edge, within capacities and interference limits."""
+    capacity = {a["Name"]: a["Capacity"] for a in aps_data}
+    seen = set()
+    for a, users in assignments.items():
+        assert len(users) <= capacity[a], a
+        for u in users:
+            assert (u, a) in intermediates["c"], (u, a)
+            assert u not in seen, u
+            seen.add(u)
+    for (a1, a2), limit in intermediates["M"].items():
+        assert len(assignments.get(a1, [])) + len(assignments.get(a2, [])) <= limit, (a1, a2)
@@ -0,0 +1,5 @@
+# conftest.py - the modules live flat in src/, imported as in the app
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
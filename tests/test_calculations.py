@@ -0,0 +1,145 @@
+# test_calculations.py - compute_intermediates against the original loop implementation
+import glob
+import math
+import os
+
+import pytest
+
+import scenario_binary
+from calculations import compute_intermediates
+from generator import LAYOUTS, generate_scenario
+from scenario import read_scenario
+
+TEST_CASES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "test_cases", "*.json")))
+
+
+def loop_intermediates(users, aps, settings):
+    """Frozen copy of the loop version compute_intermediates replaced."""
+    env = settings["EnvironmentType"]
+    wifi_band = settings["WifiBand"]
+    include_power = settings["IncludePowerConsumption"]
+
+    alpha = 3 if env == "Indoor" else 3.5 if env == "Urban" else 2.7
+    if wifi_band == "2.4 GHz":
+        D_max = 5 if env == "Indoor" else 7 if env == "Urban" else 12
+    else:
+        D_max = 3 if env == "Indoor" else 5 if env == "Urban" else 10
+    D_intf = 1.5 * D_max
+
+    distances, E = {}, []
+    for u in users:
+        for a in aps:
+            if None in (u["X"], u["Y"], a["X"], a["Y"]):
+                continue
+            d = math.sqrt((u["X"] - a["X"])**2 + (u["Y"] - a["Y"])**2)
+            distances[(u["Name"], a["Name"])] = d
+            if d <= D_max:
+                E.append((u["Name"], a["Name"]))
+
+    base_power = {"IoT Sensor": 1, "Wearable": 1, "Smartphone": 3, "Tablet": 4, "Laptop": 6}
+    c = {}
+    for (u_name, a_name) in E:
+        device_type = next(u for u in users if u["Name"] == u_name)["Device"]
+        factor = base_power.get(device_type, 1) if include_power else 0
+        c[(u_name, a_name)] = 0.1 * factor * (distances[(u_name, a_name)] ** alpha) / (D_max ** alpha)
+
+    ap_distances = {}
+    for i, a1 in enumerate(aps):
+        for j, a2 in enumerate(aps):
+            if i < j and None not in (a1["X"], a1["Y"], a2["X"], a2["Y"]):
+                ap_distances[(a1["Name"], a2["Name"])] = math.sqrt((a1["X"] - a2["X"])**2 + (a1["Y"] - a2["Y"])**2)
+
+    I = []
+    for (a1_name, a2_name), d_ab in ap_distances.items():
+        a1 = next(a for a in aps if a["Name"] == a1_name)
+        a2 = next(a for a in aps if a["Name"] == a2_name)
+        if d_ab <= D_intf and a1["Channel"] == a2["Channel"]:
+            I.append((a1_name, a2_name))
+
+    M = {}
+    for (a1_name, a2_name) in I:
+        a1 = next(a for a in aps if a["Name"] == a1_name)
+        a2 = next(a for a in aps if a["Name"] == a2_name)
+        k_a, k_b = a1["Capacity"], a2["Capacity"]
+        d_ab = ap_distances[(a1_name, a2_name)]
+        M[(a1_name, a2_name)] = math.floor(k_a + k_b - min(k_a, k_b) * max(0, 1 - d_ab / D_intf))
+
+    w = {u["Name"]: 3 if u["Priority"] == "High" else 2 if u["Priority"] == "Medium" else 1 for u in users}
+    return {"D_max": D_max, "D_intf": D_intf, "distances": distances, "E": E, "c": c, "I": I, "M": M, "w": w}
+
+
+def assert_equivalent(users, aps, settings, actual=None):
+    expected = loop_intermediates(users, aps, settings)
+    if actual is None:
+        actual = compute_intermediates(users, aps, settings)
+
+    assert actual["D_max"] == expected["D_max"]
+    assert actual["D_intf"] == expected["D_intf"]
+    assert list(actual["E"]) == expected["E"]
+    assert list(actual["I"]) == expected["I"]
+    assert list(actual["M"].items()) == list(expected["M"].items())
+    assert list(actual["w"].items()) == list(expected["w"].items())
+    assert list(actual["c"]) == list(expected["c"])
+    for e, cost in expected["c"].items():
+        assert actual["c"][e] == pytest.approx(cost, rel=1e-12, abs=1e-15)
+    # Only feasible edges keep a distance
+    for e in expected["E"]:
+        assert actual["distances"][e] == pytest.approx(expected["distances"][e], rel=1e-12)
+
+
+@pytest.mark.parametrize("path", TEST_CASES, ids=os.path.basename)
+def test_test_cases(path):
+    scenario = read_scenario(path)
+    assert_equivalent(scenario["users"], scenario["aps"], scenario["settings"])
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+@pytest.mark.parametrize("seed", range(3))
+def test_generated(layout, seed):
+    settings = [
+        {"WifiBand": "2.4 GHz", "EnvironmentType": "Indoor", "IncludePowerConsumption": True},
+        {"WifiBand": "5 GHz", "EnvironmentType": "Urban", "IncludePowerConsumption": True},
+        {"WifiBand": "2.4 GHz", "EnvironmentType": "Open Space", "IncludePowerConsumption": False},
+    ][seed]
+    scenario = generate_scenario(150, layout=layout, seed=seed, settings=settings, ap_spacing=0.6)
+    assert_equivalent(scenario["users"], scenario["aps"], scenario["settings"])
+
+
+def test_missing_coordinates():
+    scenario = generate_scenario(40, seed=7)
+    users, aps = scenario["users"], scenario["aps"]
+    users[3]["X"] = None
+    aps[1]["Y"] = None
+    assert_equivalent(users, aps, scenario["settings"])
+
+
+
+def assert_same(actual, expected):
+    for key in ("E", "I"):
+        assert list(actual[key]) == list(expected[key]), key
+    for key in ("M", "w", "c", "distances"):
+        assert list(actual[key].items()) == list(expected[key].items()), key
+
+
+@pytest.mark.parametrize("plain", [True, False])
+def test_columnar_tables(tmp_path, monkeypatch, plain):
+    scenario = generate_scenario(150, layout="clustered", seed=3, ap_spacing=0.6)
+    users, aps = scenario["users"], scenario["aps"]
+    if not plain:
+        # Values the columns cannot hold, and repeated names (weight of the last record, device of the first)
+        users[3]["X"] = None
+        users.append(dict(users[0], Priority="High", Device="IoT Sensor", X=users[5]["X"]))
+        aps.append(dict(aps[0], Capacity=aps[0]["Capacity"] + 3, Channel=99))
+    path = str(tmp_path / "scenario.scnb")
+    scenario_binary.write_scenario(path, scenario)
+    data = read_scenario(path)
+    if plain:
+        # Exact columns: the intermediates come from the arrays, no record is built
+        def no_records(self, i, lists):
+            raise AssertionError("record decoded")
+        monkeypatch.setattr(scenario_binary.ColumnarTable, "_record", no_records)
+    actual = compute_intermediates(data["users"], data["aps"], data["settings"])
+    monkeypatch.undo()
+    assert_same(actual, compute_intermediates(users, aps, scenario["settings"]))
+    if plain:
+        assert_equivalent(users, aps, scenario["settings"], actual)
@@ -0,0 +1,32 @@
+# test_calculations_ui.py - sorting the intermediates tables
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import Qt  # noqa: E402
+
+from calculations_ui import IntermediatesTableModel  # noqa: E402
+from checks import scenario_intermediates  # noqa: E402
+from compact import compact  # noqa: E402
+
+
+def shown(model):
+    while model.canFetchMore():
+        model.fetchMore()
+    return [tuple(model.raw(model.source_row(row), column) for column in (0, 1)) for row in range(model.rowCount())]
+
+
+@pytest.mark.parametrize("view", ["E", "I"])
+@pytest.mark.parametrize("column", [0, 1])
+@pytest.mark.parametrize("order", [Qt.AscendingOrder, Qt.DescendingOrder])
+def test_sort_by_clicked_column(view, column, order):
+    _, intermediates = scenario_intermediates(150, ap_spacing=0.4)
+    table = compact(intermediates)
+    for keys in (table[view], list(intermediates[view])):
+        model = IntermediatesTableModel(keys, ["First", "Second"])
+        model.sort(column, order)
+        rows = shown(model)
+        expected = sorted(rows, key=lambda r: (r[column], r[1 - column]), reverse=order == Qt.DescendingOrder)
+        assert [r[column] for r in rows] == [r[column] for r in expected]
+        if hasattr(keys, "key_ranks"):
+            assert rows == expected
@@ -0,0 +1,66 @@
+# test_decomposition.py - decomposed solves: same optimum, prompt cancellation
+import time
+
+import pytest
+
+import decomposition
+from calculations import compute_intermediates
+from checks import assert_feasible
+from generator import generate_scenario
+from solver import available_backends, solve_network
+from sweep import assignment_objective
+
+
+def blocks(n_blocks, n_users, ap_spacing=1.0):
+    """Separate buildings: copies of a generated site far apart."""
+    users, aps = [], []
+    for b in range(n_blocks):
+        scenario = generate_scenario(n_users, layout="clustered", seed=b, ap_spacing=ap_spacing)
+        users += [dict(u, Name=f"B{b}{u['Name']}", X=u["X"] + b * 100000) for u in scenario["users"]]
+        aps += [dict(a, Name=f"B{b}{a['Name']}", X=a["X"] + b * 100000) for a in scenario["aps"]]
+    return users, aps, scenario["settings"]
+
+
+@pytest.mark.skipif("highs" not in available_backends(), reason="scipy milp not installed")
+def test_same_optimum_as_whole_model(monkeypatch):
+    users, aps, settings = blocks(3, 150)
+    intermediates = compute_intermediates(users, aps, settings)
+    whole, _ = solve_network(intermediates, aps, backend="highs")
+    monkeypatch.setattr(decomposition, "MIN_PARALLEL_EDGES", 0)
+    for processes in (1, 2):
+        stats = {}
+        split, status = solve_network(intermediates, aps, backend="highs", decompose=True, processes=processes,
+                                      stats=stats)
+        assert status == "Optimal" and stats["components"] >= 3
+        assert_feasible(intermediates, aps, split)
+        assert assignment_objective(split, intermediates) == pytest.approx(assignment_objective(whole, intermediates))
+
+
+@pytest.mark.skipif("highs" not in available_backends(), reason="scipy milp not installed")
+def test_pooled_cancel_returns_promptly(monkeypatch):
+    users, aps, settings = blocks(4, 1500, ap_spacing=0.5)
+    intermediates = compute_intermediates(users, aps, settings)
+    monkeypatch.setattr(decomposition, "MIN_PARALLEL_EDGES", 0)
+    start = time.perf_counter()
+    assignments, status = solve_network(intermediates, aps, backend="highs", decompose=True, processes=2,
+                                        should_stop=lambda: time.perf_counter() - start > 0.5)
+    assert status == "Interrupted"
+    assert time.perf_counter() - start < 0.5 + decomposition.STOP_GRACE + 1.5
+    assert_feasible(intermediates, aps, assignments)
+
+
+@pytest.mark.skipif("highs" not in available_backends(), reason="scipy milp not installed")
+@pytest.mark.parametrize("processes", [1, 2])
+def test_time_limit_covers_all_components(monkeypatch, processes):
+    users, aps, settings = blocks(6, 1500, ap_spacing=0.5)
+    intermediates = compute_intermediates(users, aps, settings)
+    monkeypatch.setattr(decomposition, "MIN_PARALLEL_EDGES", 0)
+    start = time.perf_counter()
+    assignments, status = solve_network(intermediates, aps, backend="highs", decompose=True, processes=processes,
+                                        time_limit=1.0)
+    elapsed = time.perf_counter() - start
+    assert status != "Interrupted"
+    # Slack for HiGHS, which checks its limit between phases, and for starting
+    # the pool's workers; a full budget per component would take over 6 s
+    assert elapsed < 1.0 + 3.5
+    assert_feasible(intermediates, aps, assignments)
@@ -0,0 +1,30 @@
+# test_input_models.py - CSV import of the input tables
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from input_models import AP_COLUMNS, USER_COLUMNS, read_csv_records  # noqa: E402
+
+
+def write(tmp_path, text):
+    path = tmp_path / "table.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def test_integer_values(tmp_path):
+    path = write(tmp_path, "Name,Priority,X,Y,Device\nU1,High,3,4.0,Laptop\nU2,Low,,,Tablet\n")
+    assert read_csv_records(path, USER_COLUMNS) == [
+        {"Name": "U1", "Priority": "High", "X": 3, "Y": 4, "Device": "Laptop"},
+        {"Name": "U2", "Priority": "Low", "X": None, "Y": None, "Device": "Tablet"},
+    ]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("Name,Priority,X,Y,Device\nU1,High,2.7,4,Laptop\n", "Line 2: invalid X '2.7'"),
+    ("Name,Capacity,Channel,X,Y\nA1,5,1,0,0\nA2,2.5,1,3,3\n", "Line 3: invalid Capacity '2.5'"),
+])
+def test_fractions_rejected(tmp_path, text, message):
+    columns = AP_COLUMNS if "Capacity" in text else USER_COLUMNS
+    with pytest.raises(ValueError, match=message):
+        read_csv_records(write(tmp_path, text), columns)
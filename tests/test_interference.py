@@ -0,0 +1,103 @@
+# test_interference.py - the interference reformulations keep the pairwise optimum
+import pytest
+
+from checks import assert_feasible, mip_backends, scenario_intermediates
+from compact import compact
+from interference import ap_loads, repair_pairs, violated_pairs
+from solver import persistent_model, solve_network
+from sweep import assignment_objective
+
+
+def dense(seed):
+    """Dense deployments where the interference pairs bind (~1500 edges, within a size-limited licence)."""
+    return scenario_intermediates(150, seed=seed, ap_spacing=0.4)
+
+
+def optimum(intermediates, aps, lambda_energy, backend, interference, stats=None):
+    assignments, status = solve_network(intermediates, aps, lambda_energy, backend=backend, stats=stats,
+                                        interference=interference)
+    assert status == "Optimal"
+    assert_feasible(intermediates, aps, assignments)
+    return assignment_objective(assignments, intermediates, lambda_energy)
+
+
+@pytest.mark.parametrize("backend", mip_backends())
+@pytest.mark.parametrize("lambda_energy", [0, 1])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_clique_matches_pairwise(backend, lambda_energy, seed):
+    aps, intermediates = dense(seed)
+    stats = {}
+    clique = optimum(intermediates, aps, lambda_energy, backend, "clique", stats)
+    assert stats["interference_model"] == "clique"
+    assert clique == pytest.approx(optimum(intermediates, aps, lambda_energy, backend, "pairwise"), rel=1e-4)
+
+
+@pytest.mark.parametrize("backend", mip_backends())
+@pytest.mark.parametrize("lambda_energy", [0, 1])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_lazy_matches_pairwise(backend, lambda_energy, seed):
+    aps, intermediates = dense(seed)
+    stats = {}
+    lazy = optimum(intermediates, aps, lambda_energy, backend, "lazy", stats)
+    assert 0 < stats["interference_rows"] <= stats["interference_pairs"]
+    assert lazy == pytest.approx(optimum(intermediates, aps, lambda_energy, backend, "pairwise"), rel=1e-4)
+
+
+@pytest.mark.parametrize("backend", mip_backends())
+def test_persistent_lazy_matches_pairwise(backend):
+    aps, intermediates = dense(0)
+    model = persistent_model(intermediates, aps, backend=backend, interference="lazy")
+    added = 0
+    for lambda_energy in (1, 0, 1):
+        stats = {}
+        assignments, status = model.solve(lambda_energy, stats)
+        assert status == "Optimal"
+        assert_feasible(intermediates, aps, assignments)
+        assert assignment_objective(assignments, intermediates, lambda_energy) == pytest.approx(
+            optimum(intermediates, aps, lambda_energy, backend, "pairwise"), rel=1e-4)
+        # Pairs found by earlier solves are kept, not found again
+        assert stats["interference_rows"] >= added
+        added = stats["interference_rows"]
+
+
+@pytest.mark.skipif("gurobi" not in mip_backends(), reason="gurobipy not installed")
+def test_gurobi_persistent_lazy_promotes_pairs():
+    aps, intermediates = dense(1)
+    model = persistent_model(intermediates, aps, backend="gurobi", interference="lazy")
+    model.model.update()
+    base = model.model.NumConstrs
+    stats = {}
+    model.solve(1, stats)
+    model.model.update()
+    assert stats["interference_rows"] > 0
+    assert model.model.NumConstrs == base + stats["interference_rows"]
+
+
+@pytest.mark.skipif("gurobi" not in mip_backends(), reason="gurobipy not installed")
+@pytest.mark.parametrize("stop_at", range(1, 40, 3))
+def test_cancelled_lazy_solve_stays_feasible(stop_at):
+    aps, intermediates = scenario_intermediates(60, layout="clustered", ap_spacing=0.4)
+    calls = [0]
+
+    def should_stop():
+        calls[0] += 1
+        return calls[0] >= stop_at
+
+    assignments, status = solve_network(intermediates, aps, backend="gurobi", interference="lazy",
+                                        should_stop=should_stop)
+    assert status in ("Optimal", "Interrupted")
+    assert_feasible(intermediates, aps, assignments)
+
+
+def test_repair_pairs_drops_least_profitable_users():
+    aps, intermediates = dense(0)
+    table = compact(intermediates)
+    # Everyone on their first AP, ignoring capacities and pairs
+    assignments = {a["Name"]: [] for a in aps}
+    for u, a in intermediates["E"]:
+        if not any(u in users for users in assignments.values()):
+            assignments[a].append(u)
+    assert len(violated_pairs(table, ap_loads(table, assignments)))
+    repaired = repair_pairs(table, assignments)
+    assert not len(violated_pairs(table, ap_loads(table, repaired)))
+    assert all(set(repaired[a]) <= set(users) for a, users in assignments.items())
@@ -0,0 +1,23 @@
+# test_intermediates_cache.py - cache keys follow the inputs compute_intermediates reads
+import intermediates_cache
+from generator import generate_scenario
+from intermediates_cache import cached_intermediates, scenario_key
+
+
+def test_solver_options_keep_the_key():
+    scenario = generate_scenario(50, seed=1)
+    users, aps, settings = scenario["users"], scenario["aps"], scenario["settings"]
+    key = scenario_key(users, aps, settings)
+    tuned = dict(settings, LambdaEnergy=0, TimeLimit=5, SolverBackend="highs", ProfileDir="/tmp/profiles")
+    assert scenario_key(users, aps, tuned) == key
+    assert scenario_key(users, aps, dict(settings, WifiBand="5 GHz")) != key
+    assert scenario_key(users, aps, dict(settings, EnvironmentType="Urban")) != key
+    assert scenario_key(users, aps, dict(settings, IncludePowerConsumption=not settings["IncludePowerConsumption"])) != key
+
+
+def test_cache_hit_across_solver_options():
+    intermediates_cache.clear_cache()
+    scenario = generate_scenario(50, seed=2)
+    first = cached_intermediates(scenario["users"], scenario["aps"], scenario["settings"])
+    again = cached_intermediates(scenario["users"], scenario["aps"], dict(scenario["settings"], Threads=4))
+    assert again is first
@@ -0,0 +1,79 @@
+# test_online.py - online engine rounds stay feasible under concurrent events
+import threading
+
+import online
+
+SETTINGS = {"WifiBand": "2.4 GHz", "EnvironmentType": "Indoor", "IncludePowerConsumption": True}
+
+
+def assert_feasible(engine):
+    for a, load in engine.load.items():
+        assert load <= engine.capacity[a]
+    for (a1, a2), limit in engine.M.items():
+        assert engine.load[a1] + engine.load[a2] <= limit, (a1, a2)
+
+
+def test_round_stale_when_outside_partner_changes(monkeypatch):
+    # Chain D - A - B on one channel: a round over D's region {D, A} sizes A
+    # from B's load, so users joining B while it runs make it stale
+    aps = [
+        {"Name": "D", "Capacity": 8, "Channel": 1, "X": -1, "Y": 0},
+        {"Name": "A", "Capacity": 6, "Channel": 1, "X": 6, "Y": 0},
+        {"Name": "B", "Capacity": 4, "Channel": 1, "X": 8, "Y": 0},
+    ]
+    started, release = threading.Event(), threading.Event()
+    solve_network = online.solve_network
+
+    def held_solve(*args, **kwargs):
+        started.set()
+        release.wait(10)
+        return solve_network(*args, **kwargs)
+
+    monkeypatch.setattr(online, "solve_network", held_solve)
+    engine = online.OnlineEngine(aps, SETTINGS, reoptimize_every=0)
+    assert ("D", "B") not in engine.M and engine.M[("A", "B")] == 7
+
+    # Users between D and A go to the nearer D first, leaving D-only users waiting
+    engine.add_users([{"Name": f"U{i}", "Priority": "Low", "X": 2.4, "Y": 0, "Device": "Laptop"}
+                      for i in range(6)])
+    engine.add_users([{"Name": f"W{i}", "Priority": "High", "X": -4, "Y": 0, "Device": "Laptop"}
+                      for i in range(8)])
+    engine.dirty = {"D"}
+    engine.reoptimize()
+    assert started.wait(10)
+    engine.add_users([{"Name": f"J{i}", "Priority": "High", "X": 12, "Y": 0, "Device": "Laptop"}
+                      for i in range(3)])
+    release.set()
+    engine.wait()
+
+    assert engine.rounds[-1]["stale"]
+    assert_feasible(engine)
+
+
+def test_foreground_rounds_feasible():
+    from generator import generate_scenario
+
+    scenario = generate_scenario(300, seed=4, ap_spacing=0.5)
+    engine = online.OnlineEngine(scenario["aps"], scenario["settings"], reoptimize_every=25, background=False)
+    engine.add_users(scenario["users"][:200])
+    for k, record in enumerate(scenario["users"][200:]):
+        engine.apply({"type": "join", "user": record})
+        engine.apply({"type": "leave", "name": scenario["users"][k]["Name"]})
+    assert engine.rounds
+    assert_feasible(engine)
+
+
+def test_rounds_never_lower_the_objective():
+    from generator import generate_events, generate_scenario
+
+    for seed in range(3):
+        scenario = generate_scenario(300, layout="clustered", seed=seed)
+        engine = online.OnlineEngine(scenario["aps"], scenario["settings"], reoptimize_every=50, background=False)
+        engine.add_users(scenario["users"])
+        for event in generate_events(scenario, 1500, seed=seed):
+            engine.apply(event)
+        assert engine.rounds
+        for r in engine.rounds:
+            assert r["gain"] >= -1e-9, r
+            assert r["accepted"] == (r["gain"] > 1e-9), r
+        assert_feasible(engine)
@@ -0,0 +1,22 @@
+# test_portfolio.py - portfolio results under a time limit
+import time
+
+from calculations import compute_intermediates
+from generator import generate_scenario
+from portfolio import STOP_GRACE
+from solver import solve_network
+from sweep import assignment_totals
+
+
+def test_no_report_in_time_falls_back_to_heuristic():
+    scenario = generate_scenario(1500, seed=3, ap_spacing=0.5)
+    intermediates = compute_intermediates(scenario["users"], scenario["aps"], scenario["settings"])
+    stats = {}
+    start = time.perf_counter()
+    assignments, status = solve_network(intermediates, scenario["aps"], portfolio=True, processes=2,
+                                        time_limit=0.01, stats=stats)
+    assert status == "Time limit (heuristic)"
+    assert stats["portfolio_winner"] == "none"
+    assert assignment_totals(assignments, intermediates)[0] > 0
+    # The grace period is spent once, on stopping the racers
+    assert time.perf_counter() - start < 0.01 + STOP_GRACE + 3
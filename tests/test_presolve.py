@@ -0,0 +1,58 @@
+# test_presolve.py - presolve keeps the optimum and maps assignments both ways
+import pytest
+
+from calculations import compute_intermediates
+from checks import assert_feasible
+from generator import generate_scenario
+from presolve import presolve
+from solver import available_backends, solve_network
+from sweep import assignment_objective
+
+needs_highs = pytest.mark.skipif("highs" not in available_backends(), reason="scipy milp not installed")
+
+
+def duplicated_scenario(n_users, copies=3, seed=0):
+    """A generated scenario whose users each appear `copies` times at the same spot."""
+    scenario = generate_scenario(n_users, seed=seed, ap_spacing=0.6)
+    users = [dict(u, Name=f"{u['Name']}_{k}") for u in scenario["users"] for k in range(copies)]
+    aps = scenario["aps"]
+    return aps, compute_intermediates(users, aps, scenario["settings"])
+
+
+def group_counts(reduced, assignments):
+    return {a: sorted(reduced.reduce({a: users})[a]) for a, users in assignments.items()}
+
+
+@pytest.mark.parametrize("lambda_energy", [0, 1])
+def test_reduce_expand_round_trip(lambda_energy):
+    aps, intermediates = duplicated_scenario(40)
+    reduced = presolve(intermediates, aps, lambda_energy)
+    assert len(reduced.members) < len(reduced.user_edges)
+
+    assignments, _ = solve_network(intermediates, aps, lambda_energy, backend="heuristic")
+    # Only kept edges survive reduce; expanding gives back the same group counts per AP
+    grouped = reduced.reduce(assignments)
+    expanded = reduced.expand(grouped)
+    assert group_counts(reduced, expanded) == {a: sorted(groups) for a, groups in grouped.items()}
+    assert_feasible(intermediates, aps, expanded)
+
+
+@needs_highs
+@pytest.mark.parametrize("backend", ["highs", "flow"])
+@pytest.mark.parametrize("lambda_energy", [0, 1])
+def test_presolve_keeps_the_optimum(backend, lambda_energy):
+    aps, intermediates = duplicated_scenario(40)
+    if backend == "flow":
+        intermediates = dict(intermediates, I=[], M={})
+    expected, status = solve_network(intermediates, aps, lambda_energy, backend=backend)
+    assert status == "Optimal"
+
+    stats = {}
+    assignments, status = solve_network(intermediates, aps, lambda_energy, backend=backend, presolve=True,
+                                        stats=stats)
+    assert status == "Optimal"
+    assert_feasible(intermediates, aps, assignments)
+    if backend == "highs":
+        assert stats["presolve_groups"] < stats["presolve_users"]
+    assert assignment_objective(assignments, intermediates, lambda_energy) == pytest.approx(
+        assignment_objective(expected, intermediates, lambda_energy), rel=1e-4)
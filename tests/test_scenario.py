@@ -0,0 +1,56 @@
+# test_scenario.py - scenario loading and the JSON <-> .scnb round trip
+import glob
+import json
+import os
+
+import pytest
+
+import scenario_binary
+from generator import generate_scenario
+from scenario import read_scenario
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASES = sorted(glob.glob(os.path.join(ROOT, "test_cases", "*.json")))
+
+
+def _write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+@pytest.mark.parametrize("field", ["users", "aps"])
+@pytest.mark.parametrize("value", ["abc", {"Name": "U1"}])
+def test_rejects_non_list_tables(tmp_path, field, value):
+    data = {"users": [], "aps": [], "settings": {}, field: value}
+    path = str(tmp_path / "bad.json")
+    _write_json(path, data)
+    with pytest.raises(ValueError):
+        read_scenario(path)
+
+
+def _round_trip(tmp_path, document):
+    src = str(tmp_path / "src.json")
+    binary = str(tmp_path / "scenario.scnb")
+    back = str(tmp_path / "back.json")
+    _write_json(src, document)
+    scenario_binary.convert(src, binary)
+    scenario_binary.convert(binary, back)
+    with open(back) as f:
+        assert json.load(f) == document
+
+    data = read_scenario(binary)
+    assert isinstance(data["users"], scenario_binary.ColumnarTable)
+    assert list(data["users"]) == document["users"]
+    assert list(data["aps"]) == document["aps"]
+    assert data["settings"] == document["settings"]
+
+
+@pytest.mark.parametrize("path", CASES, ids=os.path.basename)
+def test_test_cases_round_trip(tmp_path, path):
+    with open(path) as f:
+        _round_trip(tmp_path, json.load(f))
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_generated_round_trip(tmp_path, seed):
+    _round_trip(tmp_path, generate_scenario(200, seed=seed))
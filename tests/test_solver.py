@@ -0,0 +1,68 @@
+# test_solver.py - backend selection and agreement between backends
+import sys
+import types
+
+import pytest
+
+import solver
+from checks import assert_feasible, mip_backends, scenario_intermediates
+from solver import available_backends, persistent_model, solve_network
+from sweep import assignment_objective
+
+needs_highs = pytest.mark.skipif("highs" not in available_backends(), reason="scipy milp not installed")
+
+
+class LicenceLimit(Exception):
+    pass
+
+
+@pytest.fixture
+def limited_backend(monkeypatch):
+    """A first MIP backend whose licence refuses every model, like Gurobi's size-limited one."""
+    module = types.ModuleType("solver_limited")
+    module.HANDLES_INTERFERENCE = module.HANDLES_MULTIPLICITY = True
+    module.USES_WARM_START = False
+    module.is_available = lambda: True
+    module.licence_error = lambda error: isinstance(error, LicenceLimit)
+
+    def solve(*args, **kwargs):
+        raise LicenceLimit("Model too large for size-limited license")
+
+    module.solve = solve
+    monkeypatch.setitem(sys.modules, "solver_limited", module)
+    monkeypatch.setitem(solver.BACKENDS, "limited", "solver_limited")
+    monkeypatch.setattr(solver, "MIP_BACKENDS", ("limited", "highs"))
+    monkeypatch.delenv(solver.BACKEND_ENV_VAR, raising=False)
+
+
+@needs_highs
+def test_auto_moves_past_licence_limit(limited_backend):
+    aps, intermediates = scenario_intermediates(200, ap_spacing=0.6)
+    stats = {}
+    assignments, status = solve_network(intermediates, aps, stats=stats)
+    assert status == "Optimal" and stats["backend"] == "highs"
+    assert_feasible(intermediates, aps, assignments)
+
+    model = persistent_model(intermediates, aps)
+    assert model.solve(1)[1] == "Optimal"
+    assert model.name == "highs"
+
+    with pytest.raises(LicenceLimit):
+        solve_network(intermediates, aps, backend="limited")
+
+
+def solve_objective(intermediates, aps, lambda_energy, backend, **kwargs):
+    assignments, status = solve_network(intermediates, aps, lambda_energy, backend=backend, **kwargs)
+    assert status == "Optimal"
+    assert_feasible(intermediates, aps, assignments)
+    return assignment_objective(assignments, intermediates, lambda_energy)
+
+
+@pytest.mark.parametrize("backend", mip_backends())
+@pytest.mark.parametrize("lambda_energy", [0, 1])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_flow_matches_mip_without_interference(backend, lambda_energy, seed):
+    aps, intermediates = scenario_intermediates(80, seed=seed, layout="clustered")
+    intermediates = dict(intermediates, I=[], M={})
+    flow = solve_objective(intermediates, aps, lambda_energy, "flow")
+    assert flow == pytest.approx(solve_objective(intermediates, aps, lambda_energy, backend), rel=1e-4)
@@ -0,0 +1,31 @@
+# test_sweep.py - the sweep entry point and its Pareto fronts
+import json
+import os
+
+import sweep
+
+SCENARIO = os.path.join(os.path.dirname(__file__), "..", "test_cases", "Energy Optimization.json")
+
+
+def test_main_writes_points_and_fronts(tmp_path):
+    output = tmp_path / "sweep.json"
+    sweep.main([SCENARIO, "--lambdas", "0", "1", "5", "--bands", "2.4 GHz", "5 GHz", "-o", str(output)])
+    report = json.loads(output.read_text())
+
+    assert len(report["points"]) == 6
+    assert all("assignments" not in point for point in report["points"])
+    assert {(f["band"], f["environment"]) for f in report["fronts"]} == {("2.4 GHz", "Indoor"), ("5 GHz", "Indoor")}
+    for entry in report["fronts"]:
+        front = entry["front"]
+        assert front == sorted(front, key=lambda p: p["energy"])
+        # Along the front, more energy must buy more priority
+        assert all(a["priority"] < b["priority"] for a, b in zip(front, front[1:]))
+
+
+def test_solver_options_reach_every_solve(tmp_path):
+    output = tmp_path / "sweep.json"
+    sweep.main([SCENARIO, "--lambdas", "0", "1", "--time-limit", "5", "--interference", "clique", "--presolve",
+                "--assignments", "-o", str(output)])
+    points = json.loads(output.read_text())["points"]
+    assert [p["status"] for p in points] == ["Optimal", "Optimal"]
+    assert all(isinstance(p["assignments"], dict) for p in points)
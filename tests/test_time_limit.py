@@ -0,0 +1,30 @@
+# test_time_limit.py - answers within a time budget
+import pytest
+
+from calculations import compute_intermediates
+from checks import assert_feasible
+from generator import generate_scenario
+from solver import available_backends, solve_network
+from solver_heuristic import heuristic_assignment
+
+
+@pytest.fixture(scope="module")
+def scenario():
+    scenario = generate_scenario(800, seed=5, ap_spacing=0.5, layout="clustered")
+    return scenario, compute_intermediates(scenario["users"], scenario["aps"], scenario["settings"])
+
+
+def test_heuristic_time_limit_keeps_greedy(scenario):
+    scenario, intermediates = scenario
+    greedy = heuristic_assignment(intermediates, scenario["aps"], max_moves_per_user=0)
+    assert heuristic_assignment(intermediates, scenario["aps"], time_limit=0) == greedy
+    assert_feasible(intermediates, scenario["aps"], greedy)
+
+
+@pytest.mark.skipif("highs" not in available_backends(), reason="scipy milp not installed")
+def test_exhausted_budget_returns_feasible_assignment(scenario):
+    scenario, intermediates = scenario
+    assignments, status = solve_network(intermediates, scenario["aps"], backend="highs", time_limit=0)
+    assert status in ("Time limit", "Time limit (heuristic)")
+    assert any(assignments.values())
+    assert_feasible(intermediates, scenario["aps"], assignments)